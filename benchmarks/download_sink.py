@@ -0,0 +1,101 @@
+"""Compare writing downloaded chunks to a BytesIO or a file, like handle_download used to, with the download sinks.
+
+Chunks of 1 MiB are written as if they came from get_file, the event loop lag is measured while writing to disk.
+
+Usage: python benchmarks/download_sink.py [size_mib]
+"""
+
+from __future__ import annotations
+
+import asyncio
+import sys
+import tempfile
+import time
+import tracemalloc
+from io import BytesIO
+from pathlib import Path
+
+from pyrogram.client import FileSink, MemorySink
+
+CHUNK_SIZE = 1024 * 1024
+TICK = 0.001
+
+
+async def measure_lag(done: asyncio.Event) -> list[float]:
+    lags = []
+
+    while not done.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(TICK)
+        lags.append(time.perf_counter() - start - TICK)
+
+    return lags
+
+
+async def run(name: str, write, chunks: int) -> None:
+    done = asyncio.Event()
+    lag_task = asyncio.create_task(measure_lag(done))
+    chunk = bytes(CHUNK_SIZE)
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    await write(chunk, chunks)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    done.set()
+    lags = await lag_task
+
+    print(
+        f"{name:<10} {elapsed:6.2f}s  peak {peak / CHUNK_SIZE:7.1f} MiB  "
+        f"max lag {max(lags, default=0) * 1000:6.1f}ms",
+    )
+
+
+async def main() -> None:
+    chunks = int(sys.argv[1]) if len(sys.argv) > 1 else 512
+    size = chunks * CHUNK_SIZE
+
+    async def bytes_io(chunk: bytes, chunks: int) -> None:
+        file = BytesIO()
+
+        for _ in range(chunks):
+            file.write(chunk)
+            await asyncio.sleep(0)
+
+    async def memory_sink(chunk: bytes, chunks: int) -> None:
+        sink = MemorySink(size)
+
+        for i in range(chunks):
+            await sink.write(i * CHUNK_SIZE, chunk)
+            await asyncio.sleep(0)
+
+        sink.get_file("file")
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "file"
+
+        async def buffered(chunk: bytes, chunks: int) -> None:
+            with path.open("wb") as file:
+                for _ in range(chunks):
+                    file.write(chunk)
+                    await asyncio.sleep(0)
+
+        async def file_sink(chunk: bytes, chunks: int) -> None:
+            sink = FileSink(str(path), size)
+            await sink.truncate(0)
+
+            for i in range(chunks):
+                await sink.write(i * CHUNK_SIZE, chunk)
+
+            await sink.close()
+
+        await run("BytesIO", bytes_io, chunks)
+        await run("MemorySink", memory_sink, chunks)
+        await run("write", buffered, chunks)
+        await run("FileSink", file_sink, chunks)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,94 @@
+"""Compare the throughput of fully parsed and raw history pages.
+
+Usage: python benchmarks/history_parse.py [count]
+"""
+
+from __future__ import annotations
+
+import asyncio
+import sys
+import time
+
+from pyrogram import Client, raw, utils
+
+CHANNEL_ID = 1234567890
+PAGE_SIZE = 100
+
+
+def make_page(start: int) -> raw.types.messages.ChannelMessages:
+    users = [
+        raw.types.User(
+            id=100 + i,
+            access_hash=i,
+            first_name=f"User {i}",
+            usernames=[],
+            restriction_reason=[],
+        )
+        for i in range(10)
+    ]
+    chats = [
+        raw.types.Channel(
+            id=CHANNEL_ID,
+            title="Channel",
+            photo=raw.types.ChatPhotoEmpty(),
+            date=1700000000,
+            access_hash=1,
+            megagroup=True,
+            usernames=[],
+            restriction_reason=[],
+        ),
+    ]
+    messages = [
+        raw.types.Message(
+            id=i,
+            peer_id=raw.types.PeerChannel(channel_id=CHANNEL_ID),
+            from_id=raw.types.PeerUser(user_id=100 + i % 10),
+            date=1700000000 + i,
+            message=f"Message number {i}",
+            entities=[raw.types.MessageEntityBold(offset=0, length=7)],
+            restriction_reason=[],
+        )
+        for i in range(start, start - PAGE_SIZE, -1)
+    ]
+
+    return raw.types.messages.ChannelMessages(
+        pts=0,
+        count=len(messages),
+        messages=messages,
+        chats=chats,
+        users=users,
+        topics=[],
+    )
+
+
+async def run(client: Client, pages: list, parse) -> float:
+    start = time.perf_counter()
+
+    for page in pages:
+        result = parse(client, page)
+
+        if asyncio.iscoroutine(result):
+            await result
+
+    return time.perf_counter() - start
+
+
+async def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    pages = [make_page(i) for i in range(count, 0, -PAGE_SIZE)]
+    client = Client("benchmark", in_memory=True)
+
+    parsed = await run(
+        client,
+        pages,
+        lambda c, p: utils.parse_messages(c, p, replies=0),
+    )
+    raw_parsed = await run(client, pages, utils.parse_raw_messages)
+
+    print(f"parse_messages: {count / parsed:.0f} messages/s")
+    print(f"parse_raw_messages: {count / raw_parsed:.0f} messages/s")
+    print(f"speedup: {parsed / raw_parsed:.1f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,57 @@
+"""Report the memory taken by parsed messages.
+
+Usage: python benchmarks/message_memory.py [count]
+"""
+
+from __future__ import annotations
+
+import sys
+import tracemalloc
+from datetime import datetime
+
+from pyrogram import enums, types
+
+
+def make_message(i: int, chat: types.Chat, user: types.User) -> types.Message:
+    return types.Message(
+        id=i,
+        chat=chat,
+        from_user=user,
+        date=datetime.fromtimestamp(1700000000 + i),
+        text=f"Message number {i}",
+        entities=[
+            types.MessageEntity(
+                type=enums.MessageEntityType.BOLD,
+                offset=0,
+                length=7,
+            ),
+        ],
+        outgoing=False,
+    )
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+
+    chat = types.Chat(
+        id=-1001234567890,
+        type=enums.ChatType.SUPERGROUP,
+        title="Chat",
+    )
+    user = types.User(id=123456789, first_name="User")
+
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+
+    messages = [make_message(i, chat, user) for i in range(count)]
+
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    print(
+        f"{count} messages: {(after - before) / len(messages):.0f} bytes per message",
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""Measure the event loop lag while a file is read part by part for an upload.
+
+The file is read once inline on the event loop, like save_file used to, and once with the PartReader used by
+save_file. A temporary sparse file is created if no path is given; pass a real multi-GB file on the disk to test
+for meaningful numbers, after dropping the page cache.
+
+Usage: python benchmarks/upload_loop_lag.py [path | size_mib]
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from pyrogram.methods.advanced.save_file import PartReader
+
+PART_SIZE = 512 * 1024
+TICK = 0.001
+
+
+async def measure_lag(done: asyncio.Event) -> list[float]:
+    lags = []
+
+    while not done.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(TICK)
+        lags.append(time.perf_counter() - start - TICK)
+
+    return lags
+
+
+async def read_inline(path: Path) -> None:
+    md5_sum = hashlib.md5()
+
+    with path.open("rb", buffering=4096) as fp:
+        while chunk := fp.read(PART_SIZE):
+            md5_sum.update(chunk)
+            await asyncio.sleep(0)
+
+
+async def read_executor(path: Path) -> None:
+    with (
+        ThreadPoolExecutor(4) as executor,
+        path.open("rb") as fp,
+    ):
+        reader = PartReader(
+            fp,
+            PART_SIZE,
+            executor=executor,
+            md5_sum=hashlib.md5(),
+        )
+
+        try:
+            while await reader.read():
+                pass
+
+            await reader.hexdigest()
+        finally:
+            await reader.close()
+
+
+async def run(name: str, read, path: Path) -> None:
+    size = path.stat().st_size / 1024 / 1024  # noqa: ASYNC240
+    done = asyncio.Event()
+    lag_task = asyncio.create_task(measure_lag(done))
+    start = time.perf_counter()
+
+    await read(path)
+
+    elapsed = time.perf_counter() - start
+    done.set()
+    lags = sorted(await lag_task)
+
+    print(
+        f"{name}: {size / elapsed:.0f} MiB/s, "
+        f"loop lag p50 {lags[len(lags) // 2] * 1000:.2f} ms, "
+        f"p99 {lags[int(len(lags) * 0.99)] * 1000:.2f} ms, "
+        f"max {lags[-1] * 1000:.2f} ms",
+    )
+
+
+async def main() -> None:
+    arg = sys.argv[1] if len(sys.argv) > 1 else "2048"
+
+    if arg.isdigit():
+        with tempfile.NamedTemporaryFile() as fp:
+            fp.truncate(int(arg) * 1024 * 1024)
+            await run("inline", read_inline, Path(fp.name))
+            await run("executor", read_executor, Path(fp.name))
+    else:
+        await run("inline", read_inline, Path(arg))
+        await run("executor", read_executor, Path(arg))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -132,6 +132,11 @@ def pyrogram_api() -> None:
             stop_transmission
             export_session_string
             set_parse_mode
+            listen
+            ask
+            wait_for_message
+            stop_listening
+            get_listeners_count
         """,
         "messages": """
         Messages
@@ -173,6 +178,7 @@ def pyrogram_api() -> None:
             get_media_group
             get_chat_history
             get_chat_history_count
+            export_chat_history
             read_chat_history
             send_poll
             vote_poll
@@ -187,6 +193,7 @@ def pyrogram_api() -> None:
             search_global_hashtag_messages_count
             download_media
             stream_media
+            open_media
             get_discussion_message
             get_discussion_replies
             get_discussion_replies_count
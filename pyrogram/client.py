@@ -10,8 +10,10 @@ import platform
 import re
 import shutil
 import sys
-from collections import OrderedDict
-from concurrent.futures.thread import ThreadPoolExecutor
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict, deque
 from datetime import datetime, timedelta
 from hashlib import sha256
 from importlib import import_module
@@ -35,21 +37,32 @@ from pyrogram.errors import (
 from pyrogram.handlers.handler import Handler
 from pyrogram.methods import Methods
 from pyrogram.session import Auth, Session
-from pyrogram.storage import FileStorage, MemoryStorage, Storage
+from pyrogram.storage import (
+    ChunkCache,
+    FileStorage,
+    MemoryStorage,
+    MemoryUploadCache,
+    SQLiteUploadCache,
+    Storage,
+    UploadCache,
+)
 from pyrogram.types import TermsOfService, User
 from pyrogram.utils import ainput
 
 from .connection import Connection
 from .connection.transport import TCP, TCPAbridged
 from .dispatcher import Dispatcher
-from .file_id import FileId, FileType, ThumbnailSource
+from .executor import ProcessPoolExecutor, ThreadPoolExecutor
 from .mime_types import mime_types
 from .parser import Parser
+from .sequencer import UpdatesSequencer
 from .session.internals import MsgId
 
 if TYPE_CHECKING:
     from collections.abc import AsyncGenerator, Callable
 
+    from .file_id import FileId
+
 log = logging.getLogger(__name__)
 
 
@@ -146,8 +159,23 @@ class Client(Methods):
 
         workers (``int``, *optional*):
             Number of maximum concurrent workers for handling incoming updates.
+            This is also the number of threads running sync handler callbacks.
+            Defaults to ``min(32, os.cpu_count() + 4)``.
+
+        filter_workers (``int``, *optional*):
+            Number of threads running sync filters, kept apart from the handler threads so that slow handlers
+            don't delay filter evaluation.
             Defaults to ``min(32, os.cpu_count() + 4)``.
 
+        progress_workers (``int``, *optional*):
+            Number of threads running sync upload and download progress callbacks.
+            Defaults to ``min(32, os.cpu_count() + 4)``.
+
+        process_workers (``int``, *optional*):
+            Number of processes running the sync handler callbacks marked with
+            :func:`~pyrogram.executor.cpu_bound`.
+            Defaults to None (no process pool, all callbacks run in the handler threads).
+
         workdir (``str``, *optional*):
             Define a custom working directory.
             The working directory is the location in the filesystem where Pyrogram will store the session files.
@@ -201,6 +229,35 @@ class Client(Methods):
             Set the maximum size of the message cache.
             Defaults to 10000.
 
+        max_message_cache_memory (``int``, *optional*):
+            Set the maximum estimated memory, in bytes, taken by the messages in the message cache.
+            Defaults to 64 MiB.
+
+        message_cache_ttl (``float``, *optional*):
+            Time in seconds after which a cached message expires. Pass None to keep messages until they are evicted.
+            Defaults to 1 hour.
+
+        max_upload_sessions (``int``, *optional*):
+            Maximum number of media sessions kept open to upload files, shared by all the uploads.
+            Defaults to 4.
+
+        max_upload_parts (``int``, *optional*):
+            Maximum number of parts of a file being uploaded at the same time. The actual number adapts to the measured
+            throughput of each upload.
+            Defaults to 16.
+
+        upload_cache (:obj:`~pyrogram.storage.UploadCache` | ``bool``, *optional*):
+            Pass True, or your own cache, to send local files already uploaded once without uploading them again.
+            Files are recognized by their content, and their media reused as long as Telegram keeps it.
+            True keeps the cache in a SQLite database next to the session file, or in memory for in-memory sessions.
+            Defaults to None, files are always uploaded.
+
+        chunk_cache (:obj:`~pyrogram.storage.ChunkCache`, *optional*):
+            Pass a chunk cache to keep the media downloaded in a directory of bounded size, so that downloading or
+            streaming the same media again doesn't go through Telegram. The same cache can be shared by several
+            clients.
+            Defaults to None, media are always downloaded from Telegram.
+
         client_platform (:obj:`~pyrogram.enums.ClientPlatform`, *optional*):
             The platform where this client is running.
             Defaults to 'other'
@@ -224,6 +281,17 @@ class Client(Methods):
     UPDATES_WATCHDOG_INTERVAL = 10 * 60
     MAX_CONCURRENT_TRANSMISSIONS = 1000
     MAX_MESSAGE_CACHE_SIZE = 10000
+    MAX_MESSAGE_CACHE_MEMORY = 64 * 1024 * 1024
+    MESSAGE_CACHE_TTL = 60 * 60
+    MAX_PEER_CACHE_SIZE = 10000
+    MAX_RESUMABLE_UPLOADS = 1000
+    FILE_WORKERS = 4
+    MAX_UPLOAD_SESSIONS = 4
+    MAX_UPLOAD_PARTS = 16
+    MAX_UPLOAD_STATS = 100
+    MAX_DOWNLOAD_SESSIONS = 4
+    DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+    DOWNLOAD_RETRIES = 3
     mimetypes = MimeTypes()
     mimetypes.readfp(StringIO(mime_types))
 
@@ -251,6 +319,9 @@ class Client(Methods):
         phone_code: str | None = None,
         password: str | None = None,
         workers: int = WORKERS,
+        filter_workers: int = WORKERS,
+        progress_workers: int = WORKERS,
+        process_workers: int | None = None,
         workdir: str = WORKDIR,
         plugins: dict | None = None,
         parse_mode: enums.ParseMode = enums.ParseMode.DEFAULT,
@@ -262,6 +333,12 @@ class Client(Methods):
         max_concurrent_transmissions: int = MAX_CONCURRENT_TRANSMISSIONS,
         init_params: raw.types.JsonObject = None,
         max_message_cache_size: int = MAX_MESSAGE_CACHE_SIZE,
+        max_message_cache_memory: int = MAX_MESSAGE_CACHE_MEMORY,
+        message_cache_ttl: float | None = MESSAGE_CACHE_TTL,
+        max_upload_sessions: int = MAX_UPLOAD_SESSIONS,
+        max_upload_parts: int = MAX_UPLOAD_PARTS,
+        upload_cache: UploadCache | bool | None = None,
+        chunk_cache: ChunkCache | None = None,
         client_platform: enums.ClientPlatform = enums.ClientPlatform.OTHER,
         connection_factory: type[Connection] = Connection,
         protocol_factory: type[TCP] = TCPAbridged,
@@ -289,6 +366,9 @@ class Client(Methods):
         self.phone_code = phone_code
         self.password = password
         self.workers = workers
+        self.filter_workers = filter_workers
+        self.progress_workers = progress_workers
+        self.process_workers = process_workers
         self.workdir = Path(workdir)
         self.plugins = plugins
         self.parse_mode = parse_mode
@@ -300,6 +380,10 @@ class Client(Methods):
         self.max_concurrent_transmissions = max_concurrent_transmissions
         self.init_params = init_params
         self.max_message_cache_size = max_message_cache_size
+        self.max_message_cache_memory = max_message_cache_memory
+        self.message_cache_ttl = message_cache_ttl
+        self.max_upload_sessions = max_upload_sessions
+        self.max_upload_parts = max_upload_parts
         self.client_platform = client_platform
         self.connection_factory = connection_factory
         self.protocol_factory = protocol_factory
@@ -308,6 +392,11 @@ class Client(Methods):
             self.workers,
             thread_name_prefix="Handler",
         )
+        self.file_executor = ThreadPoolExecutor(
+            self.FILE_WORKERS,
+            thread_name_prefix="File",
+        )
+        self.create_executors()
 
         if storage:
             self.storage = storage
@@ -321,12 +410,29 @@ class Client(Methods):
             self.storage = MemoryStorage(self.name)
         else:
             self.storage = FileStorage(self.name, self.workdir)
+
+        if upload_cache is True:
+            upload_cache = (
+                SQLiteUploadCache(self.storage.database.with_suffix(".uploads"))
+                if isinstance(self.storage, FileStorage)
+                else MemoryUploadCache()
+            )
+
+        self.upload_cache = upload_cache or None
+        self.chunk_cache = chunk_cache
+
         self.dispatcher = Dispatcher(self)
+        self.sequencer = UpdatesSequencer(self)
         self.rnd_id = MsgId
         self.parser = Parser(self)
         self.session = None
         self.media_sessions = {}
         self.media_sessions_lock = asyncio.Lock()
+        self.upload_pools = {}
+        self.download_pools = {}
+        self.upload_stats = deque(maxlen=self.MAX_UPLOAD_STATS)
+        # Resumable uploads done but not sent yet, file id to storage key. Bounded, for files that are never sent
+        self.resumable_uploads = Cache(self.MAX_RESUMABLE_UPLOADS)
         self.save_file_semaphore = asyncio.Semaphore(
             self.max_concurrent_transmissions,
         )
@@ -338,16 +444,40 @@ class Client(Methods):
         self.takeout_id = None
         self.disconnect_handler = None
         self.me: User | None = None
-        self.message_cache = Cache(self.max_message_cache_size)
+        self.message_cache = MessageCache(
+            self.max_message_cache_size,
+            self.max_message_cache_memory,
+            self.message_cache_ttl,
+        )
+        self.peer_cache = Cache(self.MAX_PEER_CACHE_SIZE)
+        self.identity_map = IdentityMap(self, self.MAX_PEER_CACHE_SIZE)
         self.updates_watchdog_task = None
         self.updates_watchdog_event = asyncio.Event()
         self.updates_invoke_error = None
         self.last_update_time = datetime.now()
-        self.listeners = {
-            listener_type: [] for listener_type in pyrogram.enums.ListenerTypes
-        }
+        self.listeners = self.dispatcher.conversation_handler.listeners
         self.loop = asyncio.get_event_loop()
 
+    def create_executors(self) -> None:
+        """Create the executors of sync filters, progress callbacks and CPU-bound handlers.
+
+        Their threads and processes are only started once they are used, they are shut down when the client is
+        terminated and created again for the next start.
+        """
+        self.filter_executor = ThreadPoolExecutor(
+            self.filter_workers,
+            thread_name_prefix="Filter",
+        )
+        self.progress_executor = ThreadPoolExecutor(
+            self.progress_workers,
+            thread_name_prefix="Progress",
+        )
+        self.process_executor = (
+            ProcessPoolExecutor(self.process_workers)
+            if self.process_workers
+            else None
+        )
+
     def __enter__(self):
         return self.start()
 
@@ -616,6 +746,7 @@ class Client(Methods):
             parsed_peers.append(
                 (peer_id, access_hash, peer_type, username, phone_number),
             )
+            self.peer_cache[peer_id] = peer
 
         await self.storage.update_peers(parsed_peers)
         await self.storage.update_usernames(usernames)
@@ -659,6 +790,7 @@ class Client(Methods):
 
                 if isinstance(update, raw.types.UpdateChannelTooLong):
                     log.info(update)
+                    self.sequencer.channel_too_long(update.channel_id, update.pts)
 
                 if isinstance(update, raw.types.UpdateNewChannelMessage) and is_min:
                     message = update.message
@@ -695,7 +827,9 @@ class Client(Methods):
                                 users.update({u.id: u for u in diff.users})
                                 chats.update({c.id: c for c in diff.chats})
 
-                self.dispatcher.updates_queue.put_nowait((update, users, chats))
+                self.sequencer.put(update, users, chats)
+
+            self.sequencer.set_seq(updates.seq, updates.date)
         elif isinstance(
             updates,
             raw.types.UpdateShortMessage | raw.types.UpdateShortChatMessage,
@@ -705,6 +839,26 @@ class Client(Methods):
                     (0, updates.pts, None, updates.date, None),
                 )
 
+            packet = self.sequencer.materialize(updates)
+
+            if packet is not None:
+                self.sequencer.put(*packet)
+                return
+
+            applied = (
+                None
+                if 0 in self.sequencer.gap_tasks
+                else self.sequencer.check(0, updates.pts, updates.pts_count)
+            )
+
+            if applied is False:
+                return
+
+            # The difference filling the gap will contain this message as well
+            if applied is None:
+                self.sequencer.put_sequenced(0, updates.pts, updates.pts_count, None)
+                return
+
             diff = await self.invoke(
                 raw.functions.updates.GetDifference(
                     pts=updates.pts - updates.pts_count,
@@ -729,10 +883,13 @@ class Client(Methods):
                 self.dispatcher.updates_queue.put_nowait(
                     (diff.other_updates[0], {}, {}),
                 )
+
+            self.sequencer.flush(0)
         elif isinstance(updates, raw.types.UpdateShort):
-            self.dispatcher.updates_queue.put_nowait((updates.update, {}, {}))
+            self.sequencer.put(updates.update, {}, {})
         elif isinstance(updates, raw.types.UpdatesTooLong):
             log.info(updates)
+            self.sequencer.updates_too_long()
 
     async def load_session(self) -> None:
         await self.storage.open()
@@ -967,6 +1124,7 @@ class Client(Methods):
             file_size,
             progress,
             progress_args,
+            verify_size,
         ) = packet
 
         Path(directory).mkdir(parents=True, exist_ok=True) if not in_memory else None
@@ -977,22 +1135,76 @@ class Client(Methods):
             .as_posix()
             + ".temp"
         )
-        file = BytesIO() if in_memory else Path(temp_file_path).open("wb")  # noqa: ASYNC230
+        # A temp file left by a previous attempt at the same media is continued rather than started over
+        media_key = utils.get_chunk_cache_key(file_id)
+        sink = (
+            MemorySink(file_size)
+            if in_memory
+            else FileSink(
+                temp_file_path,
+                file_size,
+                self.file_executor,
+                identity=f"{media_key} {file_size}" if media_key else None,
+            )
+        )
+        retries = 0
 
         try:
-            async for chunk in self.get_file(
-                file_id,
-                file_size,
-                0,
-                0,
-                progress,
-                progress_args,
-            ):
-                file.write(chunk)
+            while True:
+                await sink.flush()
+
+                # Every chunk was written by an attempt that stopped before the file was renamed
+                if file_size and sink.written >= file_size:
+                    break
+
+                # Only whole chunks are kept, requests must start at a chunk boundary
+                offset = sink.written // self.DOWNLOAD_CHUNK_SIZE
+                position = offset * self.DOWNLOAD_CHUNK_SIZE
+                await sink.truncate(position)
+
+                try:
+                    async for chunk in self.get_file(
+                        file_id,
+                        file_size,
+                        0,
+                        offset,
+                        progress,
+                        progress_args,
+                    ):
+                        await sink.write(position, chunk)
+                        position += len(chunk)
+
+                    await sink.flush()
+                except (
+                    pyrogram.StopTransmissionError,
+                    FloodWait,
+                    FloodPremiumWait,
+                ):
+                    raise
+                except Exception as e:
+                    # Failures count as consecutive only if no chunk was received in between
+                    if position > offset * self.DOWNLOAD_CHUNK_SIZE:
+                        retries = 0
+
+                    if retries >= self.DOWNLOAD_RETRIES:
+                        raise
+
+                    retries += 1
+                    log.warning(
+                        "Retrying download of %s from %s bytes due to error: %s",
+                        file_name,
+                        position,
+                        e,
+                    )
+                    await asyncio.sleep(retries)
+                else:
+                    break
         except BaseException as e:
-            if not in_memory:
-                file.close()
-                Path(temp_file_path).unlink()
+            await sink.close()
+
+            # The temp file is kept to resume the download, unless it was stopped on purpose
+            if not in_memory and isinstance(e, pyrogram.StopTransmissionError):
+                await self.loop.run_in_executor(self.file_executor, sink.remove)
 
             if isinstance(e, asyncio.CancelledError):
                 raise e
@@ -1000,14 +1212,31 @@ class Client(Methods):
             if isinstance(e, FloodWait | FloodPremiumWait):
                 raise e
 
+            if not isinstance(e, pyrogram.StopTransmissionError):
+                log.error("Error downloading %s: %s", file_name, e)
+
             return None
         else:
+            await sink.close()
+
+            if verify_size and file_size and sink.written != file_size:
+                log.error(
+                    "Downloaded %s bytes of %s instead of %s",
+                    sink.written,
+                    file_name,
+                    file_size,
+                )
+
+                if not in_memory:
+                    await self.loop.run_in_executor(self.file_executor, sink.remove)
+
+                return None
+
             if in_memory:
-                file.name = file_name
-                return file
-            file.close()
+                return sink.get_file(file_name)
             file_path = Path(temp_file_path).with_suffix("")
             shutil.move(str(temp_file_path), str(file_path))
+            await self.loop.run_in_executor(self.file_executor, sink.remove_state)
             return str(file_path)
 
     async def get_file(
@@ -1020,46 +1249,55 @@ class Client(Methods):
         progress_args: tuple = (),
     ) -> AsyncGenerator[bytes, None] | None:
         async with self.get_file_semaphore:
-            file_type = file_id.file_type
+            location = utils.get_input_file_location(file_id)
 
-            if file_type == FileType.CHAT_PHOTO:
-                if file_id.chat_id > 0:
-                    peer = raw.types.InputPeerUser(
-                        user_id=file_id.chat_id,
-                        access_hash=file_id.chat_access_hash,
-                    )
-                elif file_id.chat_access_hash == 0:
-                    peer = raw.types.InputPeerChat(chat_id=-file_id.chat_id)
-                else:
-                    peer = raw.types.InputPeerChannel(
-                        channel_id=utils.get_channel_id(file_id.chat_id),
-                        access_hash=file_id.chat_access_hash,
-                    )
+            current = 0
+            total = abs(limit) or (1 << 31) - 1
+            chunk_size = self.DOWNLOAD_CHUNK_SIZE
+            offset_bytes = abs(offset) * chunk_size
+            cache_key = (
+                utils.get_chunk_cache_key(file_id)
+                if self.chunk_cache is not None
+                else None
+            )
 
-                location = raw.types.InputPeerPhotoFileLocation(
-                    peer=peer,
-                    photo_id=file_id.media_id,
-                    big=file_id.thumbnail_source == ThumbnailSource.CHAT_PHOTO_BIG,
-                )
-            elif file_type == FileType.PHOTO:
-                location = raw.types.InputPhotoFileLocation(
-                    id=file_id.media_id,
-                    access_hash=file_id.access_hash,
-                    file_reference=file_id.file_reference,
-                    thumb_size=file_id.thumbnail_size,
+            async def report_progress() -> None:
+                func = functools.partial(
+                    progress,
+                    min(offset_bytes, file_size) if file_size != 0 else offset_bytes,
+                    file_size,
+                    *progress_args,
                 )
-            else:
-                location = raw.types.InputDocumentFileLocation(
-                    id=file_id.media_id,
-                    access_hash=file_id.access_hash,
-                    file_reference=file_id.file_reference,
-                    thumb_size=file_id.thumbnail_size,
+
+                if inspect.iscoroutinefunction(progress):
+                    await func()
+                else:
+                    await self.loop.run_in_executor(self.progress_executor, func)
+
+            # Chunks already in the cache are served without starting a session
+            while cache_key is not None and current < total:
+                chunk = await self.chunk_cache.get(
+                    cache_key,
+                    offset_bytes // chunk_size,
+                    self.file_executor,
                 )
 
-            current = 0
-            total = abs(limit) or (1 << 31) - 1
-            chunk_size = 1024 * 1024
-            offset_bytes = abs(offset) * chunk_size
+                if chunk is None:
+                    break
+
+                yield chunk
+
+                current += 1
+                offset_bytes += chunk_size
+
+                if progress:
+                    await report_progress()
+
+                if len(chunk) < chunk_size:
+                    return
+
+            if current >= total:
+                return
 
             dc_id = file_id.dc_id
 
@@ -1103,27 +1341,21 @@ class Client(Methods):
                     while True:
                         chunk = r.bytes
 
+                        if cache_key is not None:
+                            await self.chunk_cache.set(
+                                cache_key,
+                                offset_bytes // chunk_size,
+                                chunk,
+                                self.file_executor,
+                            )
+
                         yield chunk
 
                         current += 1
                         offset_bytes += chunk_size
 
                         if progress:
-                            func = functools.partial(
-                                progress,
-                                (
-                                    min(offset_bytes, file_size)
-                                    if file_size != 0
-                                    else offset_bytes
-                                ),
-                                file_size,
-                                *progress_args,
-                            )
-
-                            if inspect.iscoroutinefunction(progress):
-                                await func()
-                            else:
-                                await self.loop.run_in_executor(self.executor, func)
+                            await report_progress()
 
                         if len(chunk) < chunk_size or current >= total:
                             break
@@ -1206,30 +1438,21 @@ class Client(Methods):
                                     "h.hash == sha256(cdn_chunk).digest()",
                                 )
 
+                            if cache_key is not None:
+                                await self.chunk_cache.set(
+                                    cache_key,
+                                    offset_bytes // chunk_size,
+                                    decrypted_chunk,
+                                    self.file_executor,
+                                )
+
                             yield decrypted_chunk
 
                             current += 1
                             offset_bytes += chunk_size
 
                             if progress:
-                                func = functools.partial(
-                                    progress,
-                                    (
-                                        min(offset_bytes, file_size)
-                                        if file_size != 0
-                                        else offset_bytes
-                                    ),
-                                    file_size,
-                                    *progress_args,
-                                )
-
-                                if inspect.iscoroutinefunction(progress):
-                                    await func()
-                                else:
-                                    await self.loop.run_in_executor(
-                                        self.executor,
-                                        func,
-                                    )
+                                await report_progress()
 
                             if len(chunk) < chunk_size or current >= total:
                                 break
@@ -1237,12 +1460,6 @@ class Client(Methods):
                         raise e
                     finally:
                         await cdn_session.stop()
-            except pyrogram.StopTransmissionError:
-                raise
-            except (FloodWait, FloodPremiumWait):
-                raise
-            except Exception as e:
-                log.exception(e)
             finally:
                 await session.stop()
 
@@ -1253,16 +1470,214 @@ class Client(Methods):
         return self.mimetypes.guess_extension(mime_type)
 
 
+class DownloadSink(ABC):
+    """Where downloaded chunks are written, each at its own offset.
+
+    :attr:`written` is the size of the data received so far without gaps, chunks may be written in any order.
+    Subclasses implement :meth:`write` and call :meth:`advance` once a chunk is stored.
+    """
+
+    def __init__(self) -> None:
+        self.written = 0
+        # Chunks written past a gap, end offset by start offset
+        self.ahead = {}
+
+    def advance(self, offset: int, end: int) -> None:
+        self.ahead[offset] = end
+
+        while self.written in self.ahead:
+            self.written = self.ahead.pop(self.written)
+
+    @abstractmethod
+    async def write(self, offset: int, chunk: bytes) -> None:
+        raise NotImplementedError
+
+    async def truncate(self, size: int) -> None:
+        self.written = size
+        self.ahead.clear()
+
+    async def flush(self) -> None:
+        return
+
+    async def close(self) -> None:
+        return
+
+
+class MemorySink(DownloadSink):
+    """Keeps a download in a BytesIO grown to the file size upfront, chunks are copied straight into its buffer."""
+
+    def __init__(self, size: int) -> None:
+        super().__init__()
+
+        self.file = BytesIO()
+        self.capacity = 0
+        self.reserve(size)
+
+    def reserve(self, size: int) -> None:
+        if size > self.capacity:
+            self.file.seek(size - 1)
+            self.file.write(b"\0")
+            self.capacity = size
+
+    async def write(self, offset: int, chunk: bytes) -> None:
+        end = offset + len(chunk)
+        self.reserve(end)
+
+        with self.file.getbuffer() as view:
+            view[offset:end] = chunk
+
+        self.advance(offset, end)
+
+    def get_file(self, name: str) -> BytesIO:
+        self.file.truncate(self.written)
+        self.file.seek(0, os.SEEK_END)
+        self.file.name = name
+
+        return self.file
+
+
+class FileSink(DownloadSink):
+    """Writes a download into a file preallocated to the file size, with :func:`os.pwrite` in an executor.
+
+    Up to *max_pending* writes are in flight while the next chunks are downloaded. The *identity* of the downloaded
+    media and :attr:`written` are kept up to date in a file next to it, so that an unfinished download of the same
+    media can be continued from there, even if the process was killed before the file was truncated on close.
+    """
+
+    STATE_SUFFIX = ".state"
+
+    def __init__(
+        self,
+        path: str,
+        size: int,
+        executor=None,
+        max_pending: int = 4,
+        identity: str | None = None,
+    ) -> None:
+        super().__init__()
+
+        self.path = path
+        self.state_path = path + self.STATE_SUFFIX
+        self.size = size
+        self.executor = executor
+        self.max_pending = max_pending
+        self.loop = asyncio.get_event_loop()
+        self.lock = threading.Lock()
+        self.pending = deque()
+        self.fd = os.open(
+            path,
+            os.O_RDWR | os.O_CREAT | getattr(os, "O_BINARY", 0),
+            0o666,
+        )
+
+        self.identity = identity
+
+        if identity is None:
+            self.remove_state()
+            return
+
+        state = self.read_state()
+
+        if state is not None and state[0] == identity:
+            # The file may be preallocated past the data actually written
+            self.written = min(state[1], os.fstat(self.fd).st_size)
+        else:
+            # Started over, a file of unknown origin could belong to another media with the same name
+            self.write_state(0)
+
+    def read_state(self) -> tuple[str, int] | None:
+        try:
+            identity, written = Path(self.state_path).read_text().rsplit("\n", 1)
+            return identity, int(written)
+        except (OSError, ValueError):
+            return None
+
+    def write_state(self, written: int) -> None:
+        if self.identity is not None:
+            with self.lock:
+                Path(self.state_path).write_text(f"{self.identity}\n{written}")
+
+    def remove_state(self) -> None:
+        Path(self.state_path).unlink(missing_ok=True)
+
+    def remove(self) -> None:
+        Path(self.path).unlink(missing_ok=True)
+        self.remove_state()
+
+    def write_at(self, offset: int, chunk: bytes) -> None:
+        view = memoryview(chunk)
+
+        while view:
+            if hasattr(os, "pwrite"):
+                n = os.pwrite(self.fd, view, offset)
+            else:
+                with self.lock:
+                    os.lseek(self.fd, offset, os.SEEK_SET)
+                    n = os.write(self.fd, view)
+
+            view = view[n:]
+            offset += n
+
+    def resize(self, size: int) -> None:
+        os.ftruncate(self.fd, size)
+
+        if self.size > size and hasattr(os, "posix_fallocate"):
+            # Not supported by every file system, the file just grows as it's written then
+            with contextlib.suppress(OSError):
+                os.posix_fallocate(self.fd, size, self.size - size)
+
+    async def write_chunk(self, offset: int, chunk: bytes) -> None:
+        await self.loop.run_in_executor(self.executor, self.write_at, offset, chunk)
+
+        written = self.written
+        self.advance(offset, offset + len(chunk))
+
+        if self.written != written:
+            await self.loop.run_in_executor(
+                self.executor,
+                self.write_state,
+                self.written,
+            )
+
+    async def write(self, offset: int, chunk: bytes) -> None:
+        while len(self.pending) >= self.max_pending:
+            await self.pending.popleft()
+
+        self.pending.append(self.loop.create_task(self.write_chunk(offset, chunk)))
+
+    async def truncate(self, size: int) -> None:
+        await self.flush()
+        await self.loop.run_in_executor(self.executor, self.write_state, size)
+        await self.loop.run_in_executor(self.executor, self.resize, size)
+        await super().truncate(size)
+
+    async def flush(self) -> None:
+        while self.pending:
+            await self.pending.popleft()
+
+    async def close(self) -> None:
+        await asyncio.gather(*self.pending, return_exceptions=True)
+        self.pending.clear()
+
+        await self.loop.run_in_executor(
+            self.executor,
+            os.ftruncate,
+            self.fd,
+            self.written,
+        )
+        os.close(self.fd)
+
+
 class Cache:
     def __init__(self, capacity: int) -> None:
         self.capacity = capacity
         self.store = OrderedDict()
 
     def __getitem__(self, key):
-        value = self.store.pop(key, None)
+        value = self.store.get(key)
         if value is not None:
-            # Reinsert the accessed item as the most recent one
-            self.store[key] = value
+            # Mark the accessed item as the most recent one
+            self.store.move_to_end(key)
         return value
 
     def __setitem__(self, key, value) -> None:
@@ -1273,3 +1688,227 @@ class Cache:
 
         if len(self.store) > self.capacity:
             self.store.popitem(last=False)
+
+    def pop(self, key, default=None):
+        return self.store.pop(key, default)
+
+
+class MessageCache:
+    """Cache of parsed messages keyed by (chat_id, message_id) and partitioned by chat.
+
+    The cache is bounded both by number of messages and by an estimate of the memory they take, the least recently
+    used messages are evicted first. Messages expire after *ttl* seconds and are dropped as soon as they are edited
+    or deleted.
+    """
+
+    def __init__(self, capacity: int, max_size: int, ttl: float | None) -> None:
+        self.capacity = capacity
+        self.max_size = max_size
+        self.ttl = ttl
+        self.store = OrderedDict()
+        self.chats = {}
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def __len__(self) -> int:
+        return len(self.store)
+
+    def __getitem__(self, key):
+        entry = self.store.get(key)
+
+        if entry is None:
+            self.misses += 1
+            return None
+
+        value, _, expires = entry
+
+        if expires is not None and expires <= time.monotonic():
+            self.pop(key)
+            self.expirations += 1
+            self.misses += 1
+            return None
+
+        self.store.move_to_end(key)
+        self.hits += 1
+
+        return value
+
+    def __setitem__(self, key, value) -> None:
+        self.pop(key)
+
+        size = self.get_size(value)
+
+        if size > self.max_size:
+            return
+
+        self.store[key] = (
+            value,
+            size,
+            time.monotonic() + self.ttl if self.ttl is not None else None,
+        )
+        self.chats.setdefault(key[0], set()).add(key[1])
+        self.size += size
+
+        while len(self.store) > self.capacity or self.size > self.max_size:
+            self.pop(next(iter(self.store)))
+            self.evictions += 1
+
+    def pop(self, key):
+        entry = self.store.pop(key, None)
+
+        if entry is None:
+            return None
+
+        self.size -= entry[1]
+
+        message_ids = self.chats[key[0]]
+        message_ids.discard(key[1])
+
+        if not message_ids:
+            del self.chats[key[0]]
+
+        return entry[0]
+
+    def invalidate(self, chat_id: int | None, message_ids: list[int]) -> None:
+        """Drop messages from the cache.
+
+        A *chat_id* of None stands for the chats sharing the common message box (private chats and basic groups),
+        where message ids are unique across chats.
+        """
+        chat_ids = (
+            [chat_id]
+            if chat_id is not None
+            else [i for i in self.chats if utils.get_peer_type(i) != "channel"]
+        )
+
+        for i in chat_ids:
+            cached = self.chats.get(i)
+
+            if not cached:
+                continue
+
+            for message_id in cached.intersection(message_ids):
+                self.pop((i, message_id))
+                self.invalidations += 1
+
+    def invalidate_chat(self, chat_id: int) -> None:
+        for message_id in list(self.chats.get(chat_id, ())):
+            self.pop((chat_id, message_id))
+            self.invalidations += 1
+
+    def get_stats(self) -> dict:
+        lookups = self.hits + self.misses
+
+        return {
+            "messages": len(self.store),
+            "chats": len(self.chats),
+            "size": self.size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+        }
+
+    @staticmethod
+    def get_size(value) -> int:
+        """Estimate the memory taken by a message, not counting the objects it shares with other messages."""
+        attributes = (
+            value._attributes()
+            if isinstance(value, pyrogram.types.Object)
+            else getattr(value, "__dict__", {})
+        )
+
+        return sys.getsizeof(value) + sum(
+            sys.getsizeof(v)
+            for k, v in attributes.items()
+            if v is not None
+            and k not in {"_client", "chat", "from_user", "sender_chat"}
+        )
+
+
+class IdentityMap:
+    """Shares the User and Chat objects parsed from the same raw peers.
+
+    Parsed objects are keyed by peer id and remember the raw peer they come from: they are reused for as long as
+    the raw peer is the same object or an equal one, so the objects of a sender are built once for a whole batch of
+    messages and for the following updates, and parsed again as soon as any of its fields changes. At most
+    *capacity* objects are kept, the least recently used are dropped. Shared objects must not be modified in place,
+    as documented on :obj:`~pyrogram.types.User` and :obj:`~pyrogram.types.Chat`.
+    """
+
+    def __init__(self, client: pyrogram.Client, capacity: int) -> None:
+        self.client = client
+        self.capacity = capacity
+        self.store = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, kind: str, peer, parse):
+        key = (kind, peer.id)
+        entry = self.store.get(key)
+
+        if entry is not None and (
+            entry[0] is peer or (type(entry[0]) is type(peer) and entry[0] == peer)
+        ):
+            self.store.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+        self.misses += 1
+        parsed = parse(self.client, peer)
+
+        self.store[key] = (peer, parsed)
+        self.store.move_to_end(key)
+
+        if len(self.store) > self.capacity:
+            self.store.popitem(last=False)
+
+        return parsed
+
+    def get_user(self, user: raw.base.User | None) -> User | None:
+        if not isinstance(user, raw.types.User):
+            return User._parse(self.client, user)
+
+        return self.get("user", user, User._parse)
+
+    def get_chat(self, chat: raw.base.User | raw.base.Chat) -> pyrogram.types.Chat:
+        if isinstance(chat, raw.types.User):
+            return self.get("user_chat", chat, pyrogram.types.Chat._parse_user_chat)
+
+        if isinstance(chat, raw.types.Chat | raw.types.ChatForbidden):
+            return self.get("chat", chat, pyrogram.types.Chat._parse_chat_chat)
+
+        return self.get("channel", chat, pyrogram.types.Chat._parse_channel_chat)
+
+    def invalidate(self, update) -> None:
+        user_id = getattr(update, "user_id", None)
+
+        if user_id is not None:
+            self.store.pop(("user", user_id), None)
+            self.store.pop(("user_chat", user_id), None)
+
+        chat_id = getattr(update, "chat_id", None)
+
+        if chat_id is not None:
+            self.store.pop(("chat", chat_id), None)
+
+        channel_id = getattr(update, "channel_id", None)
+
+        if channel_id is not None:
+            self.store.pop(("channel", channel_id), None)
+
+    def get_stats(self) -> dict:
+        lookups = self.hits + self.misses
+
+        return {
+            "objects": len(self.store),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
@@ -2,6 +2,7 @@
 from __future__ import annotations
 
 import asyncio
+import contextlib
 import inspect
 import logging
 from collections import OrderedDict
@@ -46,7 +47,9 @@ from pyrogram.raw.types import (
     UpdateBotShippingQuery,
     UpdateBotStopped,
     UpdateBusinessBotCallbackQuery,
+    UpdateChannel,
     UpdateChannelParticipant,
+    UpdateChat,
     UpdateChatParticipant,
     UpdateDeleteChannelMessages,
     UpdateDeleteMessages,
@@ -58,6 +61,10 @@ from pyrogram.raw.types import (
     UpdateNewMessage,
     UpdateNewScheduledMessage,
     UpdateStory,
+    UpdateUser,
+    UpdateUserEmojiStatus,
+    UpdateUserName,
+    UpdateUserPhone,
     UpdateUserStatus,
 )
 
@@ -81,6 +88,15 @@ class Dispatcher:
         UpdateDeleteChannelMessages,
     )
     DELETE_BOT_BUSINESS_MESSAGES_UPDATES = (UpdateBotDeleteBusinessMessage,)
+    PEER_UPDATES = (
+        UpdateUser,
+        UpdateUserName,
+        UpdateUserPhone,
+        UpdateUserStatus,
+        UpdateUserEmojiStatus,
+        UpdateChat,
+        UpdateChannel,
+    )
     CALLBACK_QUERY_UPDATES = (
         UpdateBotCallbackQuery,
         UpdateInlineBotCallbackQuery,
@@ -103,15 +119,20 @@ class Dispatcher:
     PRE_CHECKOUT_QUERY_UPDATES = (UpdateBotPrecheckoutQuery,)
     SHIPPING_QUERY_UPDATES = (UpdateBotShippingQuery,)
 
+    RECOVERY_CONCURRENCY = 8
+    RECOVERY_QUEUE_SIZE = 10000
+
     def __init__(self, client: pyrogram.Client) -> None:
         self.client = client
         self.loop = asyncio.get_event_loop()
         self.handler_worker_tasks = []
         self.locks_list = []
         self.updates_queue = asyncio.Queue()
+        self.updates_queue_drained = asyncio.Event()
+        self.recovery_task = None
+        self.recovery_stats = {}
         self.groups = OrderedDict()
         self.conversation_handler = ConversationHandler()
-        self.groups[0] = [self.conversation_handler]
 
         async def message_parser(update, users, chats):
             return (
@@ -138,6 +159,13 @@ class Dispatcher:
             )
 
         async def edited_message_parser(update, users, chats):
+            # Drop the old version so that replies are not resolved to it while parsing
+            if getattr(update.message, "peer_id", None):
+                self.client.message_cache.invalidate(
+                    utils.get_peer_id(update.message.peer_id),
+                    [update.message.id],
+                )
+
             parsed, _ = await message_parser(update, users, chats)
 
             return (parsed, EditedMessageHandler)
@@ -148,6 +176,13 @@ class Dispatcher:
             return (parsed, EditedBotBusinessMessageHandler)
 
         async def deleted_messages_parser(update, users, chats):
+            channel_id = getattr(update, "channel_id", None)
+
+            self.client.message_cache.invalidate(
+                utils.get_channel_id(channel_id) if channel_id is not None else None,
+                update.messages,
+            )
+
             return (
                 utils.parse_deleted_messages(self.client, update),
                 DeletedMessagesHandler,
@@ -320,111 +355,153 @@ class Dispatcher:
             log.info("Started %s HandlerTasks", self.client.workers)
 
             if not self.client.skip_updates:
-                states = await self.client.storage.update_state()
-
-                if not states:
-                    log.info("No states found, skipping recovery.")
-                    return
-
-                message_updates_counter = 0
-                other_updates_counter = 0
-
-                for state in states:
-                    id, local_pts, _, local_date, _ = state
-
-                    prev_pts = 0
-
-                    while True:
-                        try:
-                            diff = await self.client.invoke(
-                                raw.functions.updates.GetChannelDifference(
-                                    channel=await self.client.resolve_peer(id),
-                                    filter=raw.types.ChannelMessagesFilterEmpty(),
-                                    pts=local_pts,
-                                    limit=10000,
-                                )
-                                if id < 0
-                                else raw.functions.updates.GetDifference(
-                                    pts=local_pts,
-                                    date=local_date,
-                                    qts=0,
-                                ),
-                            )
-                        except (
-                            errors.ChannelPrivate,
-                            errors.ChannelInvalid,
-                        ):
-                            break
+                self.recovery_task = self.loop.create_task(self.recover_updates())
 
-                        if isinstance(
-                            diff,
-                            raw.types.updates.DifferenceEmpty
-                            | raw.types.updates.DifferenceTooLong,
-                        ):
-                            break
-                        if isinstance(diff, raw.types.updates.Difference):
-                            local_pts = diff.state.pts
-                        elif isinstance(diff, raw.types.updates.DifferenceSlice):
-                            local_pts = diff.intermediate_state.pts
-                            local_date = diff.intermediate_state.date
-
-                            if prev_pts == local_pts:
-                                break
-
-                            prev_pts = local_pts
-                        elif isinstance(
-                            diff,
-                            raw.types.updates.ChannelDifferenceEmpty
-                            | raw.types.updates.ChannelDifferenceTooLong,
-                        ):
-                            break
-                        if isinstance(diff, raw.types.updates.ChannelDifference):
-                            local_pts = diff.pts
-
-                        users = {i.id: i for i in diff.users}
-                        chats = {i.id: i for i in diff.chats}
-
-                        for message in diff.new_messages:
-                            message_updates_counter += 1
-                            self.updates_queue.put_nowait(
-                                (
-                                    raw.types.UpdateNewMessage(
-                                        message=message,
-                                        pts=local_pts,
-                                        pts_count=-1,
-                                    )
-                                    if id == self.client.me.id
-                                    else raw.types.UpdateNewChannelMessage(
-                                        message=message,
-                                        pts=local_pts,
-                                        pts_count=-1,
-                                    ),
-                                    users,
-                                    chats,
-                                ),
-                            )
-
-                        for update in diff.other_updates:
-                            other_updates_counter += 1
-                            self.updates_queue.put_nowait((update, users, chats))
-
-                        if isinstance(
-                            diff,
-                            raw.types.updates.Difference
-                            | raw.types.updates.ChannelDifference,
-                        ):
-                            break
+    async def recover_updates(self) -> None:
+        states = await self.client.storage.update_state()
+
+        if not states:
+            log.info("No states found, skipping recovery.")
+            return
+
+        # The common state goes first, followed by the most recently active channels
+        states = sorted(states, key=lambda state: (state[0] < 0, -(state[3] or 0)))
 
-                    await self.client.storage.update_state(id)
+        self.recovery_stats.update(
+            states=len(states),
+            recovered_states=0,
+            messages=0,
+            updates=0,
+        )
+
+        semaphore = asyncio.Semaphore(self.RECOVERY_CONCURRENCY)
+
+        async def recover(state) -> None:
+            async with semaphore:
+                try:
+                    await self.recover_state(state)
+                except Exception as e:
+                    log.exception(e)
+                finally:
+                    self.recovery_stats["recovered_states"] += 1
+
+        await asyncio.gather(*(recover(state) for state in states))
+
+        log.info(
+            "Recovered %s messages and %s updates.",
+            self.recovery_stats["messages"],
+            self.recovery_stats["updates"],
+        )
+
+    async def recover_state(self, state: tuple[int, int, int, int, int]) -> None:
+        id, local_pts, _, local_date, _ = state
+
+        prev_pts = 0
+
+        while True:
+            try:
+                diff = await self.client.invoke(
+                    raw.functions.updates.GetChannelDifference(
+                        channel=await self.client.resolve_peer(id),
+                        filter=raw.types.ChannelMessagesFilterEmpty(),
+                        pts=local_pts,
+                        limit=10000,
+                    )
+                    if id < 0
+                    else raw.functions.updates.GetDifference(
+                        pts=local_pts,
+                        date=local_date,
+                        qts=0,
+                    ),
+                )
+            except (
+                errors.ChannelPrivate,
+                errors.ChannelInvalid,
+            ):
+                break
 
-                log.info(
-                    "Recovered %s messages and %s updates.",
-                    message_updates_counter,
-                    other_updates_counter,
+            if isinstance(
+                diff,
+                raw.types.updates.DifferenceEmpty
+                | raw.types.updates.DifferenceTooLong,
+            ):
+                break
+            if isinstance(diff, raw.types.updates.Difference):
+                local_pts = diff.state.pts
+            elif isinstance(diff, raw.types.updates.DifferenceSlice):
+                local_pts = diff.intermediate_state.pts
+                local_date = diff.intermediate_state.date
+
+                if prev_pts == local_pts:
+                    break
+
+                prev_pts = local_pts
+            elif isinstance(
+                diff,
+                raw.types.updates.ChannelDifferenceEmpty
+                | raw.types.updates.ChannelDifferenceTooLong,
+            ):
+                break
+            if isinstance(diff, raw.types.updates.ChannelDifference):
+                local_pts = diff.pts
+
+            users = {i.id: i for i in diff.users}
+            chats = {i.id: i for i in diff.chats}
+
+            for message in diff.new_messages:
+                self.recovery_stats["messages"] += 1
+                await self.put_recovered_update(
+                    (
+                        raw.types.UpdateNewChannelMessage(
+                            message=message,
+                            pts=local_pts,
+                            pts_count=-1,
+                        )
+                        if id < 0
+                        else raw.types.UpdateNewMessage(
+                            message=message,
+                            pts=local_pts,
+                            pts_count=-1,
+                        ),
+                        users,
+                        chats,
+                    ),
                 )
 
+            for update in diff.other_updates:
+                self.recovery_stats["updates"] += 1
+                await self.put_recovered_update((update, users, chats))
+
+            if isinstance(
+                diff,
+                raw.types.updates.Difference | raw.types.updates.ChannelDifference,
+            ):
+                break
+
+        # Live updates received meanwhile saved a newer state, which is where the next recovery has to start from
+        current = {s[0]: tuple(s) for s in await self.client.storage.update_state()}
+
+        if current.get(id) == tuple(state):
+            await self.client.storage.update_state(id)
+
+    async def put_recovered_update(self, packet) -> None:
+        # Recovered updates wait for room in the queue, live ones never do
+        while self.updates_queue.qsize() >= self.RECOVERY_QUEUE_SIZE:
+            self.updates_queue_drained.clear()
+            await self.updates_queue_drained.wait()
+
+        self.updates_queue.put_nowait(packet)
+
     async def stop(self) -> None:
         if not self.client.no_updates:
+            if self.recovery_task is not None:
+                self.recovery_task.cancel()
+
+                with contextlib.suppress(asyncio.CancelledError):
+                    await self.recovery_task
+
+                self.recovery_task = None
+
             for _i in range(self.client.workers):
                 self.updates_queue.put_nowait(None)
 
@@ -436,6 +513,22 @@ class Dispatcher:
 
             log.info("Stopped %s HandlerTasks", self.client.workers)
 
+    def get_executor_stats(self) -> dict[str, dict]:
+        """Queue wait time statistics of the executors running sync callbacks, filters, progress and file I/O."""
+        executors = {
+            "handlers": self.client.executor,
+            "filters": self.client.filter_executor,
+            "progress": self.client.progress_executor,
+            "files": self.client.file_executor,
+            "processes": self.client.process_executor,
+        }
+
+        return {
+            name: executor.stats.to_dict()
+            for name, executor in executors.items()
+            if hasattr(executor, "stats")
+        }
+
     def add_handler(self, handler, group: int) -> None:
         async def fn() -> None:
             for lock in self.locks_list:
@@ -478,10 +571,16 @@ class Dispatcher:
             if packet is None:
                 break
 
+            # Regex results are shared by the filters checking this update only
+            regex_cache = pyrogram.filters.RegexPrefilter.dispatch_cache.set({})
+
             try:
                 update, users, chats = packet
                 parser = self.update_parsers.get(type(update), None)
 
+                if isinstance(update, Dispatcher.PEER_UPDATES):
+                    self.client.identity_map.invalidate(update)
+
                 try:
                     parsed_update, handler_type = (
                         await parser(update, users, chats)
@@ -492,8 +591,23 @@ class Dispatcher:
                     log.info("Parse exception: %s %s", type(e).__name__, e)
                     parsed_update, handler_type = (None, type(None))
 
+                consumed = False
+
+                if isinstance(self.conversation_handler, handler_type):
+                    try:
+                        consumed = await self.conversation_handler.check(
+                            self.client,
+                            parsed_update,
+                        )
+                    except Exception as e:
+                        log.exception(e)
+
                 async with lock:
-                    for group in self.groups.values():
+                    for group_number, group in self.groups.items():
+                        # Updates consumed by a listener only skip group 0, which the listeners belong to
+                        if consumed and group_number == 0:
+                            continue
+
                         for handler in group:
                             args = None
 
@@ -517,6 +631,17 @@ class Dispatcher:
                             try:
                                 if inspect.iscoroutinefunction(handler.callback):
                                     await handler.callback(self.client, *args)
+                                elif self.client.process_executor and getattr(
+                                    handler.callback,
+                                    "cpu_bound",
+                                    False,
+                                ):
+                                    await self.loop.run_in_executor(
+                                        self.client.process_executor,
+                                        handler.callback,
+                                        None,
+                                        *args,
+                                    )
                                 else:
                                     await self.loop.run_in_executor(
                                         self.client.executor,
@@ -537,4 +662,8 @@ class Dispatcher:
             except Exception as e:
                 log.exception(e)
             finally:
+                pyrogram.filters.RegexPrefilter.dispatch_cache.reset(regex_cache)
                 self.updates_queue.task_done()
+
+                if self.updates_queue.qsize() < self.RECOVERY_QUEUE_SIZE:
+                    self.updates_queue_drained.set()
@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import concurrent.futures
+import threading
+import time
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+
+class ExecutorStats:
+    """Counters of the time tasks spend queued before a worker picks them up."""
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.submitted = 0
+        self.started = 0
+        self.timed = 0
+        self.wait_time = 0.0
+        self.max_wait_time = 0.0
+
+    def submit(self) -> None:
+        with self.lock:
+            self.submitted += 1
+
+    def start(self, wait_time: float | None) -> None:
+        with self.lock:
+            self.started += 1
+
+            if wait_time is not None:
+                self.timed += 1
+                self.wait_time += wait_time
+                self.max_wait_time = max(self.max_wait_time, wait_time)
+
+    def to_dict(self) -> dict:
+        with self.lock:
+            return {
+                "submitted": self.submitted,
+                "queued": self.submitted - self.started,
+                "average_wait_time": self.wait_time / self.timed
+                if self.timed
+                else 0.0,
+                "max_wait_time": self.max_wait_time,
+            }
+
+
+class ProcessExecutorStats(ExecutorStats):
+    """:class:`ExecutorStats` of a process pool.
+
+    The wait time of a task is only known once the task is done, so the tasks not done yet are reported as
+    ``in_flight``, whether they are still queued or already running.
+    """
+
+    def to_dict(self) -> dict:
+        stats = super().to_dict()
+        stats["in_flight"] = stats.pop("queued")
+
+        return stats
+
+
+class ThreadPoolExecutor(concurrent.futures.ThreadPoolExecutor):
+    """A :class:`~concurrent.futures.ThreadPoolExecutor` keeping :class:`ExecutorStats`."""
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+
+        self.stats = ExecutorStats()
+
+    def submit(self, fn: Callable, /, *args, **kwargs) -> concurrent.futures.Future:
+        submitted = time.monotonic()
+
+        def run():
+            self.stats.start(time.monotonic() - submitted)
+            return fn(*args, **kwargs)
+
+        future = super().submit(run)
+        self.stats.submit()
+
+        return future
+
+
+def timed_call(submitted: float, fn: Callable, *args, **kwargs):
+    return time.time() - submitted, fn(*args, **kwargs)
+
+
+class ProcessPoolExecutor(concurrent.futures.ProcessPoolExecutor):
+    """A :class:`~concurrent.futures.ProcessPoolExecutor` keeping :class:`ExecutorStats`.
+
+    The function and its arguments are pickled, so they must be importable functions and picklable objects.
+    """
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+
+        self.stats = ProcessExecutorStats()
+
+    def submit(self, fn: Callable, /, *args, **kwargs) -> concurrent.futures.Future:
+        future = concurrent.futures.Future()
+        inner = super().submit(timed_call, time.time(), fn, *args, **kwargs)
+        self.stats.submit()
+
+        def done(f: concurrent.futures.Future) -> None:
+            if f.cancelled() or f.exception() is not None:
+                self.stats.start(None)
+
+                if not future.cancelled():
+                    if f.cancelled():
+                        future.cancel()
+                    else:
+                        future.set_exception(f.exception())
+
+                return
+
+            wait_time, result = f.result()
+            self.stats.start(wait_time)
+
+            if not future.cancelled():
+                future.set_result(result)
+
+        inner.add_done_callback(done)
+        future.add_done_callback(lambda f: f.cancelled() and inner.cancel())
+
+        return future
+
+
+def cpu_bound(func: Callable) -> Callable:
+    """Mark a sync handler callback to be run in the process pool of the Client.
+
+    The callback only runs in a separate process if the Client was created with ``process_workers``, otherwise it
+    is run in the handler threads as usual. It must be a module level function and it receives ``None`` in place of
+    the Client together with a pickled copy of the update.
+
+    Example:
+        .. code-block:: python
+
+            from pyrogram.executor import cpu_bound
+
+            @app.on_message(filters.document)
+            @cpu_bound
+            def crunch(_, message):
+                ...
+    """
+    func.cpu_bound = True
+    return func
@@ -1,10 +1,22 @@
 from __future__ import annotations
 
+import bisect
 import inspect
+import mmap
 import re
+import typing
+from contextvars import ContextVar
+from pathlib import Path
 from re import Pattern
 from typing import TYPE_CHECKING
 
+try:
+    from re import _constants as sre_constants
+    from re import _parser as sre_parse
+except ImportError:  # Python 3.10
+    import sre_constants
+    import sre_parse
+
 import pyrogram
 from pyrogram import enums
 from pyrogram.types import (
@@ -45,7 +57,7 @@ class InvertFilter(Filter):
             x = await self.base(client, update)
         else:
             x = await client.loop.run_in_executor(
-                client.executor,
+                client.filter_executor,
                 self.base,
                 client,
                 update,
@@ -64,7 +76,7 @@ class AndFilter(Filter):
             x = await self.base(client, update)
         else:
             x = await client.loop.run_in_executor(
-                client.executor,
+                client.filter_executor,
                 self.base,
                 client,
                 update,
@@ -77,7 +89,7 @@ class AndFilter(Filter):
             y = await self.other(client, update)
         else:
             y = await client.loop.run_in_executor(
-                client.executor,
+                client.filter_executor,
                 self.other,
                 client,
                 update,
@@ -96,7 +108,7 @@ class OrFilter(Filter):
             x = await self.base(client, update)
         else:
             x = await client.loop.run_in_executor(
-                client.executor,
+                client.filter_executor,
                 self.base,
                 client,
                 update,
@@ -109,7 +121,7 @@ class OrFilter(Filter):
             y = await self.other(client, update)
         else:
             y = await client.loop.run_in_executor(
-                client.executor,
+                client.filter_executor,
                 self.other,
                 client,
                 update,
@@ -688,6 +700,158 @@ general_forum_topic_unhidden = create(general_topic_unhidden_filter)
 """Filter service message for unhidden general forum topics"""
 
 
+COMMAND_ARGS_RE = re.compile(r"([\"'])(.*?)(?<!\\)\1|(\S+)")
+COMMAND_ESCAPE_RE = re.compile(r"\\([\"'])")
+COMMAND_TOKEN_RE = re.compile(r"\S*")
+COMMAND_REGEX_CHARS = frozenset(".^$*+?{}[]\\|()")
+
+
+class CommandSet(set):
+    """A set of commands or prefixes of :meth:`~pyrogram.filters.command` that counts its changes.
+
+    The version is increased by every change made in place, so the :class:`CommandIndex` built from the set can
+    tell it's out of date by comparing two integers.
+    """
+
+    def __init__(self, items=()) -> None:
+        super().__init__(items)
+        self.version = 0
+
+    def add(self, item: str) -> None:
+        super().add(item)
+        self.version += 1
+
+    def remove(self, item: str) -> None:
+        super().remove(item)
+        self.version += 1
+
+    def discard(self, item: str) -> None:
+        super().discard(item)
+        self.version += 1
+
+    def pop(self) -> str:
+        item = super().pop()
+        self.version += 1
+        return item
+
+    def clear(self) -> None:
+        super().clear()
+        self.version += 1
+
+    def update(self, *others) -> None:
+        super().update(*others)
+        self.version += 1
+
+    def difference_update(self, *others) -> None:
+        super().difference_update(*others)
+        self.version += 1
+
+    def intersection_update(self, *others) -> None:
+        super().intersection_update(*others)
+        self.version += 1
+
+    def symmetric_difference_update(self, other) -> None:
+        super().symmetric_difference_update(other)
+        self.version += 1
+
+    def __ior__(self, other):
+        result = super().__ior__(other)
+        self.version += 1
+        return result
+
+    def __iand__(self, other):
+        result = super().__iand__(other)
+        self.version += 1
+        return result
+
+    def __isub__(self, other):
+        result = super().__isub__(other)
+        self.version += 1
+        return result
+
+    def __ixor__(self, other):
+        result = super().__ixor__(other)
+        self.version += 1
+        return result
+
+
+class CommandIndex:
+    """Lookup table used by :meth:`~pyrogram.filters.command` to match commands.
+
+    Every accepted first token (``cmd``, ``cmd@username`` and ``cmd<username>``) is stored in a dict, so
+    a message is matched with a single lookup of its first word instead of one regex per command.
+    Commands containing regex metacharacters keep the previous regex based behaviour.
+    The index is rebuilt whenever the bot username or the filter configuration changes: the commands and prefixes
+    are kept in :class:`CommandSet` objects, so that both reassigning them and changing them in place is noticed
+    without comparing their contents.
+    """
+
+    def __init__(
+        self,
+        commands: CommandSet,
+        prefixes: CommandSet,
+        case_sensitive: bool,
+        username: str | None,
+    ) -> None:
+        self.commands = commands
+        self.prefixes = prefixes
+        self.versions = (commands.version, prefixes.version)
+        self.case_sensitive = case_sensitive
+        self.username = username
+
+        self.prefix_lengths = sorted({len(p) for p in prefixes}, reverse=True)
+        self.tokens = {}
+        self.patterns = []
+
+        if username is None:
+            return
+
+        flags = 0 if case_sensitive else re.IGNORECASE
+
+        for cmd in commands:
+            if COMMAND_REGEX_CHARS.isdisjoint(cmd):
+                for token in (cmd, f"{cmd}@{username}", f"{cmd}{username}"):
+                    self.tokens.setdefault(self.normalize(token), cmd)
+            else:
+                self.patterns.append(
+                    (
+                        cmd,
+                        re.compile(rf"^(?:{cmd}(?:@?{username})?)(?:\s|$)", flags),
+                        re.compile(rf"{cmd}(?:@?{username})?\s?", flags),
+                    ),
+                )
+
+    def is_valid(self, flt, username: str) -> bool:
+        return (
+            self.username == username
+            and self.case_sensitive == flt.case_sensitive
+            and self.commands is flt.commands
+            and self.prefixes is flt.prefixes
+            and self.versions == (flt.commands.version, flt.prefixes.version)
+        )
+
+    def normalize(self, token: str) -> str:
+        return token if self.case_sensitive else token.lower()
+
+    def match(self, text: str) -> tuple[str, str] | None:
+        for length in self.prefix_lengths:
+            if text[:length] not in self.prefixes:
+                continue
+
+            without_prefix = text[length:]
+            token = COMMAND_TOKEN_RE.match(without_prefix).group()
+            cmd = self.tokens.get(self.normalize(token))
+
+            if cmd is not None:
+                return cmd, without_prefix[len(token) :]
+
+            for cmd, match_re, sub_re in self.patterns:
+                if match_re.match(without_prefix):
+                    return cmd, sub_re.sub("", without_prefix, count=1)
+
+        return None
+
+
 def command(
     commands: str | list[str],
     prefixes: str | list[str] = "/",
@@ -711,7 +875,6 @@ def command(
             Pass True if you want your command(s) to be case sensitive. Defaults to False.
             Examples: when True, command="Start" would trigger /Start but not /start.
     """
-    command_re = re.compile(r"([\"'])(.*?)(?<!\\)\1|(\S+)")
 
     async def func(flt, client: pyrogram.Client, message: Message) -> bool:
         username = client.me.username or ""
@@ -721,47 +884,43 @@ def command(
         if not text:
             return False
 
-        for prefix in flt.prefixes:
-            if not text.startswith(prefix):
-                continue
+        index = flt.index
 
-            without_prefix = text[len(prefix) :]
+        if not index.is_valid(flt, username):
+            # Sets assigned to the filter are wrapped, for the changes made to them later to be noticed as well
+            if not isinstance(flt.commands, CommandSet):
+                flt.commands = CommandSet(flt.commands)
 
-            for cmd in flt.commands:
-                if not re.match(
-                    rf"^(?:{cmd}(?:@?{username})?)(?:\s|$)",
-                    without_prefix,
-                    flags=re.IGNORECASE if not flt.case_sensitive else 0,
-                ):
-                    continue
+            if not isinstance(flt.prefixes, CommandSet):
+                flt.prefixes = CommandSet(flt.prefixes)
 
-                without_command = re.sub(
-                    rf"{cmd}(?:@?{username})?\s?",
-                    "",
-                    without_prefix,
-                    count=1,
-                    flags=re.IGNORECASE if not flt.case_sensitive else 0,
-                )
+            index = flt.index = CommandIndex(
+                flt.commands,
+                flt.prefixes,
+                flt.case_sensitive,
+                username,
+            )
+
+        result = index.match(text)
+
+        if result is None:
+            return False
 
-                message.command = [cmd] + [
-                    re.sub(
-                        r"\\([\"'])",
-                        r"\1",
-                        m.group(2) or m.group(3) or "",
-                    )
-                    for m in command_re.finditer(without_command)
-                ]
+        cmd, without_command = result
 
-                return True
+        message.command = [cmd] + [
+            COMMAND_ESCAPE_RE.sub(r"\1", m.group(2) or m.group(3) or "")
+            for m in COMMAND_ARGS_RE.finditer(without_command)
+        ]
 
-        return False
+        return True
 
     commands = commands if isinstance(commands, list) else [commands]
-    commands = {c if case_sensitive else c.lower() for c in commands}
+    commands = CommandSet(c if case_sensitive else c.lower() for c in commands)
 
     prefixes = [] if prefixes is None else prefixes
     prefixes = prefixes if isinstance(prefixes, list) else [prefixes]
-    prefixes = set(prefixes) if prefixes else {""}
+    prefixes = CommandSet(prefixes or [""])
 
     return create(
         func,
@@ -769,9 +928,87 @@ def command(
         commands=commands,
         prefixes=prefixes,
         case_sensitive=case_sensitive,
+        index=CommandIndex(commands, prefixes, case_sensitive, None),
     )
 
 
+class RegexPrefilter:
+    """Cheap pre-screening and per-update memoization for :meth:`~pyrogram.filters.regex`.
+
+    The longest literal every match of the pattern must contain is extracted once, so text that
+    doesn't contain it is rejected with a substring check instead of a regex scan. Case-insensitive
+    patterns aren't pre-screened, their matching can't be reproduced by changing the case of the text.
+    Results are kept in :attr:`dispatch_cache` for the update being dispatched and keyed by pattern,
+    hence several handlers testing the same pattern against the same update only run it once.
+    """
+
+    # Set to a new dict by the dispatcher for each update and reset once it's dispatched
+    dispatch_cache: ContextVar[dict | None] = ContextVar(
+        "regex_dispatch_cache",
+        default=None,
+    )
+
+    def __init__(self, pattern: Pattern) -> None:
+        self.pattern = pattern
+        self.literal = self.required_literal(pattern)
+
+    @staticmethod
+    def required_literal(pattern: Pattern) -> str | None:
+        if not isinstance(pattern.pattern, str) or pattern.flags & re.LOCALE:
+            return None
+
+        try:
+            parsed = sre_parse.parse(pattern.pattern, pattern.flags)
+        except Exception:
+            return None
+
+        literals = []
+
+        def walk(items) -> None:
+            run = []
+
+            for op, av in items:
+                if op is sre_constants.LITERAL:
+                    run.append(chr(av))
+                    continue
+
+                literals.append("".join(run))
+                run = []
+
+                # Groups are always required, unless they change the case sensitivity
+                if op is sre_constants.SUBPATTERN and not (av[1] | av[2]) & (
+                    re.IGNORECASE | re.LOCALE
+                ):
+                    walk(av[3])
+
+            literals.append("".join(run))
+
+        walk(parsed)
+
+        # e.g. (?i)in matches "İn", whose casefolded or lowercased text doesn't contain "in"
+        if parsed.state.flags & re.IGNORECASE:
+            return None
+
+        return max(literals, key=len) or None
+
+    def finditer(self, value: str) -> list[typing.Match] | None:
+        cache = self.dispatch_cache.get()
+        cached = cache.get(self.pattern) if cache is not None else None
+
+        if cached is not None and cached[0] is value:
+            return cached[1]
+
+        if self.literal is not None and self.literal not in value:
+            matches = None
+        else:
+            matches = list(self.pattern.finditer(value)) or None
+
+        if cache is not None:
+            cache[self.pattern] = (value, matches)
+
+        return matches
+
+
 def regex(pattern: str | Pattern, flags: int = 0):
     """Filter updates that match a given regular expression pattern.
 
@@ -806,22 +1043,165 @@ def regex(pattern: str | Pattern, flags: int = 0):
             raise ValueError(f"Regex filter doesn't work with {type(update)}")
 
         if value:
-            update.matches = list(flt.p.finditer(value)) or None
+            update.matches = flt.prefilter.finditer(value)
 
         return bool(update.matches)
 
+    pattern = pattern if isinstance(pattern, Pattern) else re.compile(pattern, flags)
+
     return create(
         func,
         "RegexFilter",
-        p=pattern if isinstance(pattern, Pattern) else re.compile(pattern, flags),
+        p=pattern,
+        prefilter=RegexPrefilter(pattern),
     )
 
 
-class user(Filter, set):
+class PeerSet(set):
+    """A set of peer ids and usernames used by :obj:`~pyrogram.filters.user` and :obj:`~pyrogram.filters.chat`.
+
+    Usernames are normalised (lowercase, without "@") when they are stored or looked up, so checking an update costs
+    at most two set lookups. Bulk changes are applied with single set operations, which makes them safe to call from
+    other threads or coroutines while updates are being dispatched. Large id lists can also be memory-mapped from a
+    file of sorted 64-bit signed integers (native byte order) with :meth:`load`.
+    """
+
+    def __init__(self, peers: int | str | list[int | str] | None = None) -> None:
+        peers = (
+            [] if peers is None else peers if isinstance(peers, list) else [peers]
+        )
+
+        super().__init__(self.normalize(p) for p in peers)
+
+        self.mapped_ids = None
+
+    @staticmethod
+    def normalize(peer: int | str) -> int | str:
+        if peer in {"me", "self"}:
+            return "me"
+
+        return peer.lower().strip("@") if isinstance(peer, str) else peer
+
+    def add(self, peer: int | str) -> None:
+        super().add(self.normalize(peer))
+
+    def remove(self, peer: int | str) -> None:
+        super().remove(self.normalize(peer))
+
+    def discard(self, peer: int | str) -> None:
+        super().discard(self.normalize(peer))
+
+    def update(self, *peers) -> None:
+        super().update([self.normalize(p) for i in peers for p in i])
+
+    def difference_update(self, *peers) -> None:
+        super().difference_update([self.normalize(p) for i in peers for p in i])
+
+    def intersection_update(self, *peers) -> None:
+        super().intersection_update(*[{self.normalize(p) for p in i} for i in peers])
+
+    def symmetric_difference_update(self, peers) -> None:
+        super().symmetric_difference_update({self.normalize(p) for p in peers})
+
+    def __contains__(self, peer) -> bool:
+        return super().__contains__(self.normalize(peer))
+
+    def __ior__(self, peers):
+        if not isinstance(peers, (set, frozenset)):
+            return NotImplemented
+
+        self.update(peers)
+        return self
+
+    def __isub__(self, peers):
+        if not isinstance(peers, (set, frozenset)):
+            return NotImplemented
+
+        self.difference_update(peers)
+        return self
+
+    def __iand__(self, peers):
+        if not isinstance(peers, (set, frozenset)):
+            return NotImplemented
+
+        self.intersection_update(peers)
+        return self
+
+    def __ixor__(self, peers):
+        if not isinstance(peers, (set, frozenset)):
+            return NotImplemented
+
+        self.symmetric_difference_update(peers)
+        return self
+
+    def replace(self, peers: list[int | str]) -> None:
+        """Replace all the stored ids and usernames with new ones.
+
+        Entries that are both in the old and in the new contents are never missing while the replacement is in
+        progress.
+
+        Parameters:
+            peers (``list``):
+                The new ids and usernames.
+        """
+        peers = {self.normalize(p) for p in peers}
+
+        super().intersection_update(peers)
+        super().update(peers)
+
+    def load(self, path: str | Path | None) -> None:
+        """Memory-map a file of sorted peer ids, checked in addition to the ones stored in this set.
+
+        Parameters:
+            path (``str`` | ``Path``):
+                Path of a file containing sorted 64-bit signed integers in native byte order.
+                Pass None to drop the currently mapped ids.
+        """
+        if path is None:
+            self.mapped_ids = None
+            return
+
+        with Path(path).open("rb") as f:
+            size = Path(path).stat().st_size
+
+            if not size:
+                self.mapped_ids = None
+                return
+
+            mapped = mmap.mmap(f.fileno(), size, access=mmap.ACCESS_READ)
+
+        self.mapped_ids = memoryview(mapped).cast("q")
+
+    def has_id(self, peer_id: int | None) -> bool:
+        # Ids need no normalisation, the set is looked up directly
+        if super().__contains__(peer_id):
+            return True
+
+        mapped_ids = self.mapped_ids
+
+        if mapped_ids is None or peer_id is None:
+            return False
+
+        i = bisect.bisect_left(mapped_ids, peer_id)
+
+        return i < len(mapped_ids) and mapped_ids[i] == peer_id
+
+    def has_peer(self, peer) -> bool:
+        return bool(
+            peer
+            and (
+                self.has_id(peer.id)
+                or (peer.username and super().__contains__(peer.username.lower()))
+            ),
+        )
+
+
+class user(Filter, PeerSet):
     """Filter messages coming from one or more users.
 
     You can use `set bound methods <https://docs.python.org/3/library/stdtypes.html#set>`_ to manipulate the
-    users container.
+    users container. Use :meth:`~pyrogram.filters.PeerSet.replace` to swap the whole list at runtime and
+    :meth:`~pyrogram.filters.PeerSet.load` to map a file of sorted user ids.
 
     Parameters:
         users (``int`` | ``str`` | ``list``):
@@ -831,35 +1211,21 @@ class user(Filter, set):
     """
 
     def __init__(self, users: int | str | list[int | str] | None = None) -> None:
-        users = (
-            [] if users is None else users if isinstance(users, list) else [users]
-        )
-
-        super().__init__(
-            "me"
-            if u in ["me", "self"]
-            else u.lower().strip("@")
-            if isinstance(u, str)
-            else u
-            for u in users
-        )
+        super().__init__(users)
 
     async def __call__(self, _, message: Message):
         return message.from_user and (
-            message.from_user.id in self
-            or (
-                message.from_user.username
-                and message.from_user.username.lower() in self
-            )
+            self.has_peer(message.from_user)
             or ("me" in self and message.from_user.is_self)
         )
 
 
-class chat(Filter, set):
+class chat(Filter, PeerSet):
     """Filter messages coming from one or more chats.
 
     You can use `set bound methods <https://docs.python.org/3/library/stdtypes.html#set>`_ to manipulate the
-    chats container.
+    chats container. Use :meth:`~pyrogram.filters.PeerSet.replace` to swap the whole list at runtime and
+    :meth:`~pyrogram.filters.PeerSet.load` to map a file of sorted chat ids.
 
     Parameters:
         chats (``int`` | ``str`` | ``list``):
@@ -869,43 +1235,15 @@ class chat(Filter, set):
     """
 
     def __init__(self, chats: int | str | list[int | str] | None = None) -> None:
-        chats = (
-            [] if chats is None else chats if isinstance(chats, list) else [chats]
-        )
-
-        super().__init__(
-            "me"
-            if c in ["me", "self"]
-            else c.lower().strip("@")
-            if isinstance(c, str)
-            else c
-            for c in chats
-        )
+        super().__init__(chats)
 
     async def __call__(self, _, message: Message | Story):
         if isinstance(message, Story):
-            return (
-                message.sender_chat
-                and (
-                    message.sender_chat.id in self
-                    or (
-                        message.sender_chat.username
-                        and message.sender_chat.username.lower() in self
-                    )
-                )
-            ) or (
-                message.from_user
-                and (
-                    message.from_user.id in self
-                    or (
-                        message.from_user.username
-                        and message.from_user.username.lower() in self
-                    )
-                )
+            return self.has_peer(message.sender_chat) or self.has_peer(
+                message.from_user,
             )
         return message.chat and (
-            message.chat.id in self
-            or (message.chat.username and message.chat.username.lower() in self)
+            self.has_peer(message.chat)
             or (
                 "me" in self
                 and message.from_user
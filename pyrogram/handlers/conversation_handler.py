@@ -1,22 +1,274 @@
 from __future__ import annotations
 
+import asyncio
 import inspect
+import itertools
+import math
+from collections.abc import Sequence
 from typing import TYPE_CHECKING
 
+from pyrogram.enums import ListenerTypes
 from pyrogram.types import CallbackQuery, Message
 
 from .callback_query_handler import CallbackQueryHandler
 from .message_handler import MessageHandler
 
 if TYPE_CHECKING:
+    from collections.abc import Callable
+
     import pyrogram
+    from pyrogram.filters import Filter
+
+
+class Listener:
+    """A pending :meth:`~pyrogram.Client.listen` call."""
+
+    def __init__(
+        self,
+        listener_type: ListenerTypes,
+        future: asyncio.Future,
+        filters: Filter | None,
+        chat_id: int | None,
+        user_ids: list[int] | None,
+        message_id: int | None,
+        message_thread_id: int | None,
+        unallowed_click_alert: str | bool,
+        deadline: float | None,
+    ) -> None:
+        self.listener_type = listener_type
+        self.future = future
+        self.filters = filters
+        self.chat_id = chat_id
+        self.user_ids = user_ids
+        self.message_id = message_id
+        self.message_thread_id = message_thread_id
+        self.unallowed_click_alert = unallowed_click_alert
+        self.deadline = deadline
+        self.keys = []
+        self.seq = 0
+
+
+class TimerWheel:
+    """Hashed timer wheel expiring listeners with a single loop callback.
+
+    Listeners are bucketed by the tick their deadline falls in, so adding and removing one is O(1) and a tick only
+    looks at the listeners of its own slot. Ticks are aligned to multiples of the resolution, so that a listener
+    expires less than one tick after its deadline. Listeners whose deadline is more than a full rotation away are
+    simply kept in their slot until the wheel comes back to it.
+    """
+
+    def __init__(
+        self,
+        on_expire: Callable[[Listener], None],
+        resolution: float = 0.1,
+        size: int = 256,
+    ) -> None:
+        self.on_expire = on_expire
+        self.resolution = resolution
+        self.slots = [set() for _ in range(size)]
+        self.count = 0
+        self.last_tick = None
+        self.handle = None
+
+    def get_tick(self, deadline: float) -> int:
+        # The first tick at or after the deadline
+        return math.floor(deadline / self.resolution) + 1
+
+    def slot(self, deadline: float) -> set:
+        return self.slots[self.get_tick(deadline) % len(self.slots)]
+
+    def schedule(self, loop: asyncio.AbstractEventLoop) -> None:
+        self.handle = loop.call_at((self.last_tick + 1) * self.resolution, self.tick)
+
+    def add(self, listener: Listener) -> None:
+        self.slot(listener.deadline).add(listener)
+        self.count += 1
+
+        if self.handle is None:
+            loop = asyncio.get_running_loop()
+            self.last_tick = math.floor(loop.time() / self.resolution)
+            self.schedule(loop)
+
+    def remove(self, listener: Listener) -> None:
+        slot = self.slot(listener.deadline)
+
+        if listener in slot:
+            slot.remove(listener)
+            self.count -= 1
+
+        if not self.count and self.handle is not None:
+            self.handle.cancel()
+            self.handle = None
+
+    def tick(self) -> None:
+        loop = asyncio.get_event_loop()
+        # The loop may run a callback slightly before its time, the tick it was scheduled for is due anyway
+        current = max(math.floor(loop.time() / self.resolution), self.last_tick + 1)
+
+        # Catch up with the ticks that were skipped while the loop was busy
+        for t in range(self.last_tick + 1, current + 1)[-len(self.slots) :]:
+            slot = self.slots[t % len(self.slots)]
+            expired = [i for i in slot if self.get_tick(i.deadline) <= t]
+
+            for listener in expired:
+                slot.remove(listener)
+                self.count -= 1
+                self.on_expire(listener)
+
+        self.last_tick = current
+
+        if self.count:
+            self.schedule(loop)
+        else:
+            self.handle = None
+
+
+class ListenerList(Sequence):
+    """Live list of the pending listeners of a type, as found in ``Client.listeners``.
+
+    Listeners are kept in the indexes of the :class:`ConversationHandler`, appending or removing one here adds it to
+    or removes it from them.
+    """
+
+    def __init__(
+        self,
+        handler: ConversationHandler,
+        listener_type: ListenerTypes,
+    ) -> None:
+        self.handler = handler
+        self.listener_type = listener_type
+
+    def __getitem__(self, index):
+        return self.handler.get_listeners(self.listener_type)[index]
+
+    def __len__(self) -> int:
+        return len(self.handler.get_listeners(self.listener_type))
+
+    def __iter__(self):
+        return iter(self.handler.get_listeners(self.listener_type))
+
+    def __repr__(self) -> str:
+        return repr(self.handler.get_listeners(self.listener_type))
+
+    def append(self, listener: Listener) -> None:
+        self.handler.add_listener(listener)
+
+    def remove(self, listener: Listener) -> None:
+        if listener not in self:
+            raise ValueError(f"{listener!r} is not pending")
+
+        self.handler.remove_listener(listener)
 
 
 class ConversationHandler(MessageHandler, CallbackQueryHandler):
-    """The Conversation handler class."""
+    """The Conversation handler class.
+
+    Keeps the pending :meth:`~pyrogram.Client.listen` calls indexed by (chat, user, thread) for every
+    :obj:`~pyrogram.enums.ListenerTypes`, so the dispatcher can hand an update to its waiter with a constant number of
+    dict lookups before running the normal handlers. Timed out and cancelled listeners are removed right away.
+    """
 
     def __init__(self) -> None:
-        self.waiters = {}
+        self.indexes = {listener_type: {} for listener_type in ListenerTypes}
+        self.listeners = {
+            listener_type: ListenerList(self, listener_type)
+            for listener_type in ListenerTypes
+        }
+        self.click_listeners = {}
+        self.timers = TimerWheel(self.expire)
+        self.counter = itertools.count()
+
+    def get_listeners(self, listener_type: ListenerTypes) -> list[Listener]:
+        indexes = [self.indexes[listener_type]]
+
+        if listener_type == ListenerTypes.CALLBACK_QUERY:
+            indexes.append(self.click_listeners)
+
+        return list(
+            {
+                id(listener): listener
+                for index in indexes
+                for listeners in index.values()
+                for listener in listeners
+            }.values(),
+        )
+
+    def count(self, listener_type: ListenerTypes | None = None) -> int:
+        return sum(
+            len(self.get_listeners(i))
+            for i in ([listener_type] if listener_type else ListenerTypes)
+        )
+
+    def add_listener(self, listener: Listener) -> None:
+        listener.seq = next(self.counter)
+
+        if (
+            listener.listener_type == ListenerTypes.CALLBACK_QUERY
+            and listener.message_id is not None
+        ):
+            index = self.click_listeners
+            keys = [(listener.chat_id, listener.message_id)]
+        else:
+            index = self.indexes[listener.listener_type]
+            keys = [
+                (listener.chat_id, user_id, listener.message_thread_id)
+                for user_id in (listener.user_ids or [None])
+            ]
+
+        for key in keys:
+            index.setdefault(key, []).append(listener)
+            listener.keys.append((index, key))
+
+        if listener.deadline is not None:
+            self.timers.add(listener)
+
+        listener.future.add_done_callback(lambda _: self.remove_listener(listener))
+
+    def remove_listener(self, listener: Listener) -> None:
+        for index, key in listener.keys:
+            listeners = index.get(key)
+
+            if listeners and listener in listeners:
+                listeners.remove(listener)
+
+                if not listeners:
+                    del index[key]
+
+        listener.keys.clear()
+
+        if listener.deadline is not None:
+            self.timers.remove(listener)
+
+    def expire(self, listener: Listener) -> None:
+        if not listener.future.done():
+            listener.future.set_exception(asyncio.TimeoutError())
+
+    def candidates(self, update: Message | CallbackQuery) -> list[Listener]:
+        if isinstance(update, Message):
+            index = self.indexes[ListenerTypes.MESSAGE]
+            chat_id = update.chat.id if update.chat else None
+            user_id = update.from_user.id if update.from_user else None
+            thread_id = update.message_thread_id
+        else:
+            index = self.indexes[ListenerTypes.CALLBACK_QUERY]
+            chat_id = update.message.chat.id if update.message else None
+            user_id = update.from_user.id if update.from_user else None
+            thread_id = update.message.message_thread_id if update.message else None
+
+        if not index:
+            return []
+
+        found = {}
+
+        for key in itertools.product(
+            {chat_id, None},
+            {user_id, None},
+            {thread_id, None},
+        ):
+            for listener in index.get(key, ()):
+                found[id(listener)] = listener
+
+        return sorted(found.values(), key=lambda i: i.seq)
 
     async def check(
         self,
@@ -26,44 +278,61 @@ class ConversationHandler(MessageHandler, CallbackQueryHandler):
         if isinstance(update, Message) and update.outgoing:
             return False
 
-        try:
-            chat_id = (
-                update.chat.id
-                if isinstance(update, Message)
-                else update.message.chat.id
+        candidates = []
+
+        if isinstance(update, CallbackQuery) and update.message:
+            candidates.extend(
+                self.click_listeners.get(
+                    (update.message.chat.id, update.message.id),
+                    (),
+                ),
             )
-        except AttributeError:
-            return False
 
-        waiter = self.waiters.get(chat_id)
-        if (
-            not waiter
-            or not isinstance(update, waiter["update_type"])
-            or waiter["future"].done()
-        ):
-            return False
+        candidates.extend(self.candidates(update))
 
-        filters = waiter.get("filters")
-        if callable(filters):
-            if inspect.iscoroutinefunction(filters.__call__):
-                filtered = await filters(client, update)
-            else:
-                filtered = await client.loop.run_in_executor(
-                    client.executor,
-                    filters,
-                    client,
+        for listener in candidates:
+            if listener.future.done():
+                continue
+
+            if (
+                listener.user_ids
+                and update.from_user
+                and update.from_user.id not in listener.user_ids
+            ):
+                if listener.unallowed_click_alert and isinstance(
                     update,
-                )
-            if not filtered or waiter["future"].done():
-                return False
+                    CallbackQuery,
+                ):
+                    await update.answer(
+                        listener.unallowed_click_alert
+                        if isinstance(listener.unallowed_click_alert, str)
+                        else "You're not expected to click this button.",
+                        show_alert=True,
+                    )
+
+                    return True
 
-        waiter["future"].set_result(update)
-        return True
+                continue
+
+            filters = listener.filters
+            if callable(filters):
+                if inspect.iscoroutinefunction(filters.__call__):
+                    filtered = await filters(client, update)
+                else:
+                    filtered = await client.loop.run_in_executor(
+                        client.filter_executor,
+                        filters,
+                        client,
+                        update,
+                    )
+                if not filtered or listener.future.done():
+                    continue
+
+            listener.future.set_result(update)
+            return True
+
+        return False
 
     @staticmethod
     async def callback(_, __) -> None:
         pass
-
-    def delete_waiter(self, chat_id, future) -> None:
-        if future == self.waiters[chat_id]["future"]:
-            del self.waiters[chat_id]
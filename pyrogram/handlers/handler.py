@@ -21,7 +21,7 @@ class Handler:
             if inspect.iscoroutinefunction(self.filters.__call__):
                 return await self.filters(client, update)
             return await client.loop.run_in_executor(
-                client.executor,
+                client.filter_executor,
                 self.filters,
                 client,
                 update,
@@ -57,17 +57,19 @@ class Invoke:
         if not self.is_connected:
             raise ConnectionError("Client has not been started yet")
 
+        wrapped = query
+
         if self.no_updates:
-            query = raw.functions.InvokeWithoutUpdates(query=query)
+            wrapped = raw.functions.InvokeWithoutUpdates(query=wrapped)
 
         if self.takeout_id:
-            query = raw.functions.InvokeWithTakeout(
+            wrapped = raw.functions.InvokeWithTakeout(
                 takeout_id=self.takeout_id,
-                query=query,
+                query=wrapped,
             )
 
         r = await self.session.invoke(
-            query,
+            wrapped,
             retries,
             timeout,
             (
@@ -80,4 +82,7 @@ class Invoke:
         await self.fetch_peers(getattr(r, "users", []))
         await self.fetch_peers(getattr(r, "chats", []))
 
+        if not self.no_updates:
+            self.sequencer.confirm(query, r)
+
         return r
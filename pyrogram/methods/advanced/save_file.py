@@ -4,21 +4,243 @@ import asyncio
 import functools
 import inspect
 import io
+import itertools
 import logging
 import math
+import os
+import threading
+import time
+from collections import deque
 from hashlib import md5
 from pathlib import Path, PurePath
 from typing import TYPE_CHECKING, BinaryIO
 
 import pyrogram
-from pyrogram import StopTransmissionError, raw
-from pyrogram.session import Session
+from pyrogram import StopTransmissionError, raw, utils
+from pyrogram.session import SessionPool
 
 if TYPE_CHECKING:
-    from collections.abc import Callable
+    from collections.abc import Callable, Iterable
 
 log = logging.getLogger(__name__)
 
+MIN_PART_SIZE = 32 * 1024
+MAX_PART_SIZE = 512 * 1024
+PARTS_PER_SESSION = 4
+# Resumable uploads save the parts uploaded so far at least every this many parts
+RESUME_SAVE_PARTS = 32
+
+
+class PartReader:
+    """Reads the parts of a file in an executor, a few parts ahead of the upload.
+
+    Files with a descriptor are read with :func:`os.pread`, so several parts can be read at once, other file-like
+    objects are read one part at a time. The md5 checksum, if any, is computed in the executor as well.
+    Only the given *parts* are read, if any, instead of the whole file from *offset*.
+    """
+
+    def __init__(
+        self,
+        fp: BinaryIO,
+        part_size: int,
+        offset: int = 0,
+        read_ahead: int = 4,
+        executor=None,
+        md5_sum=None,
+        parts: Iterable[int] | None = None,
+    ) -> None:
+        self.fp = fp
+        self.part_size = part_size
+        self.offset = offset
+        self.read_ahead = read_ahead
+        self.executor = executor
+        self.md5_sum = md5_sum
+        self.parts = iter(parts) if parts is not None else None
+        self.lock = threading.Lock()
+        self.loop = asyncio.get_event_loop()
+        self.pending = deque()
+        self.hashing = None
+
+        try:
+            self.fd = fp.fileno() if hasattr(os, "pread") else None
+        except (AttributeError, OSError, io.UnsupportedOperation):
+            self.fd = None
+
+    def read_part(self, offset: int) -> bytes:
+        if self.fd is not None:
+            return os.pread(self.fd, self.part_size, offset)
+
+        with self.lock:
+            self.fp.seek(offset)
+            return self.fp.read(self.part_size)
+
+    def schedule(self) -> None:
+        while len(self.pending) < self.read_ahead:
+            if self.parts is not None:
+                part = next(self.parts, None)
+
+                if part is None:
+                    break
+
+                self.offset = part * self.part_size
+
+            self.pending.append(
+                self.loop.run_in_executor(
+                    self.executor,
+                    self.read_part,
+                    self.offset,
+                ),
+            )
+            self.offset += self.part_size
+
+    async def update_hash(self, previous: asyncio.Task | None, chunk: bytes) -> None:
+        if previous:
+            await previous
+
+        await self.loop.run_in_executor(self.executor, self.md5_sum.update, chunk)
+
+    async def read(self) -> bytes:
+        self.schedule()
+
+        if not self.pending:
+            return b""
+
+        chunk = await self.pending.popleft()
+
+        if chunk and self.md5_sum is not None:
+            self.hashing = self.loop.create_task(
+                self.update_hash(self.hashing, chunk),
+            )
+
+        return chunk
+
+    async def hexdigest(self) -> str:
+        if self.hashing:
+            await self.hashing
+
+        return self.md5_sum.hexdigest()
+
+    async def close(self) -> None:
+        # Let the reads already submitted finish before the file is closed
+        await asyncio.gather(*self.pending, return_exceptions=True)
+        self.pending.clear()
+
+        if self.hashing:
+            await asyncio.gather(self.hashing, return_exceptions=True)
+
+
+class UploadScheduler:
+    """Adapts the number of parts of an upload kept in flight to the measured throughput.
+
+    Each time a window of parts is done, the window grows by one part if the throughput improved. It shrinks when the
+    throughput drops or when parts take more than twice the best round trip time seen, as they are only queuing up
+    somewhere along the way.
+    """
+
+    INITIAL_PARTS = 4
+
+    def __init__(self, max_parts: int) -> None:
+        self.max_parts = max(max_parts, 1)
+        self.window = min(self.INITIAL_PARTS, self.max_parts)
+        self.max_window = self.window
+        self.in_flight = 0
+        self.wakeup = asyncio.Event()
+
+        self.started = time.monotonic()
+        self.rtt = None
+        self.min_rtt = None
+        self.throughput = None
+        self.sample_started = self.started
+        self.sample_parts = 0
+        self.sample_bytes = 0
+
+        self.parts = 0
+        self.bytes = 0
+        self.retries = 0
+
+    async def acquire(self) -> None:
+        while self.in_flight >= self.window:
+            self.wakeup.clear()
+            await self.wakeup.wait()
+
+        self.in_flight += 1
+
+    def release(self, size: int = 0, rtt: float | None = None) -> None:
+        self.in_flight -= 1
+
+        if rtt is not None:
+            self.update(size, rtt)
+
+        self.wakeup.set()
+
+    def update(self, size: int, rtt: float) -> None:
+        self.parts += 1
+        self.bytes += size
+        self.rtt = rtt if self.rtt is None else 0.8 * self.rtt + 0.2 * rtt
+        self.min_rtt = rtt if self.min_rtt is None else min(self.min_rtt, rtt)
+        self.sample_parts += 1
+        self.sample_bytes += size
+
+        if self.sample_parts < self.window:
+            return
+
+        now = time.monotonic()
+        throughput = self.sample_bytes / max(now - self.sample_started, 1e-6)
+
+        if self.throughput is None or throughput > self.throughput * 1.05:
+            self.window = min(self.window + 1, self.max_parts)
+        elif throughput < self.throughput * 0.8 or self.rtt > 2 * self.min_rtt:
+            self.window = max(self.window - max(self.window // 4, 1), 1)
+
+        self.max_window = max(self.max_window, self.window)
+        self.throughput = throughput
+        self.sample_started = now
+        self.sample_parts = 0
+        self.sample_bytes = 0
+
+    def get_stats(self) -> dict:
+        elapsed = time.monotonic() - self.started
+
+        return {
+            "parts": self.parts,
+            "bytes": self.bytes,
+            "elapsed": elapsed,
+            "throughput": self.bytes / elapsed if elapsed else 0.0,
+            "rtt": self.rtt,
+            "min_rtt": self.min_rtt,
+            "window": self.window,
+            "max_window": self.max_window,
+            "retries": self.retries,
+        }
+
+
+def get_part_size(file_size: int, is_big: bool) -> int:
+    """Split small files in a few parts so they can be uploaded in parallel too.
+
+    The size only depends on the file size, parts re-uploaded later with *file_part* must have the same size.
+    """
+    part_size = MAX_PART_SIZE
+
+    if not is_big:
+        while (
+            part_size > MIN_PART_SIZE
+            and math.ceil(file_size / part_size) < UploadScheduler.INITIAL_PARTS
+        ):
+            part_size //= 2
+
+    return part_size
+
+
+def get_resume_key(fp: BinaryIO, file_size: int) -> str:
+    """Identify a file across restarts: by inode and modification time on disk, by content otherwise."""
+    try:
+        stat = os.fstat(fp.fileno())
+    except (AttributeError, OSError, io.UnsupportedOperation):
+        digest, _ = utils.hash_file(fp)
+        return f"{digest}:{file_size}"
+
+    return f"{stat.st_dev}:{stat.st_ino}:{file_size}:{stat.st_mtime_ns}"
+
 
 class SaveFile:
     async def save_file(
@@ -28,6 +250,7 @@ class SaveFile:
         file_part: int = 0,
         progress: Callable | None = None,
         progress_args: tuple = (),
+        resume: bool = False,
     ):
         """Upload a file onto Telegram servers, without actually sending the message to anyone.
         Useful whenever an InputFile type is required.
@@ -60,6 +283,12 @@ class SaveFile:
                 You can pass anything you need to be available in the progress callback scope; for example, a Message
                 object or a Client instance in order to edit the message with the updated progress status.
 
+            resume (``bool``, *optional*):
+                Pass True to keep track of the parts uploaded in the client storage, so that uploading the same file
+                again, even after a restart, only uploads the parts still missing.
+                Only files bigger than 10 MiB are uploaded in parts that can be resumed.
+                Defaults to False.
+
         Other Parameters:
             current (``int``):
                 The amount of bytes transmitted so far.
@@ -81,20 +310,6 @@ class SaveFile:
         if path is None:
             return None
 
-        async def worker(session) -> None:
-            while True:
-                data = await queue.get()
-
-                if data is None:
-                    return
-                for attempt in range(3):
-                    try:
-                        await session.invoke(data)
-                        break
-                    except Exception as e:
-                        log.warning("Retrying part due to error: %s", e)
-                        await asyncio.sleep(2**attempt)
-
         def create_rpc(chunk, file_part, is_big, file_id, file_total_parts):
             if is_big:
                 return raw.functions.upload.SaveBigFilePart(
@@ -109,9 +324,6 @@ class SaveFile:
                 bytes=chunk,
             )
 
-        part_size = 512 * 1024
-        queue = asyncio.Queue(32)
-
         with (
             Path(path).open("rb", buffering=4096)  # noqa: ASYNC230
             if isinstance(path, str | PurePath)
@@ -132,71 +344,171 @@ class SaveFile:
                     f"Can't upload files bigger than {file_size_limit_mib} MiB",
                 )
 
-            file_total_parts = math.ceil(file_size / part_size)
             is_big = file_size > 10 * 1024 * 1024
-            pool_size = 2 if is_big else 1
-            workers_count = 4 if is_big else 1
+            part_size = get_part_size(file_size, is_big)
+            file_total_parts = math.ceil(file_size / part_size)
             is_missing_part = file_id is not None
             file_id = file_id or self.rnd_id()
             md5_sum = md5() if not is_big and not is_missing_part else None
-
-            pool = [
-                Session(
+            # Bitmap of the parts uploaded so far, for resumable uploads only
+            uploaded = None
+            resume_parts = None
+
+            if resume and is_big and not is_missing_part:
+                resume_key = await self.loop.run_in_executor(
+                    self.file_executor,
+                    get_resume_key,
+                    fp,
+                    file_size,
+                )
+                state = await self.storage.upload_state(resume_key)
+
+                if state is not None and state[1] == part_size:
+                    file_id, uploaded = state[0], bytearray(state[2])
+                    log.info("Resuming upload of %s", file_name)
+                else:
+                    uploaded = bytearray(math.ceil(file_total_parts / 8))
+
+                resume_parts = [
+                    i
+                    for i in range(file_total_parts)
+                    if not uploaded[i >> 3] & (1 << (i & 7))
+                ]
+                file_part = file_total_parts - len(resume_parts)
+
+            dc_id = await self.storage.dc_id()
+            upload_pool = self.upload_pools.get(dc_id)
+
+            if upload_pool is None:
+                upload_pool = self.upload_pools[dc_id] = SessionPool(
                     self,
-                    await self.storage.dc_id(),
-                    await self.storage.auth_key(),
-                    await self.storage.test_mode(),
-                    is_media=True,
+                    dc_id,
+                    self.max_upload_sessions,
                 )
-                for _ in range(pool_size)
-            ]
 
-            workers = [
-                self.loop.create_task(worker(session))
-                for session in pool
-                for _ in range(workers_count)
-            ]
+            scheduler = UploadScheduler(self.max_upload_parts)
+            pool = []
+            # Number of parts in flight on each session of the upload
+            busy = {}
+            tasks = set()
+            reader = None
+            can_grow = True
+            saved_parts = 0
+
+            async def send_part(rpc, size: int) -> None:
+                session = min(pool, key=busy.get)
+                busy[session] += 1
+                rtt = None
+
+                try:
+                    for attempt in range(3):
+                        start = time.monotonic()
+
+                        try:
+                            await session.invoke(rpc)
+                        except Exception as e:
+                            log.warning("Retrying part due to error: %s", e)
+                            scheduler.retries += 1
+                            await asyncio.sleep(2**attempt)
+                        else:
+                            rtt = time.monotonic() - start
 
-            try:
-                for session in pool:
-                    await session.start()
+                            if uploaded is not None:
+                                uploaded[rpc.file_part >> 3] |= 1 << (
+                                    rpc.file_part & 7
+                                )
+
+                            break
+                finally:
+                    busy[session] -= 1
+                    scheduler.release(size, rtt)
+
+            async def grow_pool() -> None:
+                nonlocal can_grow
 
-                fp.seek(part_size * file_part)
-                next_chunk_task = self.loop.create_task(self.preload(fp, part_size))
+                while len(pool) < math.ceil(scheduler.window / PARTS_PER_SESSION):
+                    [session] = await upload_pool.acquire()
+
+                    # The pool is full and only has sessions this upload already uses
+                    if session in busy:
+                        upload_pool.release([session])
+                        can_grow = False
+                        return
+
+                    pool.append(session)
+                    busy[session] = 0
+
+            async def save_state() -> None:
+                nonlocal saved_parts
+
+                saved_parts = scheduler.parts
+                await self.storage.upload_state(
+                    resume_key,
+                    (file_id, part_size, bytes(uploaded)),
+                )
+
+            done_parts = file_part
+
+            try:
+                await grow_pool()
+
+                reader = PartReader(
+                    fp,
+                    part_size,
+                    part_size * file_part,
+                    executor=self.file_executor,
+                    md5_sum=md5_sum,
+                    parts=resume_parts,
+                )
+                part_numbers = (
+                    iter(resume_parts)
+                    if resume_parts is not None
+                    else itertools.count(file_part)
+                )
 
                 while True:
-                    chunk = await next_chunk_task
-                    next_chunk_task = self.loop.create_task(
-                        self.preload(fp, part_size),
-                    )
+                    chunk = await reader.read()
 
                     if not chunk:
                         if not is_big and not is_missing_part:
-                            md5_sum = md5_sum.hexdigest()
+                            md5_sum = await reader.hexdigest()
                         break
 
-                    await queue.put(
-                        create_rpc(
-                            chunk,
-                            file_part,
-                            is_big,
-                            file_id,
-                            file_total_parts,
+                    if can_grow and len(pool) * PARTS_PER_SESSION < scheduler.window:
+                        await grow_pool()
+
+                    if (
+                        uploaded is not None
+                        and scheduler.parts - saved_parts >= RESUME_SAVE_PARTS
+                    ):
+                        await save_state()
+
+                    await scheduler.acquire()
+
+                    task = self.loop.create_task(
+                        send_part(
+                            create_rpc(
+                                chunk,
+                                next(part_numbers),
+                                is_big,
+                                file_id,
+                                file_total_parts,
+                            ),
+                            len(chunk),
                         ),
                     )
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
 
                     if is_missing_part:
                         return None
 
-                    if not is_big and not is_missing_part:
-                        md5_sum.update(chunk)
-
-                    file_part += 1
+                    done_parts += 1
 
                     if progress:
                         func = functools.partial(
                             progress,
-                            min(file_part * part_size, file_size),
+                            min(done_parts * part_size, file_size),
                             file_size,
                             *progress_args,
                         )
@@ -204,13 +516,16 @@ class SaveFile:
                         if inspect.iscoroutinefunction(progress):
                             await func()
                         else:
-                            await self.loop.run_in_executor(self.executor, func)
+                            await self.loop.run_in_executor(
+                                self.progress_executor,
+                                func,
+                            )
             except StopTransmissionError:
                 raise
             except Exception as e:
                 log.error(
                     "Error during file upload at part %s: %s",
-                    file_part,
+                    done_parts,
                     e,
                 )
             else:
@@ -227,13 +542,24 @@ class SaveFile:
                     md5_checksum=md5_sum,
                 )
             finally:
-                for _ in workers:
-                    await queue.put(None)
-
-                await asyncio.gather(*workers)
-
-                for session in pool:
-                    await session.stop()
-
-    async def preload(self, fp, part_size):
-        return fp.read(part_size)
+                if reader is not None:
+                    await reader.close()
+
+                await asyncio.gather(*tasks)
+
+                upload_pool.release(pool)
+
+                if uploaded is not None:
+                    # Kept until the file is sent, see utils.finish_resumable_upload
+                    await save_state()
+                    self.resumable_uploads[file_id] = resume_key
+
+                self.upload_stats.append(
+                    {
+                        "file_name": file_name,
+                        "file_size": file_size,
+                        "part_size": part_size,
+                        "sessions": len(pool),
+                        **scheduler.get_stats(),
+                    },
+                )
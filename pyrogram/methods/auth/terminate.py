@@ -35,6 +35,19 @@ class Terminate:
 
         self.media_sessions.clear()
 
+        for upload_pool in self.upload_pools.values():
+            await upload_pool.stop()
+
+        self.upload_pools.clear()
+
+        for download_pool in self.download_pools.values():
+            await download_pool.stop()
+
+        self.download_pools.clear()
+
+        if self.upload_cache is not None:
+            await self.upload_cache.close()
+
         self.updates_watchdog_event.set()
 
         if self.updates_watchdog_task is not None:
@@ -42,4 +55,14 @@ class Terminate:
 
         self.updates_watchdog_event.clear()
 
+        for executor in (
+            self.filter_executor,
+            self.progress_executor,
+            self.process_executor,
+        ):
+            if executor is not None:
+                executor.shutdown(wait=False)
+
+        self.create_executors()
+
         self.is_initialized = False
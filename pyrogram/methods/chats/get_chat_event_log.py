@@ -1,9 +1,10 @@
 from __future__ import annotations
 
+import contextlib
 from typing import TYPE_CHECKING
 
 import pyrogram
-from pyrogram import raw, types
+from pyrogram import raw, types, utils
 
 if TYPE_CHECKING:
     from collections.abc import AsyncGenerator
@@ -18,6 +19,7 @@ class GetChatEventLog:
         limit: int = 0,
         filters: types.ChatEventFilter = None,
         user_ids: list[int | str] | None = None,
+        prefetch: int = 0,
     ) -> AsyncGenerator[types.ChatEvent, None] | None:
         """Get the actions taken by chat members and administrators in the last 48h.
 
@@ -51,6 +53,10 @@ class GetChatEventLog:
                 User identifiers (int) or usernames (str) by which to filter events.
                 By default, events relating to all users will be returned.
 
+            prefetch (``int``, *optional*):
+                Number of pages of events to fetch in the background while the current one is being consumed.
+                Defaults to 0, pages are fetched when needed.
+
         Yields:
             :obj:`~pyrogram.types.ChatEvent` objects.
 
@@ -64,33 +70,43 @@ class GetChatEventLog:
         total = abs(limit) or (1 << 31)
         limit = min(100, total)
 
-        while True:
-            r: raw.base.channels.AdminLogResults = await self.invoke(
-                raw.functions.channels.GetAdminLog(
-                    channel=await self.resolve_peer(chat_id),
-                    q=query,
-                    min_id=0,
-                    max_id=offset_id,
-                    limit=limit,
-                    events_filter=filters.write() if filters else None,
-                    admins=(
-                        [await self.resolve_peer(i) for i in user_ids]
-                        if user_ids is not None
-                        else user_ids
+        async def pages(offset_id: int):
+            fetched = 0
+
+            while fetched < total:
+                r: raw.base.channels.AdminLogResults = await self.invoke(
+                    raw.functions.channels.GetAdminLog(
+                        channel=await self.resolve_peer(chat_id),
+                        q=query,
+                        min_id=0,
+                        max_id=offset_id,
+                        limit=limit,
+                        events_filter=filters.write() if filters else None,
+                        admins=(
+                            [await self.resolve_peer(i) for i in user_ids]
+                            if user_ids is not None
+                            else user_ids
+                        ),
                     ),
-                ),
-            )
+                )
+
+                if not r.events:
+                    return
 
-            if not r.events:
-                return
+                last = r.events[-1]
+                offset_id = last.id
+                fetched += len(r.events)
 
-            last = r.events[-1]
-            offset_id = last.id
+                yield r
 
-            for event in r.events:
-                yield await types.ChatEvent._parse(self, event, r.users, r.chats)
+        async with contextlib.aclosing(
+            utils.prefetch_pages(pages(offset_id), prefetch),
+        ) as chunks:
+            async for r in chunks:
+                for event in r.events:
+                    yield await types.ChatEvent._parse(self, event, r.users, r.chats)
 
-                current += 1
+                    current += 1
 
-                if current >= total:
-                    return
+                    if current >= total:
+                        return
@@ -1,10 +1,11 @@
 from __future__ import annotations
 
+import contextlib
 import logging
 from typing import TYPE_CHECKING
 
 import pyrogram
-from pyrogram import enums, raw, types
+from pyrogram import enums, raw, types, utils
 
 if TYPE_CHECKING:
     from collections.abc import AsyncGenerator
@@ -55,6 +56,7 @@ class GetChatMembers:
         query: str = "",
         limit: int = 0,
         filter: enums.ChatMembersFilter = enums.ChatMembersFilter.SEARCH,
+        prefetch: int = 0,
     ) -> AsyncGenerator[types.ChatMember, None] | None:
         """Get the members list of a chat.
 
@@ -82,6 +84,10 @@ class GetChatMembers:
                 Filter used to select the kind of members you want to retrieve. Only applicable for supergroups
                 and channels.
 
+            prefetch (``int``, *optional*):
+                Number of pages of members to fetch in the background while the current one is being consumed.
+                Defaults to 0, pages are fetched when needed.
+
         Returns:
             ``Generator``: On success, a generator yielding :obj:`~pyrogram.types.ChatMember` objects is returned.
 
@@ -124,25 +130,35 @@ class GetChatMembers:
         total = abs(limit) or (1 << 31) - 1
         limit = min(200, total)
 
-        while True:
-            members = await get_chunk(
-                client=self,
-                chat_id=chat_id,
-                offset=offset,
-                filter=filter,
-                limit=limit,
-                query=query,
-            )
+        async def pages(offset: int):
+            fetched = 0
 
-            if not members:
-                return
+            while fetched < total:
+                members = await get_chunk(
+                    client=self,
+                    chat_id=chat_id,
+                    offset=offset,
+                    filter=filter,
+                    limit=limit,
+                    query=query,
+                )
 
-            offset += len(members)
+                if not members:
+                    return
 
-            for member in members:
-                yield member
+                offset += len(members)
+                fetched += len(members)
 
-                current += 1
+                yield members
 
-                if current >= total:
-                    return
+        async with contextlib.aclosing(
+            utils.prefetch_pages(pages(offset), prefetch),
+        ) as chunks:
+            async for members in chunks:
+                for member in members:
+                    yield member
+
+                    current += 1
+
+                    if current >= total:
+                        return
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import contextlib
 from typing import TYPE_CHECKING
 
 import pyrogram
@@ -15,6 +16,7 @@ class GetDialogs:
         limit: int = 0,
         pinned_only: bool = False,
         chat_list: int = 0,
+        prefetch: int = 0,
     ) -> AsyncGenerator[types.Dialog, None] | None:
         """Get a user's dialogs sequentially.
 
@@ -32,6 +34,10 @@ class GetDialogs:
             chat_list (``int``, *optional*):
                 Chat list from which to get the dialogs; Only Main (0) and Archive (1) chat lists are supported. Defaults to (0) Main chat list.
 
+            prefetch (``int``, *optional*):
+                Number of pages of dialogs to fetch in the background while the current one is being consumed.
+                Defaults to 0, pages are fetched when needed.
+
         Returns:
             ``Generator``: A generator yielding :obj:`~pyrogram.types.Dialog` objects.
 
@@ -46,65 +52,75 @@ class GetDialogs:
         total = limit or (1 << 31) - 1
         limit = min(100, total)
 
-        offset_date = 0
-        offset_id = 0
-        offset_peer = raw.types.InputPeerEmpty()
-
-        while True:
-            r = await self.invoke(
-                raw.functions.messages.GetDialogs(
-                    offset_date=offset_date,
-                    offset_id=offset_id,
-                    offset_peer=offset_peer,
-                    limit=limit,
-                    hash=0,
-                    exclude_pinned=not pinned_only,
-                    folder_id=chat_list,
-                ),
-                sleep_threshold=60,
-            )
-
-            users = {i.id: i for i in r.users}
-            chats = {i.id: i for i in r.chats}
-
-            messages = {}
-
-            for message in r.messages:
-                if isinstance(message, raw.types.MessageEmpty):
-                    continue
-
-                chat_id = utils.get_peer_id(message.peer_id)
-                messages[chat_id] = await types.Message._parse(
-                    self,
-                    message,
-                    users,
-                    chats,
-                    replies=1,
+        async def pages():
+            offset_date = 0
+            offset_id = 0
+            offset_peer = raw.types.InputPeerEmpty()
+            fetched = 0
+
+            while fetched < total:
+                r = await self.invoke(
+                    raw.functions.messages.GetDialogs(
+                        offset_date=offset_date,
+                        offset_id=offset_id,
+                        offset_peer=offset_peer,
+                        limit=limit,
+                        hash=0,
+                        exclude_pinned=not pinned_only,
+                        folder_id=chat_list,
+                    ),
+                    sleep_threshold=60,
                 )
 
-            dialogs = []
-
-            for dialog in r.dialogs:
-                if not isinstance(dialog, raw.types.Dialog):
-                    continue
+                users = {i.id: i for i in r.users}
+                chats = {i.id: i for i in r.chats}
 
-                dialogs.append(
-                    types.Dialog._parse(self, dialog, messages, users, chats),
-                )
+                messages = {}
 
-            if not dialogs:
-                return
+                for message in r.messages:
+                    if isinstance(message, raw.types.MessageEmpty):
+                        continue
 
-            last = dialogs[-1]
+                    chat_id = utils.get_peer_id(message.peer_id)
+                    messages[chat_id] = await types.Message._parse(
+                        self,
+                        message,
+                        users,
+                        chats,
+                        replies=1,
+                    )
 
-            offset_id = last.top_message.id
-            offset_date = utils.datetime_to_timestamp(last.top_message.date)
-            offset_peer = await self.resolve_peer(last.chat.id)
+                dialogs = []
 
-            for dialog in dialogs:
-                yield dialog
+                for dialog in r.dialogs:
+                    if not isinstance(dialog, raw.types.Dialog):
+                        continue
 
-                current += 1
+                    dialogs.append(
+                        types.Dialog._parse(self, dialog, messages, users, chats),
+                    )
 
-                if current >= total:
+                if not dialogs:
                     return
+
+                last = dialogs[-1]
+
+                offset_id = last.top_message.id
+                offset_date = utils.datetime_to_timestamp(last.top_message.date)
+                offset_peer = await self.resolve_peer(last.chat.id)
+
+                fetched += len(dialogs)
+
+                yield dialogs
+
+        async with contextlib.aclosing(
+            utils.prefetch_pages(pages(), prefetch),
+        ) as chunks:
+            async for dialogs in chunks:
+                for dialog in dialogs:
+                    yield dialog
+
+                    current += 1
+
+                    if current >= total:
+                        return
@@ -25,6 +25,7 @@ class DownloadMedia:
         block: bool = True,
         progress: Callable | None = None,
         progress_args: tuple = (),
+        verify_size: bool = False,
     ) -> str | BinaryIO | None:
         """Download the media from a message.
 
@@ -61,6 +62,11 @@ class DownloadMedia:
                 You can pass anything you need to be available in the progress callback scope; for example, a Message
                 object or a Client instance in order to edit the message with the updated progress status.
 
+            verify_size (``bool``, *optional*):
+                Pass True to check the size of the downloaded file against the size of the media, when known.
+                Files of the wrong size are deleted and None is returned.
+                Defaults to False.
+
         Other Parameters:
             current (``int``):
                 The amount of bytes transmitted so far.
@@ -76,6 +82,7 @@ class DownloadMedia:
             ``str`` | ``None`` | ``BinaryIO``: On success, the absolute path of the downloaded file is returned,
             otherwise, in case the download failed or was deliberately stopped with
             :meth:`~pyrogram.Client.stop_transmission`, None is returned.
+            Failed downloads leave a ".temp" file behind, downloading the same file again continues from there.
             Otherwise, in case ``in_memory=True``, a binary file-like object with its attribute ".name" set is returned.
 
         Raises:
@@ -186,6 +193,7 @@ class DownloadMedia:
                 file_size,
                 progress,
                 progress_args,
+                verify_size,
             ),
         )
 
@@ -0,0 +1,229 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import json
+import logging
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from pyrogram.errors import FloodWait
+
+from .get_chat_history import get_chunk
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncGenerator
+
+    import pyrogram
+    from pyrogram import types
+
+log = logging.getLogger(__name__)
+
+
+class RateLimiter:
+    """Spaces the requests of all the workers of an export out to at most *rate* per second."""
+
+    def __init__(self, rate: float) -> None:
+        self.interval = 1 / rate if rate > 0 else 0
+        self.next = 0.0
+        self.lock = asyncio.Lock()
+
+    async def wait(self) -> None:
+        async with self.lock:
+            now = asyncio.get_running_loop().time()
+            delay = self.next - now
+            self.next = max(now, self.next) + self.interval
+
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def pause(self, seconds: float) -> None:
+        self.next = max(self.next, asyncio.get_running_loop().time() + seconds)
+
+
+class ExportChatHistory:
+    async def export_chat_history(
+        self: pyrogram.Client,
+        chat_id: int | str,
+        min_id: int = 0,
+        max_id: int = 0,
+        partitions: int = 4,
+        ordered: bool = True,
+        rate_limit: float = 10,
+        checkpoint: str | Path | None = None,
+        buffer_size: int = 4,
+    ) -> AsyncGenerator[types.Message, None] | None:
+        """Export the history of a chat by fetching several ranges of message ids concurrently.
+
+        The id range is split into *partitions* ranges of the same size, each one walked by its own worker.
+        All the workers share a rate limit, which also covers the requests made to resolve the replied-to messages and
+        forum topics of each page, and pause together whenever Telegram asks to wait.
+
+        .. include:: /_includes/usable-by/users.rst
+
+        Parameters:
+            chat_id (``int`` | ``str``):
+                Unique identifier (int) or username (str) of the target chat.
+                For your personal cloud (Saved Messages) you can simply use "me" or "self".
+                For a contact that exists in your Telegram address book you can use his phone number (str).
+
+            min_id (``int``, *optional*):
+                Identifier of the oldest message to export.
+                Defaults to 0, the beginning of the chat.
+
+            max_id (``int``, *optional*):
+                Identifier of the newest message to export.
+                Defaults to 0, the latest message of the chat.
+
+            partitions (``int``, *optional*):
+                Number of ranges fetched concurrently.
+                Defaults to 4.
+
+            ordered (``bool``, *optional*):
+                Pass False to get the messages as soon as they are fetched, in no particular order.
+                By default, messages are returned in reverse chronological order, like in
+                :meth:`~pyrogram.Client.get_chat_history`.
+
+            rate_limit (``float``, *optional*):
+                Maximum number of requests per second, for all the partitions together.
+                Defaults to 10.
+
+            checkpoint (``str`` | ``Path``, *optional*):
+                Path of a file where the progress of the export is saved after each page of messages.
+                If the file exists, the export resumes from where it was left, the last page returned before an
+                interruption may be returned again. A checkpoint made for another chat, id range or number of
+                partitions is ignored. The file is deleted once the export is complete.
+
+            buffer_size (``int``, *optional*):
+                Number of pages of messages each partition can fetch ahead of the consumer.
+                Defaults to 4.
+
+        Returns:
+            ``Generator``: A generator yielding :obj:`~pyrogram.types.Message` objects.
+
+        Example:
+            .. code-block:: python
+
+                async for message in app.export_chat_history(chat_id, checkpoint="export.json"):
+                    print(message.text)
+        """
+        checkpoint = Path(checkpoint) if checkpoint else None
+        # The ranges saved in a checkpoint only make sense for the same export
+        options = {
+            "chat_id": chat_id,
+            "min_id": min_id,
+            "max_id": max_id,
+            "partitions": partitions,
+        }
+        state = None
+
+        if checkpoint and checkpoint.exists():
+            saved = json.loads(checkpoint.read_text())
+
+            if saved.get("options") == options:
+                state = saved["ranges"]
+            else:
+                log.warning(
+                    "Ignoring checkpoint %s made for another export: %s",
+                    checkpoint,
+                    saved.get("options"),
+                )
+
+        if state is None:
+            if not max_id:
+                latest = await get_chunk(client=self, chat_id=chat_id, limit=1)
+
+                if not latest:
+                    return
+
+                max_id = latest[0].id
+
+            low = max(min_id, 1)
+            size = max(-(-(max_id - low + 1) // max(partitions, 1)), 1)
+
+            # [lowest id, highest id, offset id of the next page], newest range first
+            state = [
+                [start, min(start + size - 1, max_id), min(start + size, max_id + 1)]
+                for start in reversed(range(low, max_id + 1, size))
+            ]
+
+        def save() -> None:
+            if checkpoint:
+                temp = checkpoint.with_suffix(checkpoint.suffix + ".temp")
+                temp.write_text(
+                    json.dumps({"options": options, "ranges": state}),
+                )
+                temp.replace(checkpoint)
+
+        limiter = RateLimiter(rate_limit)
+        shared_queue = asyncio.Queue(buffer_size * len(state))
+        queues = [
+            asyncio.Queue(buffer_size) if ordered else shared_queue for _ in state
+        ]
+
+        async def fetch(index: int) -> None:
+            low, _, offset_id = state[index]
+            queue = queues[index]
+
+            try:
+                while offset_id > low:
+                    await limiter.wait()
+
+                    try:
+                        messages = await get_chunk(
+                            client=self,
+                            chat_id=chat_id,
+                            limit=100,
+                            from_message_id=offset_id,
+                            min_id=low - 1,
+                            wait=limiter.wait,
+                        )
+                    except FloodWait as e:
+                        log.warning(
+                            "Waiting for %s seconds before exporting more messages",
+                            e.value,
+                        )
+                        limiter.pause(e.value)
+                        continue
+
+                    offset_id = messages[-1].id if messages else low
+                    await queue.put((index, messages, offset_id, None))
+            except Exception as e:
+                await queue.put((index, None, offset_id, e))
+            else:
+                await queue.put((index, None, low, None))
+
+        workers = [
+            asyncio.get_event_loop().create_task(fetch(i))
+            for i, (low, _, offset_id) in enumerate(state)
+            if offset_id > low
+        ]
+        pending = len(workers)
+
+        try:
+            for i, queue in enumerate(queues if ordered else [shared_queue]):
+                # Ordered exports drain one partition after the other, unordered ones share a single queue
+                while pending and (not ordered or state[i][2] > state[i][0]):
+                    index, messages, offset_id, error = await queue.get()
+
+                    if error is not None:
+                        raise error
+
+                    for message in messages or []:
+                        yield message
+
+                    state[index][2] = offset_id
+
+                    if messages is None:
+                        pending -= 1
+
+                    save()
+
+            if checkpoint:
+                checkpoint.unlink(missing_ok=True)
+        finally:
+            for worker in workers:
+                worker.cancel()
+
+            with contextlib.suppress(asyncio.CancelledError):
+                await asyncio.gather(*workers, return_exceptions=True)
@@ -1,12 +1,13 @@
 from __future__ import annotations
 
+import contextlib
 from typing import TYPE_CHECKING
 
 import pyrogram
 from pyrogram import raw, types, utils
 
 if TYPE_CHECKING:
-    from collections.abc import AsyncGenerator
+    from collections.abc import AsyncGenerator, Awaitable, Callable
     from datetime import datetime
 
 
@@ -20,6 +21,8 @@ async def get_chunk(
     from_date: datetime | None = None,
     min_id: int = 0,
     max_id: int = 0,
+    raw_messages: bool = False,
+    wait: Callable[[], Awaitable] | None = None,
 ):
     if from_date is None:
         from_date = utils.zero_datetime()
@@ -37,7 +40,10 @@ async def get_chunk(
         sleep_threshold=60,
     )
 
-    return await utils.parse_messages(client, messages)
+    if raw_messages:
+        return utils.parse_raw_messages(client, messages)
+
+    return await utils.parse_messages(client, messages, wait=wait)
 
 
 class GetChatHistory:
@@ -50,7 +56,9 @@ class GetChatHistory:
         offset_date: datetime | None = None,
         min_id: int = 0,
         max_id: int = 0,
-    ) -> AsyncGenerator[types.Message, None] | None:
+        prefetch: int = 0,
+        raw_messages: bool = False,
+    ) -> AsyncGenerator[types.Message | utils.RawMessage, None] | None:
         """Get messages from a chat history.
 
         The messages are returned in reverse chronological order.
@@ -84,8 +92,18 @@ class GetChatHistory:
             max_id: (``int``, *optional*):
                 The maximum message id. you will not get any message which have id greater than max_id.
 
+            prefetch (``int``, *optional*):
+                Number of pages of messages to fetch in the background while the current one is being consumed.
+                Defaults to 0, pages are fetched when needed.
+
+            raw_messages (``bool``, *optional*):
+                Pass True to get lightweight records with the raw messages straight from the response instead of
+                fully parsed messages. Much faster when only ids, dates, texts and senders are needed.
+                Defaults to False.
+
         Returns:
-            ``Generator``: A generator yielding :obj:`~pyrogram.types.Message` objects.
+            ``Generator``: A generator yielding :obj:`~pyrogram.types.Message` objects, or ``RawMessage``
+            records from :mod:`pyrogram.utils` in case *raw_messages* is True.
 
         Example:
             .. code-block:: python
@@ -99,27 +117,38 @@ class GetChatHistory:
         total = limit or (1 << 31) - 1
         limit = min(100, total)
 
-        while True:
-            messages = await get_chunk(
-                client=self,
-                chat_id=chat_id,
-                limit=limit,
-                offset=offset,
-                from_message_id=offset_id,
-                from_date=offset_date,
-                min_id=min_id,
-                max_id=max_id,
-            )
+        async def pages(offset_id: int):
+            fetched = 0
+
+            while fetched < total:
+                messages = await get_chunk(
+                    client=self,
+                    chat_id=chat_id,
+                    limit=limit,
+                    offset=offset,
+                    from_message_id=offset_id,
+                    from_date=offset_date,
+                    min_id=min_id,
+                    max_id=max_id,
+                    raw_messages=raw_messages,
+                )
+
+                if not messages:
+                    return
 
-            if not messages:
-                return
+                offset_id = messages[-1].id
+                fetched += len(messages)
 
-            offset_id = messages[-1].id
+                yield messages
 
-            for message in messages:
-                yield message
+        async with contextlib.aclosing(
+            utils.prefetch_pages(pages(offset_id), prefetch),
+        ) as chunks:
+            async for messages in chunks:
+                for message in messages:
+                    yield message
 
-                current += 1
+                    current += 1
 
-                if current >= total:
-                    return
+                    if current >= total:
+                        return
@@ -118,7 +118,12 @@ class GetMessages:
 
             r = await self.invoke(rpc, sleep_threshold=-1)
 
-            messages = await utils.parse_messages(self, r, is_scheduled=is_scheduled)
+            messages = await utils.parse_messages(
+                self,
+                r,
+                is_scheduled=is_scheduled,
+                replies=replies,
+            )
 
             return messages if is_iterable else messages[0] if messages else None
 
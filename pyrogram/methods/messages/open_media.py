@@ -0,0 +1,342 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+from collections import OrderedDict
+from typing import TYPE_CHECKING
+
+from pyrogram import raw, types, utils
+from pyrogram.file_id import FileId
+from pyrogram.session import SessionPool
+
+if TYPE_CHECKING:
+    import pyrogram
+    from pyrogram.session import Session
+
+log = logging.getLogger(__name__)
+
+
+class MediaFile:
+    """A read-only file over a media stored on Telegram, with random access at any byte offset.
+
+    The media is fetched in chunks of :attr:`CHUNK_SIZE` bytes through a single media session kept until the file is
+    closed, the session is replaced with another one from the pool if it dies or fails to fetch a chunk. The last
+    *cache_size* chunks used are kept in memory and the *read_ahead* chunks following each read are fetched in the
+    background, so that sequential reads rarely wait.
+    """
+
+    CHUNK_SIZE = 1024 * 1024
+    MAX_RETRIES = 3
+
+    def __init__(
+        self,
+        client: pyrogram.Client,
+        file_id: FileId,
+        size: int = 0,
+        name: str = "",
+        cache_size: int = 8,
+        read_ahead: int = 2,
+    ) -> None:
+        self.client = client
+        self.file_id = file_id
+        self.location = utils.get_input_file_location(file_id)
+        self.cache_key = (
+            utils.get_chunk_cache_key(file_id)
+            if client.chunk_cache is not None
+            else None
+        )
+        # None until the end of the media has been seen, if not known upfront
+        self.size = size or None
+        self.name = name
+        self.cache_size = max(cache_size, read_ahead + 1)
+        self.read_ahead = read_ahead
+        self.position = 0
+
+        self.chunks: OrderedDict[int, asyncio.Task] = OrderedDict()
+        self.pool: SessionPool | None = None
+        self.session: Session | None = None
+        self.session_lock = asyncio.Lock()
+        self.closed = False
+
+        self.hits = 0
+        self.misses = 0
+
+    async def open(self) -> MediaFile:
+        dc_id = self.file_id.dc_id
+        self.pool = self.client.download_pools.get(dc_id)
+
+        if self.pool is None:
+            self.pool = self.client.download_pools[dc_id] = SessionPool(
+                self.client,
+                dc_id,
+                self.client.MAX_DOWNLOAD_SESSIONS,
+            )
+
+        await self.get_session()
+
+        return self
+
+    async def get_session(self, failed: Session | None = None) -> Session:
+        async with self.session_lock:
+            # Chunks fetched at the same time may fail on the same session, it's only replaced once
+            if (
+                self.session is None
+                or self.session is failed
+                or not self.pool.is_alive(self.session)
+            ):
+                if self.session is not None:
+                    self.pool.release([self.session])
+                    self.session = None
+
+                [self.session] = await self.pool.acquire()
+
+            return self.session
+
+    async def close(self) -> None:
+        if self.closed:
+            return
+
+        self.closed = True
+
+        for task in self.chunks.values():
+            task.cancel()
+
+        await asyncio.gather(*self.chunks.values(), return_exceptions=True)
+        self.chunks.clear()
+
+        if self.session is not None:
+            self.pool.release([self.session])
+            self.session = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        await self.close()
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self.position
+
+    def seek(self, offset: int, whence: int = os.SEEK_SET) -> int:
+        if whence == os.SEEK_CUR:
+            offset += self.position
+        elif whence == os.SEEK_END:
+            if self.size is None:
+                raise ValueError("The size of this media is unknown")
+
+            offset += self.size
+
+        if offset < 0:
+            raise ValueError(f"Negative seek position {offset}")
+
+        self.position = offset
+
+        return self.position
+
+    async def fetch(self, index: int) -> bytes:
+        chunk = (
+            await self.client.chunk_cache.get(
+                self.cache_key,
+                index,
+                self.client.file_executor,
+            )
+            if self.cache_key is not None
+            else None
+        )
+
+        if chunk is None:
+            chunk = await self.fetch_remote(index)
+
+        if len(chunk) < self.CHUNK_SIZE:
+            self.size = index * self.CHUNK_SIZE + len(chunk)
+
+        return chunk
+
+    async def fetch_remote(self, index: int) -> bytes:
+        session = await self.get_session()
+
+        for attempt in range(self.MAX_RETRIES):
+            try:
+                r = await session.invoke(
+                    raw.functions.upload.GetFile(
+                        location=self.location,
+                        offset=index * self.CHUNK_SIZE,
+                        limit=self.CHUNK_SIZE,
+                    ),
+                    sleep_threshold=30,
+                )
+            except (OSError, asyncio.TimeoutError) as e:
+                if attempt == self.MAX_RETRIES - 1:
+                    raise
+
+                log.warning(
+                    "Retrying chunk %s of %s due to error: %s",
+                    index,
+                    self.name,
+                    e,
+                )
+                session = await self.get_session(session)
+            else:
+                break
+
+        if not isinstance(r, raw.types.upload.File):
+            raise TypeError(f"Unexpected response while reading a media: {r}")
+
+        if self.cache_key is not None:
+            await self.client.chunk_cache.set(
+                self.cache_key,
+                index,
+                r.bytes,
+                self.client.file_executor,
+            )
+
+        return r.bytes
+
+    def get_chunk(self, index: int) -> asyncio.Task:
+        task = self.chunks.get(index)
+
+        # Chunks that failed to be fetched are fetched again
+        if task is not None and not (
+            task.done() and (task.cancelled() or task.exception())
+        ):
+            self.chunks.move_to_end(index)
+            return task
+
+        task = self.chunks[index] = self.client.loop.create_task(self.fetch(index))
+        # Errors of chunks fetched ahead are only raised once they are read
+        task.add_done_callback(lambda t: t.cancelled() or t.exception())
+        self.chunks.move_to_end(index)
+
+        # Evicted chunks still being fetched are left running for the reads waiting for them
+        while len(self.chunks) > self.cache_size:
+            self.chunks.popitem(last=False)
+
+        return task
+
+    def prefetch(self, index: int) -> None:
+        for i in range(index, index + self.read_ahead):
+            if self.size is not None and i * self.CHUNK_SIZE >= self.size:
+                break
+
+            if i not in self.chunks:
+                self.get_chunk(i)
+
+    async def read(self, n: int = -1) -> bytes:
+        """Read up to *n* bytes from the current position, or until the end of the media if *n* is negative."""
+        if self.closed:
+            raise ValueError("I/O operation on closed file")
+
+        data = []
+
+        while n != 0:
+            if self.size is not None and self.position >= self.size:
+                break
+
+            index, start = divmod(self.position, self.CHUNK_SIZE)
+            task = self.chunks.get(index)
+
+            if task is not None and task.done():
+                self.hits += 1
+            else:
+                self.misses += 1
+
+            chunk = await self.get_chunk(index)
+            self.prefetch(index + 1)
+
+            part = chunk[start : start + n if n > 0 else None]
+
+            if not part:
+                break
+
+            data.append(part)
+            self.position += len(part)
+            n -= len(part) if n > 0 else 0
+
+        return b"".join(data)
+
+    def get_stats(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "cached_chunks": len(self.chunks),
+        }
+
+
+class OpenMedia:
+    async def open_media(
+        self: pyrogram.Client,
+        message: types.Message | str,
+        cache_size: int = 8,
+        read_ahead: int = 2,
+    ) -> MediaFile:
+        """Open the media from a message as a read-only file with random access.
+
+        Unlike :meth:`~pyrogram.Client.stream_media`, reads can start and end at any byte offset, and the media
+        session used is kept for as long as the file is open. Useful to serve media over HTTP with range requests.
+
+        .. include:: /_includes/usable-by/users-bots.rst
+
+        Parameters:
+            message (:obj:`~pyrogram.types.Message` | ``str``):
+                Pass a Message containing the media, the media itself (message.audio, message.video, ...) or a file id
+                as string.
+
+            cache_size (``int``, *optional*):
+                How many chunks of 1 MiB to keep in memory.
+                Defaults to 8.
+
+            read_ahead (``int``, *optional*):
+                How many chunks to fetch in the background after the ones being read.
+                Defaults to 2.
+
+        Returns:
+            ``MediaFile``: A file-like object with async ``read(n)`` and ``close()`` methods and sync ``seek()`` and
+            ``tell()`` methods, usable as an async context manager.
+
+        Example:
+            .. code-block:: python
+
+                async with await app.open_media(message) as file:
+                    # Read 100 bytes starting from the 5000th
+                    file.seek(5000)
+                    data = await file.read(100)
+        """
+        available_media = (
+            "audio",
+            "document",
+            "photo",
+            "sticker",
+            "animation",
+            "video",
+            "voice",
+            "video_note",
+            "new_chat_photo",
+        )
+
+        if isinstance(message, types.Message):
+            for kind in available_media:
+                media = getattr(message, kind, None)
+
+                if media is not None:
+                    break
+            else:
+                raise ValueError(
+                    "This message doesn't contain any downloadable media",
+                )
+        else:
+            media = message
+
+        file_id_str = media if isinstance(media, str) else media.file_id
+
+        return await MediaFile(
+            self,
+            FileId.decode(file_id_str),
+            getattr(media, "file_size", 0),
+            getattr(media, "file_name", None) or "",
+            cache_size,
+            read_ahead,
+        ).open()
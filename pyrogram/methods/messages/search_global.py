@@ -9,13 +9,45 @@ if TYPE_CHECKING:
     from collections.abc import AsyncGenerator
 
 
+async def get_chunk(
+    *,
+    client: pyrogram.Client,
+    query: str,
+    filter: enums.MessagesFilter,
+    offset_date: int,
+    offset_peer: raw.base.InputPeer,
+    offset_id: int,
+    limit: int,
+    raw_messages: bool = False,
+) -> list[types.Message | utils.RawMessage]:
+    r = await client.invoke(
+        raw.functions.messages.SearchGlobal(
+            q=query,
+            filter=filter.value(),
+            min_date=0,
+            max_date=0,
+            offset_rate=offset_date,
+            offset_peer=offset_peer,
+            offset_id=offset_id,
+            limit=limit,
+        ),
+        sleep_threshold=60,
+    )
+
+    if raw_messages:
+        return utils.parse_raw_messages(client, r)
+
+    return await utils.parse_messages(client, r)
+
+
 class SearchGlobal:
     async def search_global(
         self: pyrogram.Client,
         query: str = "",
         filter: enums.MessagesFilter = enums.MessagesFilter.EMPTY,
         limit: int = 0,
-    ) -> AsyncGenerator[types.Message, None] | None:
+        raw_messages: bool = False,
+    ) -> AsyncGenerator[types.Message | utils.RawMessage, None] | None:
         """Search messages globally from all of your chats.
 
         If you want to get the messages count only, see :meth:`~pyrogram.Client.search_global_count`.
@@ -40,8 +72,14 @@ class SearchGlobal:
                 Limits the number of messages to be retrieved.
                 By default, no limit is applied and all messages are returned.
 
+            raw_messages (``bool``, *optional*):
+                Pass True to get lightweight records with the raw messages straight from the response instead of
+                fully parsed messages. Much faster when only ids, dates, texts and senders are needed.
+                Defaults to False.
+
         Returns:
-            ``Generator``: A generator yielding :obj:`~pyrogram.types.Message` objects.
+            ``Generator``: A generator yielding :obj:`~pyrogram.types.Message` objects, or ``RawMessage``
+            records from :mod:`pyrogram.utils` in case *raw_messages* is True.
 
         Example:
             .. code-block:: python
@@ -66,21 +104,15 @@ class SearchGlobal:
         offset_id = 0
 
         while True:
-            messages = await utils.parse_messages(
-                self,
-                await self.invoke(
-                    raw.functions.messages.SearchGlobal(
-                        q=query,
-                        filter=filter.value(),
-                        min_date=0,
-                        max_date=0,
-                        offset_rate=offset_date,
-                        offset_peer=offset_peer,
-                        offset_id=offset_id,
-                        limit=limit,
-                    ),
-                    sleep_threshold=60,
-                ),
+            messages = await get_chunk(
+                client=self,
+                query=query,
+                filter=filter,
+                offset_date=offset_date,
+                offset_peer=offset_peer,
+                offset_id=offset_id,
+                limit=limit,
+                raw_messages=raw_messages,
             )
 
             if not messages:
@@ -89,7 +121,9 @@ class SearchGlobal:
             last = messages[-1]
 
             offset_date = utils.datetime_to_timestamp(last.date)
-            offset_peer = await self.resolve_peer(last.chat.id)
+            offset_peer = await self.resolve_peer(
+                last.chat_id if raw_messages else last.chat.id,
+            )
             offset_id = last.id
 
             for message in messages:
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import contextlib
 from typing import TYPE_CHECKING
 
 import pyrogram
@@ -18,7 +19,8 @@ async def get_chunk(
     limit: int = 100,
     from_user: int | str | None = None,
     thread_id: int | None = None,
-) -> list[types.Message]:
+    raw_messages: bool = False,
+) -> list[types.Message | utils.RawMessage]:
     r = await client.invoke(
         raw.functions.messages.Search(
             peer=await client.resolve_peer(chat_id),
@@ -38,6 +40,9 @@ async def get_chunk(
         sleep_threshold=60,
     )
 
+    if raw_messages:
+        return utils.parse_raw_messages(client, r)
+
     return await utils.parse_messages(client, r)
 
 
@@ -51,7 +56,9 @@ class SearchMessages:
         limit: int = 0,
         from_user: int | str | None = None,
         thread_id: int | None = None,
-    ) -> AsyncGenerator[types.Message, None] | None:
+        prefetch: int = 0,
+        raw_messages: bool = False,
+    ) -> AsyncGenerator[types.Message | utils.RawMessage, None] | None:
         """Search for text and media messages inside a specific chat.
 
         If you want to get the messages count only, see :meth:`~pyrogram.Client.search_messages_count`.
@@ -89,8 +96,18 @@ class SearchMessages:
             thread_id (``int``, *optional*):
                 Unique identifier of the thread (Message.message_thread_id or Message.reply_top_message_id) to search in.
 
+            prefetch (``int``, *optional*):
+                Number of pages of messages to fetch in the background while the current one is being consumed.
+                Defaults to 0, pages are fetched when needed.
+
+            raw_messages (``bool``, *optional*):
+                Pass True to get lightweight records with the raw messages straight from the response instead of
+                fully parsed messages. Much faster when only ids, dates, texts and senders are needed.
+                Defaults to False.
+
         Returns:
-            ``Generator``: A generator yielding :obj:`~pyrogram.types.Message` objects.
+            ``Generator``: A generator yielding :obj:`~pyrogram.types.Message` objects, or ``RawMessage``
+            records from :mod:`pyrogram.utils` in case *raw_messages* is True.
 
         Example:
             .. code-block:: python
@@ -114,27 +131,38 @@ class SearchMessages:
         total = abs(limit) or (1 << 31) - 1
         limit = min(100, total)
 
-        while True:
-            messages = await get_chunk(
-                client=self,
-                chat_id=chat_id,
-                query=query,
-                filter=filter,
-                offset=offset,
-                limit=limit,
-                from_user=from_user,
-                thread_id=thread_id,
-            )
+        async def pages(offset: int):
+            fetched = 0
+
+            while fetched < total:
+                messages = await get_chunk(
+                    client=self,
+                    chat_id=chat_id,
+                    query=query,
+                    filter=filter,
+                    offset=offset,
+                    limit=limit,
+                    from_user=from_user,
+                    thread_id=thread_id,
+                    raw_messages=raw_messages,
+                )
+
+                if not messages:
+                    return
 
-            if not messages:
-                return
+                offset += len(messages)
+                fetched += len(messages)
 
-            offset += len(messages)
+                yield messages
 
-            for message in messages:
-                yield message
+        async with contextlib.aclosing(
+            utils.prefetch_pages(pages(offset), prefetch),
+        ) as chunks:
+            async for messages in chunks:
+                for message in messages:
+                    yield message
 
-                current += 1
+                    current += 1
 
-                if current >= total:
-                    return
+                    if current >= total:
+                        return
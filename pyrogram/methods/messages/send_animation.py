@@ -48,6 +48,7 @@ class SendAnimation:
         | types.ForceReply = None,
         progress: Callable | None = None,
         progress_args: tuple = (),
+        resume: bool = False,
     ) -> types.Message | None:
         """Send animation files (animation or H.264/MPEG-4 AVC video without sound).
 
@@ -164,6 +165,11 @@ class SendAnimation:
                 You can pass anything you need to be available in the progress callback scope; for example, a Message
                 object or a Client instance in order to edit the message with the updated progress status.
 
+            resume (``bool``, *optional*):
+                Pass True to resume an interrupted upload of the same file, even after a restart, uploading only
+                the parts still missing. See :meth:`~pyrogram.Client.save_file`.
+                Defaults to False.
+
         Other Parameters:
             current (``int``):
                 The amount of bytes transmitted so far.
@@ -220,6 +226,7 @@ class SendAnimation:
                         animation,
                         progress=progress,
                         progress_args=progress_args,
+                        resume=resume,
                     )
                     media = raw.types.InputMediaUploadedDocument(
                         mime_type=self.guess_mime_type(animation) or "video/mp4",
@@ -256,6 +263,7 @@ class SendAnimation:
                     animation,
                     progress=progress,
                     progress_args=progress_args,
+                    resume=resume,
                 )
                 media = raw.types.InputMediaUploadedDocument(
                     mime_type=self.guess_mime_type(file_name or animation.name)
@@ -316,6 +324,8 @@ class SendAnimation:
                         file_part=e.value,
                     )
                 else:
+                    await utils.finish_resumable_upload(self, file)
+
                     for i in r.updates:
                         if isinstance(
                             i,
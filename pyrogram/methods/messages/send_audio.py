@@ -45,6 +45,7 @@ class SendAudio:
         | types.ForceReply = None,
         progress: Callable | None = None,
         progress_args: tuple = (),
+        resume: bool = False,
     ) -> types.Message | None:
         """Send audio files.
 
@@ -153,6 +154,11 @@ class SendAudio:
                 You can pass anything you need to be available in the progress callback scope; for example, a Message
                 object or a Client instance in order to edit the message with the updated progress status.
 
+            resume (``bool``, *optional*):
+                Pass True to resume an interrupted upload of the same file, even after a restart, uploading only
+                the parts still missing. See :meth:`~pyrogram.Client.save_file`.
+                Defaults to False.
+
         Other Parameters:
             current (``int``):
                 The amount of bytes transmitted so far.
@@ -210,6 +216,7 @@ class SendAudio:
                         audio,
                         progress=progress,
                         progress_args=progress_args,
+                        resume=resume,
                     )
                     media = raw.types.InputMediaUploadedDocument(
                         mime_type=self.guess_mime_type(audio) or "audio/mpeg",
@@ -236,6 +243,7 @@ class SendAudio:
                     audio,
                     progress=progress,
                     progress_args=progress_args,
+                    resume=resume,
                 )
                 media = raw.types.InputMediaUploadedDocument(
                     mime_type=self.guess_mime_type(file_name or audio.name)
@@ -288,6 +296,8 @@ class SendAudio:
                 except FilePartMissing as e:
                     await self.save_file(audio, file_id=file.id, file_part=e.value)
                 else:
+                    await utils.finish_resumable_upload(self, file)
+
                     for i in r.updates:
                         if isinstance(
                             i,
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 import logging
 import re
 from pathlib import Path
@@ -126,8 +127,6 @@ class SendMediaGroup:
                     ]
                 )
         """
-        multi_media = []
-
         reply_to = await utils.get_reply_to(
             client=self,
             chat_id=chat_id,
@@ -140,11 +139,55 @@ class SendMediaGroup:
             parse_mode=parse_mode,
         )
 
-        for i in media:
-            if isinstance(i, types.InputMediaPhoto):
-                if isinstance(i.media, str):
-                    if Path(i.media).is_file():
-                        media = await self.invoke(
+        async def prepare(i) -> raw.types.InputSingleMedia:
+            async with self.save_file_semaphore:
+                if isinstance(i, types.InputMediaPhoto):
+                    if isinstance(i.media, str):
+                        if Path(i.media).is_file():
+                            input_media = await self.invoke(
+                                raw.functions.messages.UploadMedia(
+                                    peer=await self.resolve_peer(chat_id),
+                                    media=raw.types.InputMediaUploadedPhoto(
+                                        file=await self.save_file(i.media),
+                                        spoiler=i.has_spoiler,
+                                    ),
+                                ),
+                            )
+
+                            input_media = raw.types.InputMediaPhoto(
+                                id=raw.types.InputPhoto(
+                                    id=input_media.photo.id,
+                                    access_hash=input_media.photo.access_hash,
+                                    file_reference=input_media.photo.file_reference,
+                                ),
+                                spoiler=i.has_spoiler,
+                            )
+                        elif re.match("^https?://", i.media):
+                            input_media = await self.invoke(
+                                raw.functions.messages.UploadMedia(
+                                    peer=await self.resolve_peer(chat_id),
+                                    media=raw.types.InputMediaPhotoExternal(
+                                        url=i.media,
+                                        spoiler=i.has_spoiler,
+                                    ),
+                                ),
+                            )
+
+                            input_media = raw.types.InputMediaPhoto(
+                                id=raw.types.InputPhoto(
+                                    id=input_media.photo.id,
+                                    access_hash=input_media.photo.access_hash,
+                                    file_reference=input_media.photo.file_reference,
+                                ),
+                                spoiler=i.has_spoiler,
+                            )
+                        else:
+                            input_media = utils.get_input_media_from_file_id(
+                                i.media,
+                                FileType.PHOTO,
+                            )
+                    else:
+                        input_media = await self.invoke(
                             raw.functions.messages.UploadMedia(
                                 peer=await self.resolve_peer(chat_id),
                                 media=raw.types.InputMediaUploadedPhoto(
@@ -154,183 +197,203 @@ class SendMediaGroup:
                             ),
                         )
 
-                        media = raw.types.InputMediaPhoto(
+                        input_media = raw.types.InputMediaPhoto(
                             id=raw.types.InputPhoto(
-                                id=media.photo.id,
-                                access_hash=media.photo.access_hash,
-                                file_reference=media.photo.file_reference,
+                                id=input_media.photo.id,
+                                access_hash=input_media.photo.access_hash,
+                                file_reference=input_media.photo.file_reference,
                             ),
                             spoiler=i.has_spoiler,
                         )
-                    elif re.match("^https?://", i.media):
-                        media = await self.invoke(
-                            raw.functions.messages.UploadMedia(
-                                peer=await self.resolve_peer(chat_id),
-                                media=raw.types.InputMediaPhotoExternal(
-                                    url=i.media,
-                                    spoiler=i.has_spoiler,
+                elif isinstance(
+                    i,
+                    types.InputMediaVideo | types.InputMediaAnimation,
+                ):
+                    if isinstance(i.media, str):
+                        is_animation = False
+                        if Path(i.media).is_file():
+                            try:
+                                videoInfo = await self.loop.run_in_executor(
+                                    self.file_executor,
+                                    MediaInfo.parse,
+                                    i.media,
+                                )
+                            except OSError:
+                                is_animation = bool(
+                                    isinstance(i, types.InputMediaAnimation),
+                                )
+                            else:
+                                if not any(
+                                    track.track_type == "Audio"
+                                    for track in videoInfo.tracks
+                                ):
+                                    is_animation = True
+                            attributes = [
+                                raw.types.DocumentAttributeVideo(
+                                    supports_streaming=True
+                                    if is_animation
+                                    else (i.supports_streaming or None),
+                                    duration=i.duration,
+                                    w=i.width,
+                                    h=i.height,
                                 ),
-                            ),
-                        )
+                                raw.types.DocumentAttributeFilename(
+                                    file_name=Path(i.media).name,
+                                ),
+                            ]
+                            if is_animation:
+                                attributes.append(
+                                    raw.types.DocumentAttributeAnimated(),
+                                )
+                            input_media = await self.invoke(
+                                raw.functions.messages.UploadMedia(
+                                    peer=await self.resolve_peer(chat_id),
+                                    media=raw.types.InputMediaUploadedDocument(
+                                        file=await self.save_file(i.media),
+                                        thumb=await self.save_file(i.thumb),
+                                        spoiler=i.has_spoiler,
+                                        mime_type=self.guess_mime_type(i.media)
+                                        or "video/mp4",
+                                        nosound_video=is_animation,
+                                        attributes=attributes,
+                                    ),
+                                ),
+                            )
 
-                        media = raw.types.InputMediaPhoto(
-                            id=raw.types.InputPhoto(
-                                id=media.photo.id,
-                                access_hash=media.photo.access_hash,
-                                file_reference=media.photo.file_reference,
-                            ),
-                            spoiler=i.has_spoiler,
-                        )
-                    else:
-                        media = utils.get_input_media_from_file_id(
-                            i.media,
-                            FileType.PHOTO,
-                        )
-                else:
-                    media = await self.invoke(
-                        raw.functions.messages.UploadMedia(
-                            peer=await self.resolve_peer(chat_id),
-                            media=raw.types.InputMediaUploadedPhoto(
-                                file=await self.save_file(i.media),
+                            input_media = raw.types.InputMediaDocument(
+                                id=raw.types.InputDocument(
+                                    id=input_media.document.id,
+                                    access_hash=input_media.document.access_hash,
+                                    file_reference=input_media.document.file_reference,
+                                ),
                                 spoiler=i.has_spoiler,
-                            ),
-                        ),
-                    )
+                            )
+                        elif re.match("^https?://", i.media):
+                            input_media = await self.invoke(
+                                raw.functions.messages.UploadMedia(
+                                    peer=await self.resolve_peer(chat_id),
+                                    media=raw.types.InputMediaDocumentExternal(
+                                        url=i.media,
+                                        spoiler=i.has_spoiler,
+                                    ),
+                                ),
+                            )
 
-                    media = raw.types.InputMediaPhoto(
-                        id=raw.types.InputPhoto(
-                            id=media.photo.id,
-                            access_hash=media.photo.access_hash,
-                            file_reference=media.photo.file_reference,
-                        ),
-                        spoiler=i.has_spoiler,
-                    )
-            elif isinstance(i, types.InputMediaVideo | types.InputMediaAnimation):
-                if isinstance(i.media, str):
-                    is_animation = False
-                    if Path(i.media).is_file():
-                        try:
-                            videoInfo = MediaInfo.parse(i.media)
-                        except OSError:
-                            is_animation = bool(
-                                isinstance(i, types.InputMediaAnimation),
+                            input_media = raw.types.InputMediaDocument(
+                                id=raw.types.InputDocument(
+                                    id=input_media.document.id,
+                                    access_hash=input_media.document.access_hash,
+                                    file_reference=input_media.document.file_reference,
+                                ),
+                                spoiler=i.has_spoiler,
                             )
                         else:
-                            if not any(
-                                track.track_type == "Audio"
-                                for track in videoInfo.tracks
-                            ):
-                                is_animation = True
-                        attributes = [
-                            raw.types.DocumentAttributeVideo(
-                                supports_streaming=True
-                                if is_animation
-                                else (i.supports_streaming or None),
-                                duration=i.duration,
-                                w=i.width,
-                                h=i.height,
-                            ),
-                            raw.types.DocumentAttributeFilename(
-                                file_name=Path(i.media).name,
-                            ),
-                        ]
-                        if is_animation:
-                            attributes.append(raw.types.DocumentAttributeAnimated())
-                        media = await self.invoke(
+                            input_media = utils.get_input_media_from_file_id(
+                                i.media,
+                                FileType.VIDEO,
+                            )
+                    else:
+                        input_media = await self.invoke(
                             raw.functions.messages.UploadMedia(
                                 peer=await self.resolve_peer(chat_id),
                                 media=raw.types.InputMediaUploadedDocument(
                                     file=await self.save_file(i.media),
                                     thumb=await self.save_file(i.thumb),
                                     spoiler=i.has_spoiler,
-                                    mime_type=self.guess_mime_type(i.media)
+                                    mime_type=self.guess_mime_type(
+                                        getattr(i.media, "name", "video.mp4"),
+                                    )
                                     or "video/mp4",
-                                    nosound_video=is_animation,
-                                    attributes=attributes,
+                                    attributes=[
+                                        raw.types.DocumentAttributeVideo(
+                                            supports_streaming=i.supports_streaming
+                                            or None,
+                                            duration=i.duration,
+                                            w=i.width,
+                                            h=i.height,
+                                        ),
+                                        raw.types.DocumentAttributeFilename(
+                                            file_name=getattr(
+                                                i.media,
+                                                "name",
+                                                "video.mp4",
+                                            ),
+                                        ),
+                                    ],
                                 ),
                             ),
                         )
 
-                        media = raw.types.InputMediaDocument(
+                        input_media = raw.types.InputMediaDocument(
                             id=raw.types.InputDocument(
-                                id=media.document.id,
-                                access_hash=media.document.access_hash,
-                                file_reference=media.document.file_reference,
+                                id=input_media.document.id,
+                                access_hash=input_media.document.access_hash,
+                                file_reference=input_media.document.file_reference,
                             ),
                             spoiler=i.has_spoiler,
                         )
-                    elif re.match("^https?://", i.media):
-                        media = await self.invoke(
-                            raw.functions.messages.UploadMedia(
-                                peer=await self.resolve_peer(chat_id),
-                                media=raw.types.InputMediaDocumentExternal(
-                                    url=i.media,
-                                    spoiler=i.has_spoiler,
+                elif isinstance(i, types.InputMediaAudio):
+                    if isinstance(i.media, str):
+                        if Path(i.media).is_file():
+                            input_media = await self.invoke(
+                                raw.functions.messages.UploadMedia(
+                                    peer=await self.resolve_peer(chat_id),
+                                    media=raw.types.InputMediaUploadedDocument(
+                                        mime_type=self.guess_mime_type(i.media)
+                                        or "audio/mpeg",
+                                        file=await self.save_file(i.media),
+                                        thumb=await self.save_file(i.thumb),
+                                        attributes=[
+                                            raw.types.DocumentAttributeAudio(
+                                                duration=i.duration,
+                                                performer=i.performer,
+                                                title=i.title,
+                                            ),
+                                            raw.types.DocumentAttributeFilename(
+                                                file_name=Path(i.media).name,
+                                            ),
+                                        ],
+                                    ),
                                 ),
-                            ),
-                        )
+                            )
 
-                        media = raw.types.InputMediaDocument(
-                            id=raw.types.InputDocument(
-                                id=media.document.id,
-                                access_hash=media.document.access_hash,
-                                file_reference=media.document.file_reference,
-                            ),
-                            spoiler=i.has_spoiler,
-                        )
-                    else:
-                        media = utils.get_input_media_from_file_id(
-                            i.media,
-                            FileType.VIDEO,
-                        )
-                else:
-                    media = await self.invoke(
-                        raw.functions.messages.UploadMedia(
-                            peer=await self.resolve_peer(chat_id),
-                            media=raw.types.InputMediaUploadedDocument(
-                                file=await self.save_file(i.media),
-                                thumb=await self.save_file(i.thumb),
-                                spoiler=i.has_spoiler,
-                                mime_type=self.guess_mime_type(
-                                    getattr(i.media, "name", "video.mp4"),
-                                )
-                                or "video/mp4",
-                                attributes=[
-                                    raw.types.DocumentAttributeVideo(
-                                        supports_streaming=i.supports_streaming
-                                        or None,
-                                        duration=i.duration,
-                                        w=i.width,
-                                        h=i.height,
-                                    ),
-                                    raw.types.DocumentAttributeFilename(
-                                        file_name=getattr(
-                                            i.media,
-                                            "name",
-                                            "video.mp4",
-                                        ),
+                            input_media = raw.types.InputMediaDocument(
+                                id=raw.types.InputDocument(
+                                    id=input_media.document.id,
+                                    access_hash=input_media.document.access_hash,
+                                    file_reference=input_media.document.file_reference,
+                                ),
+                            )
+                        elif re.match("^https?://", i.media):
+                            input_media = await self.invoke(
+                                raw.functions.messages.UploadMedia(
+                                    peer=await self.resolve_peer(chat_id),
+                                    media=raw.types.InputMediaDocumentExternal(
+                                        url=i.media,
                                     ),
-                                ],
-                            ),
-                        ),
-                    )
+                                ),
+                            )
 
-                    media = raw.types.InputMediaDocument(
-                        id=raw.types.InputDocument(
-                            id=media.document.id,
-                            access_hash=media.document.access_hash,
-                            file_reference=media.document.file_reference,
-                        ),
-                        spoiler=i.has_spoiler,
-                    )
-            elif isinstance(i, types.InputMediaAudio):
-                if isinstance(i.media, str):
-                    if Path(i.media).is_file():
-                        media = await self.invoke(
+                            input_media = raw.types.InputMediaDocument(
+                                id=raw.types.InputDocument(
+                                    id=input_media.document.id,
+                                    access_hash=input_media.document.access_hash,
+                                    file_reference=input_media.document.file_reference,
+                                ),
+                            )
+                        else:
+                            input_media = utils.get_input_media_from_file_id(
+                                i.media,
+                                FileType.AUDIO,
+                            )
+                    else:
+                        input_media = await self.invoke(
                             raw.functions.messages.UploadMedia(
                                 peer=await self.resolve_peer(chat_id),
                                 media=raw.types.InputMediaUploadedDocument(
-                                    mime_type=self.guess_mime_type(i.media)
+                                    mime_type=self.guess_mime_type(
+                                        getattr(i.media, "name", "audio.mp3"),
+                                    )
                                     or "audio/mpeg",
                                     file=await self.save_file(i.media),
                                     thumb=await self.save_file(i.thumb),
@@ -341,171 +404,118 @@ class SendMediaGroup:
                                             title=i.title,
                                         ),
                                         raw.types.DocumentAttributeFilename(
-                                            file_name=Path(i.media).name,
+                                            file_name=getattr(
+                                                i.media,
+                                                "name",
+                                                "audio.mp3",
+                                            ),
                                         ),
                                     ],
                                 ),
                             ),
                         )
 
-                        media = raw.types.InputMediaDocument(
+                        input_media = raw.types.InputMediaDocument(
                             id=raw.types.InputDocument(
-                                id=media.document.id,
-                                access_hash=media.document.access_hash,
-                                file_reference=media.document.file_reference,
+                                id=input_media.document.id,
+                                access_hash=input_media.document.access_hash,
+                                file_reference=input_media.document.file_reference,
                             ),
                         )
-                    elif re.match("^https?://", i.media):
-                        media = await self.invoke(
-                            raw.functions.messages.UploadMedia(
-                                peer=await self.resolve_peer(chat_id),
-                                media=raw.types.InputMediaDocumentExternal(
-                                    url=i.media,
+                elif isinstance(i, types.InputMediaDocument):
+                    if isinstance(i.media, str):
+                        if Path(i.media).is_file():
+                            input_media = await self.invoke(
+                                raw.functions.messages.UploadMedia(
+                                    peer=await self.resolve_peer(chat_id),
+                                    media=raw.types.InputMediaUploadedDocument(
+                                        mime_type=self.guess_mime_type(i.media)
+                                        or "application/zip",
+                                        file=await self.save_file(i.media),
+                                        thumb=await self.save_file(i.thumb),
+                                        attributes=[
+                                            raw.types.DocumentAttributeFilename(
+                                                file_name=Path(i.media).name,
+                                            ),
+                                        ],
+                                    ),
                                 ),
-                            ),
-                        )
+                            )
 
-                        media = raw.types.InputMediaDocument(
-                            id=raw.types.InputDocument(
-                                id=media.document.id,
-                                access_hash=media.document.access_hash,
-                                file_reference=media.document.file_reference,
-                            ),
-                        )
-                    else:
-                        media = utils.get_input_media_from_file_id(
-                            i.media,
-                            FileType.AUDIO,
-                        )
-                else:
-                    media = await self.invoke(
-                        raw.functions.messages.UploadMedia(
-                            peer=await self.resolve_peer(chat_id),
-                            media=raw.types.InputMediaUploadedDocument(
-                                mime_type=self.guess_mime_type(
-                                    getattr(i.media, "name", "audio.mp3"),
-                                )
-                                or "audio/mpeg",
-                                file=await self.save_file(i.media),
-                                thumb=await self.save_file(i.thumb),
-                                attributes=[
-                                    raw.types.DocumentAttributeAudio(
-                                        duration=i.duration,
-                                        performer=i.performer,
-                                        title=i.title,
-                                    ),
-                                    raw.types.DocumentAttributeFilename(
-                                        file_name=getattr(
-                                            i.media,
-                                            "name",
-                                            "audio.mp3",
-                                        ),
+                            input_media = raw.types.InputMediaDocument(
+                                id=raw.types.InputDocument(
+                                    id=input_media.document.id,
+                                    access_hash=input_media.document.access_hash,
+                                    file_reference=input_media.document.file_reference,
+                                ),
+                            )
+                        elif re.match("^https?://", i.media):
+                            input_media = await self.invoke(
+                                raw.functions.messages.UploadMedia(
+                                    peer=await self.resolve_peer(chat_id),
+                                    media=raw.types.InputMediaDocumentExternal(
+                                        url=i.media,
                                     ),
-                                ],
-                            ),
-                        ),
-                    )
+                                ),
+                            )
 
-                    media = raw.types.InputMediaDocument(
-                        id=raw.types.InputDocument(
-                            id=media.document.id,
-                            access_hash=media.document.access_hash,
-                            file_reference=media.document.file_reference,
-                        ),
-                    )
-            elif isinstance(i, types.InputMediaDocument):
-                if isinstance(i.media, str):
-                    if Path(i.media).is_file():
-                        media = await self.invoke(
+                            input_media = raw.types.InputMediaDocument(
+                                id=raw.types.InputDocument(
+                                    id=input_media.document.id,
+                                    access_hash=input_media.document.access_hash,
+                                    file_reference=input_media.document.file_reference,
+                                ),
+                            )
+                        else:
+                            input_media = utils.get_input_media_from_file_id(
+                                i.media,
+                                FileType.DOCUMENT,
+                            )
+                    else:
+                        input_media = await self.invoke(
                             raw.functions.messages.UploadMedia(
                                 peer=await self.resolve_peer(chat_id),
                                 media=raw.types.InputMediaUploadedDocument(
-                                    mime_type=self.guess_mime_type(i.media)
+                                    mime_type=self.guess_mime_type(
+                                        getattr(i.media, "name", "file.zip"),
+                                    )
                                     or "application/zip",
                                     file=await self.save_file(i.media),
                                     thumb=await self.save_file(i.thumb),
                                     attributes=[
                                         raw.types.DocumentAttributeFilename(
-                                            file_name=Path(i.media).name,
+                                            file_name=getattr(
+                                                i.media,
+                                                "name",
+                                                "file.zip",
+                                            ),
                                         ),
                                     ],
                                 ),
                             ),
                         )
 
-                        media = raw.types.InputMediaDocument(
+                        input_media = raw.types.InputMediaDocument(
                             id=raw.types.InputDocument(
-                                id=media.document.id,
-                                access_hash=media.document.access_hash,
-                                file_reference=media.document.file_reference,
-                            ),
-                        )
-                    elif re.match("^https?://", i.media):
-                        media = await self.invoke(
-                            raw.functions.messages.UploadMedia(
-                                peer=await self.resolve_peer(chat_id),
-                                media=raw.types.InputMediaDocumentExternal(
-                                    url=i.media,
-                                ),
+                                id=input_media.document.id,
+                                access_hash=input_media.document.access_hash,
+                                file_reference=input_media.document.file_reference,
                             ),
                         )
-
-                        media = raw.types.InputMediaDocument(
-                            id=raw.types.InputDocument(
-                                id=media.document.id,
-                                access_hash=media.document.access_hash,
-                                file_reference=media.document.file_reference,
-                            ),
-                        )
-                    else:
-                        media = utils.get_input_media_from_file_id(
-                            i.media,
-                            FileType.DOCUMENT,
-                        )
                 else:
-                    media = await self.invoke(
-                        raw.functions.messages.UploadMedia(
-                            peer=await self.resolve_peer(chat_id),
-                            media=raw.types.InputMediaUploadedDocument(
-                                mime_type=self.guess_mime_type(
-                                    getattr(i.media, "name", "file.zip"),
-                                )
-                                or "application/zip",
-                                file=await self.save_file(i.media),
-                                thumb=await self.save_file(i.thumb),
-                                attributes=[
-                                    raw.types.DocumentAttributeFilename(
-                                        file_name=getattr(
-                                            i.media,
-                                            "name",
-                                            "file.zip",
-                                        ),
-                                    ),
-                                ],
-                            ),
-                        ),
-                    )
-
-                    media = raw.types.InputMediaDocument(
-                        id=raw.types.InputDocument(
-                            id=media.document.id,
-                            access_hash=media.document.access_hash,
-                            file_reference=media.document.file_reference,
-                        ),
+                    raise ValueError(
+                        f"{i.__class__.__name__} is not a supported type for send_media_group",
                     )
-            else:
-                raise ValueError(
-                    f"{i.__class__.__name__} is not a supported type for send_media_group",
-                )
 
-            multi_media.append(
-                raw.types.InputSingleMedia(
-                    media=media,
-                    random_id=self.rnd_id(),
-                    **await self.parser.parse(i.caption, i.parse_mode),
-                ),
+            return raw.types.InputSingleMedia(
+                media=input_media,
+                random_id=self.rnd_id(),
+                **await self.parser.parse(i.caption, i.parse_mode),
             )
 
+        # Items are uploaded concurrently, gather keeps them in the album order
+        multi_media = await asyncio.gather(*(prepare(i) for i in media))
+
         rpc = raw.functions.messages.SendMultiMedia(
             peer=await self.resolve_peer(chat_id),
             multi_media=multi_media,
@@ -6,7 +6,11 @@ from typing import TYPE_CHECKING, BinaryIO
 
 import pyrogram
 from pyrogram import enums, raw, types, utils
-from pyrogram.errors import FilePartMissing
+from pyrogram.errors import (
+    FilePartMissing,
+    FileReferenceExpired,
+    FileReferenceInvalid,
+)
 from pyrogram.file_id import FileType
 
 if TYPE_CHECKING:
@@ -191,7 +195,16 @@ class SendPhoto:
         )
 
         try:
-            if isinstance(photo, str):
+            cache_key = await utils.get_upload_cache_key(self, photo, "photo")
+            cached = await utils.get_cached_media(self, cache_key)
+
+            if cached is not None:
+                media = raw.types.InputMediaPhoto(
+                    id=cached,
+                    ttl_seconds=(1 << 31) - 1 if view_once else ttl_seconds,
+                    spoiler=has_spoiler,
+                )
+            elif isinstance(photo, str):
                 if Path(photo).is_file():
                     file = await self.save_file(
                         photo,
@@ -262,7 +275,19 @@ class SendPhoto:
                         r = await self.invoke(rpc)
                 except FilePartMissing as e:
                     await self.save_file(photo, file_id=file.id, file_part=e.value)
+                except (FileReferenceExpired, FileReferenceInvalid):
+                    # Cached media get a fresh file reference, only once
+                    if cached is None:
+                        raise
+
+                    cached = None
+                    media.id = await utils.refresh_cached_media(self, cache_key)
+
+                    if media.id is None:
+                        raise
                 else:
+                    await utils.cache_sent_media(self, cache_key, r)
+
                     for i in r.updates:
                         if isinstance(
                             i,
@@ -6,7 +6,11 @@ from typing import TYPE_CHECKING, BinaryIO
 
 import pyrogram
 from pyrogram import StopTransmissionError, enums, raw, types, utils
-from pyrogram.errors import FilePartMissing
+from pyrogram.errors import (
+    FilePartMissing,
+    FileReferenceExpired,
+    FileReferenceInvalid,
+)
 from pyrogram.file_id import FileType
 
 if TYPE_CHECKING:
@@ -49,6 +53,7 @@ class SendVideo:
         | types.ForceReply = None,
         progress: Callable | None = None,
         progress_args: tuple = (),
+        resume: bool = False,
     ) -> types.Message | None:
         """Send video files.
 
@@ -170,6 +175,11 @@ class SendVideo:
                 You can pass anything you need to be available in the progress callback scope; for example, a Message
                 object or a Client instance in order to edit the message with the updated progress status.
 
+            resume (``bool``, *optional*):
+                Pass True to resume an interrupted upload of the same file, even after a restart, uploading only
+                the parts still missing. See :meth:`~pyrogram.Client.save_file`.
+                Defaults to False.
+
         Other Parameters:
             current (``int``):
                 The amount of bytes transmitted so far.
@@ -218,13 +228,33 @@ class SendVideo:
         )
 
         try:
-            if isinstance(video, str):
+            cache_key = await utils.get_upload_cache_key(
+                self,
+                video,
+                "video",
+                duration,
+                width,
+                height,
+                supports_streaming,
+                file_name or getattr(video, "name", None),
+                thumb=thumb,
+            )
+            cached = await utils.get_cached_media(self, cache_key)
+
+            if cached is not None:
+                media = raw.types.InputMediaDocument(
+                    id=cached,
+                    ttl_seconds=ttl_seconds,
+                    spoiler=has_spoiler,
+                )
+            elif isinstance(video, str):
                 if Path(video).is_file():
                     thumb = await self.save_file(thumb)
                     file = await self.save_file(
                         video,
                         progress=progress,
                         progress_args=progress_args,
+                        resume=resume,
                     )
                     media = raw.types.InputMediaUploadedDocument(
                         mime_type=self.guess_mime_type(video) or "video/mp4",
@@ -263,6 +293,7 @@ class SendVideo:
                     video,
                     progress=progress,
                     progress_args=progress_args,
+                    resume=resume,
                 )
                 media = raw.types.InputMediaUploadedDocument(
                     mime_type=self.guess_mime_type(file_name or video.name)
@@ -318,7 +349,21 @@ class SendVideo:
                         r = await self.invoke(rpc)
                 except FilePartMissing as e:
                     await self.save_file(video, file_id=file.id, file_part=e.value)
+                except (FileReferenceExpired, FileReferenceInvalid):
+                    # Cached media get a fresh file reference, only once
+                    if cached is None:
+                        raise
+
+                    cached = None
+                    media.id = await utils.refresh_cached_media(self, cache_key)
+
+                    if media.id is None:
+                        raise
                 else:
+                    await utils.cache_sent_media(self, cache_key, r)
+
+                    await utils.finish_resumable_upload(self, file)
+
                     for i in r.updates:
                         if isinstance(
                             i,
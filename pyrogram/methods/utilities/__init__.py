@@ -1,25 +1,35 @@
 from __future__ import annotations
 
 from .add_handler import AddHandler
+from .ask import Ask
 from .export_session_string import ExportSessionString
+from .get_listeners_count import GetListenersCount
+from .listen import Listen
 from .remove_handler import RemoveHandler
 from .restart import Restart
 from .run import Run
 from .run_sync import RunSync
 from .start import Start
 from .stop import Stop
+from .stop_listening import StopListening
 from .stop_transmission import StopTransmissionError
+from .wait_for_message import WaitForMessage
 
 
 class Utilities(
     AddHandler,
+    Ask,
     ExportSessionString,
+    GetListenersCount,
+    Listen,
     RemoveHandler,
     Restart,
     Run,
     RunSync,
     Start,
     Stop,
+    StopListening,
     StopTransmissionError,
+    WaitForMessage,
 ):
     pass
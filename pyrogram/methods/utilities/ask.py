@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pyrogram
+
+if TYPE_CHECKING:
+    from pyrogram.filters import Filter
+
+
+class Ask:
+    async def ask(
+        self: pyrogram.Client,
+        chat_id: int | str,
+        text: str,
+        filters: Filter | None = None,
+        listener_type: pyrogram.enums.ListenerTypes = pyrogram.enums.ListenerTypes.MESSAGE,
+        timeout: float | None = None,
+        unallowed_click_alert: str | bool = True,
+        user_id: int | str | list[int | str] | None = None,
+        message_id: int | None = None,
+        message_thread_id: int | None = None,
+        **kwargs,
+    ) -> pyrogram.types.Message | pyrogram.types.CallbackQuery:
+        """Send a text message and wait for the answer.
+
+        The listener is registered before the message is sent, so fast answers can't be missed.
+
+        .. include:: /_includes/usable-by/users-bots.rst
+
+        Parameters:
+            chat_id (``int`` | ``str``):
+                Unique identifier (int) or username (str) of the target chat.
+
+            text (``str``):
+                Text of the message to be sent.
+
+            filters (:obj:`Filters`, *optional*):
+                Pass one or more filters the answer must pass.
+
+            listener_type (:obj:`~pyrogram.enums.ListenerTypes`, *optional*):
+                The kind of update to wait for.
+                Defaults to :obj:`~pyrogram.enums.ListenerTypes.MESSAGE`.
+
+            timeout (``float``, *optional*):
+                Maximum amount of seconds to wait for.
+
+            unallowed_click_alert (``str`` | ``bool``, *optional*):
+                Alert shown to users not listed in *user_id* who click a button of *message_id*.
+
+            user_id (``int`` | ``str`` | List of ``int`` or ``str``, *optional*):
+                One or more users the answer must come from.
+
+            message_id (``int``, *optional*):
+                Identifier of the message whose buttons must be clicked.
+
+            message_thread_id (``int``, *optional*):
+                Unique identifier of the forum topic to send to and listen in.
+
+            **kwargs (``any``, *optional*):
+                Extra arguments passed to :meth:`~pyrogram.Client.send_message`.
+
+        Returns:
+            :obj:`~pyrogram.types.Message` | :obj:`~pyrogram.types.CallbackQuery`: The answer, with the sent message
+            stored in its *request* attribute.
+
+        Raises:
+            asyncio.TimeoutError: In case no answer is received within the timeout.
+
+        Example:
+            .. code-block:: python
+
+                answer = await app.ask(chat_id, "What is your name?", timeout=60)
+                print(answer.text)
+        """
+        listener = await self._create_listener(
+            filters=filters,
+            listener_type=listener_type,
+            timeout=timeout,
+            unallowed_click_alert=unallowed_click_alert,
+            chat_id=chat_id,
+            user_id=user_id,
+            message_id=message_id,
+            message_thread_id=message_thread_id,
+        )
+
+        try:
+            request = await self.send_message(
+                chat_id,
+                text,
+                message_thread_id=message_thread_id,
+                **kwargs,
+            )
+        except BaseException:
+            listener.future.cancel()
+            raise
+
+        response = await listener.future
+        response.request = request
+
+        return response
@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import pyrogram
+
+
+class GetListenersCount:
+    def get_listeners_count(
+        self: pyrogram.Client,
+        listener_type: pyrogram.enums.ListenerTypes | None = None,
+    ) -> int:
+        """Get the number of listeners still waiting for an update.
+
+        Parameters:
+            listener_type (:obj:`~pyrogram.enums.ListenerTypes`, *optional*):
+                Count only the listeners of this type.
+                Defaults to None (all types).
+
+        Returns:
+            ``int``: The number of pending listeners.
+
+        Example:
+            .. code-block:: python
+
+                print(app.get_listeners_count())
+        """
+        return self.dispatcher.conversation_handler.count(listener_type)
@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pyrogram
+from pyrogram import raw, utils
+from pyrogram.handlers.conversation_handler import Listener
+
+if TYPE_CHECKING:
+    from pyrogram.filters import Filter
+
+
+class Listen:
+    async def listen(
+        self: pyrogram.Client,
+        filters: Filter | None = None,
+        listener_type: pyrogram.enums.ListenerTypes = pyrogram.enums.ListenerTypes.MESSAGE,
+        timeout: float | None = None,
+        unallowed_click_alert: str | bool = True,
+        chat_id: int | str | None = None,
+        user_id: int | str | list[int | str] | None = None,
+        message_id: int | None = None,
+        message_thread_id: int | None = None,
+    ) -> pyrogram.types.Message | pyrogram.types.CallbackQuery:
+        """Wait for the next update matching the given chat, user, thread and filters.
+
+        Incoming updates are offered to pending listeners before being passed to the registered handlers: an update
+        consumed by a listener skips the handlers of group 0, those of the other groups still handle it.
+
+        .. include:: /_includes/usable-by/users-bots.rst
+
+        Parameters:
+            filters (:obj:`Filters`, *optional*):
+                Pass one or more filters the update must pass.
+
+            listener_type (:obj:`~pyrogram.enums.ListenerTypes`, *optional*):
+                The kind of update to wait for.
+                Defaults to :obj:`~pyrogram.enums.ListenerTypes.MESSAGE`.
+
+            timeout (``float``, *optional*):
+                Maximum amount of seconds to wait for.
+                Defaults to None (no timeout).
+
+            unallowed_click_alert (``str`` | ``bool``, *optional*):
+                Alert shown to users not listed in *user_id* who click a button of *message_id*.
+                Pass False to silently ignore their clicks.
+
+            chat_id (``int`` | ``str``, *optional*):
+                Unique identifier (int) or username (str) of the target chat.
+
+            user_id (``int`` | ``str`` | List of ``int`` or ``str``, *optional*):
+                One or more users the update must come from.
+
+            message_id (``int``, *optional*):
+                Identifier of the message whose buttons must be clicked.
+                Only applicable to :obj:`~pyrogram.enums.ListenerTypes.CALLBACK_QUERY`.
+
+            message_thread_id (``int``, *optional*):
+                Unique identifier of the forum topic the update must belong to.
+
+        Returns:
+            :obj:`~pyrogram.types.Message` | :obj:`~pyrogram.types.CallbackQuery`: The update that was received.
+
+        Raises:
+            asyncio.TimeoutError: In case no update is received within the timeout.
+
+        Example:
+            .. code-block:: python
+
+                answer = await app.listen(chat_id=chat_id, user_id=user_id, timeout=60)
+        """
+        listener = await self._create_listener(
+            filters=filters,
+            listener_type=listener_type,
+            timeout=timeout,
+            unallowed_click_alert=unallowed_click_alert,
+            chat_id=chat_id,
+            user_id=user_id,
+            message_id=message_id,
+            message_thread_id=message_thread_id,
+        )
+
+        return await listener.future
+
+    async def _create_listener(
+        self: pyrogram.Client,
+        filters: Filter | None = None,
+        listener_type: pyrogram.enums.ListenerTypes = pyrogram.enums.ListenerTypes.MESSAGE,
+        timeout: float | None = None,
+        unallowed_click_alert: str | bool = True,
+        chat_id: int | str | None = None,
+        user_id: int | str | list[int | str] | None = None,
+        message_id: int | None = None,
+        message_thread_id: int | None = None,
+    ) -> Listener:
+        if user_id is not None and not isinstance(user_id, list):
+            user_id = [user_id]
+
+        listener = Listener(
+            listener_type=listener_type,
+            future=self.loop.create_future(),
+            filters=filters,
+            chat_id=await self._get_listener_peer_id(chat_id),
+            user_ids=(
+                [await self._get_listener_peer_id(i) for i in user_id]
+                if user_id
+                else None
+            ),
+            message_id=message_id,
+            message_thread_id=message_thread_id,
+            unallowed_click_alert=unallowed_click_alert,
+            deadline=self.loop.time() + timeout if timeout is not None else None,
+        )
+
+        self.dispatcher.conversation_handler.add_listener(listener)
+
+        return listener
+
+    async def _get_listener_peer_id(
+        self: pyrogram.Client,
+        peer_id: int | str | None,
+    ) -> int | None:
+        if peer_id is None or isinstance(peer_id, int):
+            return peer_id
+
+        peer = await self.resolve_peer(peer_id)
+
+        if isinstance(peer, raw.types.InputPeerSelf):
+            return self.me.id
+
+        if isinstance(peer, raw.types.InputPeerUser | raw.types.InputUser):
+            return peer.user_id
+
+        if isinstance(peer, raw.types.InputPeerChat):
+            return -peer.chat_id
+
+        return utils.get_channel_id(peer.channel_id)
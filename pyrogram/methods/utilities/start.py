@@ -49,7 +49,9 @@ class Start:
                 ).id
                 log.info("Takeout session %s initiated", self.takeout_id)
 
-            await self.invoke(raw.functions.updates.GetState())
+            self.sequencer.set_state(
+                await self.invoke(raw.functions.updates.GetState()),
+            )
         except (Exception, KeyboardInterrupt):
             await self.disconnect()
             raise
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import pyrogram
+
+
+class StopListening:
+    async def stop_listening(
+        self: pyrogram.Client,
+        listener_type: pyrogram.enums.ListenerTypes = pyrogram.enums.ListenerTypes.MESSAGE,
+        chat_id: int | str | None = None,
+        user_id: int | str | list[int | str] | None = None,
+        message_id: int | None = None,
+        message_thread_id: int | None = None,
+    ) -> int:
+        """Cancel the pending listeners matching the given chat, user, message and thread.
+
+        Awaiting :meth:`~pyrogram.Client.listen` calls of the cancelled listeners raise
+        :obj:`asyncio.CancelledError`.
+
+        .. include:: /_includes/usable-by/users-bots.rst
+
+        Parameters:
+            listener_type (:obj:`~pyrogram.enums.ListenerTypes`, *optional*):
+                The kind of listeners to cancel.
+                Defaults to :obj:`~pyrogram.enums.ListenerTypes.MESSAGE`.
+
+            chat_id (``int`` | ``str``, *optional*):
+                Cancel only the listeners of this chat.
+
+            user_id (``int`` | ``str`` | List of ``int`` or ``str``, *optional*):
+                Cancel only the listeners waiting for these users.
+
+            message_id (``int``, *optional*):
+                Cancel only the listeners waiting for clicks on this message.
+
+            message_thread_id (``int``, *optional*):
+                Cancel only the listeners of this forum topic.
+
+        Returns:
+            ``int``: The number of cancelled listeners.
+
+        Example:
+            .. code-block:: python
+
+                await app.stop_listening(chat_id=chat_id)
+        """
+        if user_id is not None and not isinstance(user_id, list):
+            user_id = [user_id]
+
+        chat_id = await self._get_listener_peer_id(chat_id)
+        user_ids = (
+            {await self._get_listener_peer_id(i) for i in user_id}
+            if user_id
+            else None
+        )
+
+        cancelled = 0
+
+        for listener in self.dispatcher.conversation_handler.get_listeners(
+            listener_type,
+        ):
+            if (
+                (chat_id is not None and listener.chat_id != chat_id)
+                or (
+                    user_ids is not None
+                    and not user_ids.intersection(listener.user_ids or ())
+                )
+                or (message_id is not None and listener.message_id != message_id)
+                or (
+                    message_thread_id is not None
+                    and listener.message_thread_id != message_thread_id
+                )
+            ):
+                continue
+
+            # Listeners that just got their update or were cancelled are only removed on the next loop iteration
+            if listener.future.cancel():
+                cancelled += 1
+
+        return cancelled
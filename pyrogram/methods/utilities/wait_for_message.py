@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import pyrogram
+    from pyrogram.filters import Filter
+
+
+class WaitForMessage:
+    async def wait_for_message(
+        self: pyrogram.Client,
+        chat_id: int | str,
+        filters: Filter | None = None,
+        timeout: float | None = None,
+    ) -> pyrogram.types.Message:
+        """Wait for the next message in a chat.
+
+        Shortcut for :meth:`~pyrogram.Client.listen` with a :obj:`~pyrogram.enums.ListenerTypes.MESSAGE` listener.
+
+        .. include:: /_includes/usable-by/users-bots.rst
+
+        Parameters:
+            chat_id (``int`` | ``str``):
+                Unique identifier (int) or username (str) of the target chat.
+
+            filters (:obj:`Filters`, *optional*):
+                Pass one or more filters the message must pass.
+
+            timeout (``float``, *optional*):
+                Maximum amount of seconds to wait for.
+
+        Returns:
+            :obj:`~pyrogram.types.Message`: The message that was received.
+
+        Raises:
+            asyncio.TimeoutError: In case no message is received within the timeout.
+
+        Example:
+            .. code-block:: python
+
+                message = await app.wait_for_message(chat_id, timeout=60)
+        """
+        return await self.listen(filters=filters, timeout=timeout, chat_id=chat_id)
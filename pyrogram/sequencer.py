@@ -0,0 +1,444 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import TYPE_CHECKING
+
+from pyrogram import errors, raw, utils
+
+if TYPE_CHECKING:
+    import pyrogram
+
+log = logging.getLogger(__name__)
+
+COMMON_BOX = 0
+
+
+class UpdatesSequencer:
+    """Keeps updates in pts order and fills the gaps between them.
+
+    Telegram numbers the updates of the common message box and of every channel with a *pts* counter: an update
+    carrying ``pts`` and ``pts_count`` can only be applied if the local pts plus ``pts_count`` equals ``pts``.
+    Updates that are already applied are dropped, updates arriving too early are buffered for
+    :attr:`GAP_TIMEOUT` seconds waiting for the missing ones, after which the gap is filled with
+    ``updates.getDifference`` or ``updates.getChannelDifference``.
+
+    Updates returned by API calls are never dispatched, but they advance the local state through :meth:`confirm`
+    so that they are not mistaken for gaps.
+    """
+
+    GAP_TIMEOUT = 0.5
+    CHANNEL_DIFFERENCE_LIMIT = 100
+
+    def __init__(self, client: pyrogram.Client) -> None:
+        self.client = client
+        self.pts = {}
+        self.qts = None
+        self.seq = None
+        self.date = None
+        self.pending = {}
+        self.gap_tasks = {}
+        # Boxes whose difference has to be fetched even if no buffered update is waiting for it
+        self.too_long = set()
+        self.stats = {
+            "applied": 0,
+            "duplicates": 0,
+            "gaps": 0,
+            "differences": 0,
+            "local_messages": 0,
+            "fallback_messages": 0,
+        }
+
+    def set_state(self, state: raw.types.updates.State) -> None:
+        self.pts[COMMON_BOX] = state.pts
+        self.qts = state.qts
+        self.seq = state.seq
+        self.date = state.date
+
+    def set_seq(self, seq: int | None, date: int | None) -> None:
+        if seq:
+            self.seq = seq
+
+        if date:
+            self.date = date
+
+    @staticmethod
+    def get_box(update) -> int:
+        channel_id = getattr(
+            getattr(getattr(update, "message", None), "peer_id", None),
+            "channel_id",
+            None,
+        ) or getattr(update, "channel_id", None)
+
+        return channel_id or COMMON_BOX
+
+    def get_stats(self) -> dict:
+        stats = dict(self.stats)
+        materialized = stats["local_messages"] + stats["fallback_messages"]
+        stats["local_ratio"] = (
+            stats["local_messages"] / materialized if materialized else 0.0
+        )
+
+        return stats
+
+    def materialize(
+        self,
+        updates: raw.types.UpdateShortMessage | raw.types.UpdateShortChatMessage,
+    ) -> tuple | None:
+        """Build the message of a short update from the cached peers.
+
+        Returns None if any of the peers the message refers to is not cached, in which case the message has to be
+        fetched with ``updates.getDifference``.
+        """
+        me = self.client.me
+
+        if updates.out and me is None:
+            self.stats["fallback_messages"] += 1
+            return None
+
+        if isinstance(updates, raw.types.UpdateShortMessage):
+            sender_id = me.id if updates.out else updates.user_id
+            peer = raw.types.PeerUser(user_id=updates.user_id)
+        else:
+            sender_id = updates.from_id
+            peer = raw.types.PeerChat(chat_id=updates.chat_id)
+
+        from_id = raw.types.PeerUser(user_id=sender_id)
+        peers = [from_id, peer]
+
+        if updates.fwd_from and updates.fwd_from.from_id:
+            peers.append(updates.fwd_from.from_id)
+
+        if updates.via_bot_id:
+            peers.append(raw.types.PeerUser(user_id=updates.via_bot_id))
+
+        peers.extend(
+            raw.types.PeerUser(user_id=entity.user_id)
+            for entity in updates.entities or []
+            if isinstance(entity, raw.types.MessageEntityMentionName)
+        )
+
+        users = {}
+        chats = {}
+
+        for p in peers:
+            cached = self.client.peer_cache[utils.get_peer_id(p)]
+
+            if cached is None:
+                self.stats["fallback_messages"] += 1
+                return None
+
+            if isinstance(p, raw.types.PeerUser):
+                users[cached.id] = cached
+            else:
+                chats[cached.id] = cached
+
+        self.stats["local_messages"] += 1
+
+        return (
+            raw.types.UpdateNewMessage(
+                message=raw.types.Message(
+                    id=updates.id,
+                    peer_id=peer,
+                    from_id=from_id,
+                    date=updates.date,
+                    message=updates.message,
+                    out=updates.out,
+                    mentioned=updates.mentioned,
+                    media_unread=updates.media_unread,
+                    silent=updates.silent,
+                    fwd_from=updates.fwd_from,
+                    via_bot_id=updates.via_bot_id,
+                    reply_to=updates.reply_to,
+                    entities=updates.entities or [],
+                    restriction_reason=[],
+                    ttl_period=updates.ttl_period,
+                ),
+                pts=updates.pts,
+                pts_count=updates.pts_count,
+            ),
+            users,
+            chats,
+        )
+
+    def dispatch(self, packet) -> None:
+        self.client.dispatcher.updates_queue.put_nowait(packet)
+
+    def check(self, box: int, pts: int, pts_count: int) -> bool | None:
+        """Returns True if the update is the next one, False if it was already applied and None on gaps."""
+        local_pts = self.pts.get(box)
+
+        if local_pts is None or local_pts + pts_count == pts:
+            self.pts[box] = pts
+            self.stats["applied"] += 1
+            return True
+
+        if local_pts + pts_count > pts:
+            self.stats["duplicates"] += 1
+            return False
+
+        return None
+
+    def put(self, update, users: dict, chats: dict) -> None:
+        """Dispatch an incoming update in pts order."""
+        pts = getattr(update, "pts", None)
+        pts_count = getattr(update, "pts_count", None)
+
+        if pts is None or pts_count is None:
+            qts = getattr(update, "qts", None)
+
+            if qts is not None and self.qts is not None and qts <= self.qts:
+                self.stats["duplicates"] += 1
+                return
+
+            if qts is not None:
+                self.qts = qts
+
+            self.dispatch((update, users, chats))
+            return
+
+        self.put_sequenced(
+            self.get_box(update),
+            pts,
+            pts_count,
+            (update, users, chats),
+        )
+
+    def put_sequenced(self, box: int, pts: int, pts_count: int, packet) -> None:
+        """Apply an update of a message box, *packet* is None for updates that must not be dispatched."""
+        if box in self.gap_tasks:
+            self.pending.setdefault(box, []).append((pts, pts_count, packet))
+            self.flush(box)
+            return
+
+        applied = self.check(box, pts, pts_count)
+
+        if applied is None:
+            self.stats["gaps"] += 1
+            self.pending.setdefault(box, []).append((pts, pts_count, packet))
+            self.gap_tasks[box] = self.client.loop.create_task(self.fill_gap(box))
+            return
+
+        if applied and packet is not None:
+            self.dispatch(packet)
+
+        self.flush(box)
+
+    def flush(self, box: int) -> bool:
+        """Apply the buffered updates that became contiguous, returns True if a gap is still open."""
+        pending = self.pending.pop(box, None)
+
+        if not pending:
+            return False
+
+        pending.sort(key=lambda i: i[0])
+
+        while pending:
+            pts, pts_count, packet = pending[0]
+            applied = self.check(box, pts, pts_count)
+
+            if applied is None:
+                self.pending[box] = pending
+                return True
+
+            pending.pop(0)
+
+            if applied and packet is not None:
+                self.dispatch(packet)
+
+        return False
+
+    def confirm(self, query, r) -> None:
+        """Advance the local state with the result of an API call, without dispatching it."""
+        channel = getattr(query, "channel", None)
+        box = (
+            channel.channel_id
+            if isinstance(channel, raw.types.InputChannel)
+            else COMMON_BOX
+        )
+
+        if isinstance(r, raw.types.Updates | raw.types.UpdatesCombined):
+            for update in r.updates:
+                pts = getattr(update, "pts", None)
+                pts_count = getattr(update, "pts_count", None)
+
+                if pts is not None and pts_count is not None:
+                    self.put_sequenced(self.get_box(update), pts, pts_count, None)
+
+            self.set_seq(r.seq, r.date)
+        elif isinstance(r, raw.types.UpdateShortSentMessage):
+            self.put_sequenced(COMMON_BOX, r.pts, r.pts_count, None)
+        elif isinstance(
+            r,
+            raw.types.messages.AffectedMessages
+            | raw.types.messages.AffectedHistory
+            | raw.types.messages.AffectedFoundMessages,
+        ):
+            self.put_sequenced(box, r.pts, r.pts_count, None)
+
+    async def fill_gap(self, box: int) -> None:
+        try:
+            if box not in self.too_long:
+                await asyncio.sleep(self.GAP_TIMEOUT)
+
+            if not self.flush(box) and box not in self.too_long:
+                return
+
+            log.info("Filling updates gap of box %s", box)
+            self.too_long.discard(box)
+
+            try:
+                if box == COMMON_BOX:
+                    await self.get_difference()
+                else:
+                    await self.get_channel_difference(box)
+            except Exception as e:
+                log.warning("Unable to fill updates gap of box %s: %s", box, e)
+
+            # Give up on what the difference could not recover and resume from the buffered updates
+            if self.flush(box):
+                first = self.pending[box][0]
+                self.pts[box] = first[0] - first[1]
+        finally:
+            self.gap_tasks.pop(box, None)
+
+            if self.flush(box) or box in self.too_long:
+                self.gap_tasks[box] = self.client.loop.create_task(
+                    self.fill_gap(box),
+                )
+
+    def fetch_difference(self, box: int) -> None:
+        """Fill the gap of a box the server gave up on, through the same task as the other gaps of the box."""
+        self.stats["gaps"] += 1
+        self.too_long.add(box)
+
+        # A gap already being filled fetches the difference once it is done with the current one
+        if box not in self.gap_tasks:
+            self.gap_tasks[box] = self.client.loop.create_task(self.fill_gap(box))
+
+    def updates_too_long(self) -> None:
+        self.fetch_difference(COMMON_BOX)
+
+    async def get_difference(self) -> None:
+        if self.pts.get(COMMON_BOX) is None:
+            return
+
+        while True:
+            self.stats["differences"] += 1
+
+            diff = await self.client.invoke(
+                raw.functions.updates.GetDifference(
+                    pts=self.pts[COMMON_BOX],
+                    date=self.date,
+                    qts=self.qts or 0,
+                ),
+            )
+
+            if isinstance(diff, raw.types.updates.DifferenceEmpty):
+                self.set_seq(diff.seq, diff.date)
+                return
+
+            if isinstance(diff, raw.types.updates.DifferenceTooLong):
+                self.pts[COMMON_BOX] = diff.pts
+                return
+
+            users = {i.id: i for i in diff.users}
+            chats = {i.id: i for i in diff.chats}
+
+            state = (
+                diff.intermediate_state
+                if isinstance(diff, raw.types.updates.DifferenceSlice)
+                else diff.state
+            )
+
+            for message in diff.new_messages:
+                self.dispatch(
+                    (
+                        raw.types.UpdateNewMessage(
+                            message=message,
+                            pts=state.pts,
+                            pts_count=-1,
+                        ),
+                        users,
+                        chats,
+                    ),
+                )
+
+            for update in diff.other_updates:
+                if isinstance(update, raw.types.UpdateChannelTooLong):
+                    self.channel_too_long(update.channel_id)
+
+                # Channel updates advance the pts of their channel, not the common one the difference is about
+                if self.get_box(update) == COMMON_BOX:
+                    self.dispatch((update, users, chats))
+                else:
+                    self.put(update, users, chats)
+
+            self.set_state(state)
+
+            if isinstance(diff, raw.types.updates.Difference):
+                return
+
+    async def get_channel_difference(self, channel_id: int) -> None:
+        channel = await self.client.resolve_peer(utils.get_channel_id(channel_id))
+
+        while True:
+            self.stats["differences"] += 1
+
+            try:
+                diff = await self.client.invoke(
+                    raw.functions.updates.GetChannelDifference(
+                        channel=channel,
+                        filter=raw.types.ChannelMessagesFilterEmpty(),
+                        pts=self.pts[channel_id],
+                        limit=self.CHANNEL_DIFFERENCE_LIMIT,
+                    ),
+                )
+            except (errors.ChannelPrivate, errors.ChannelInvalid):
+                self.pts.pop(channel_id, None)
+                self.pending.pop(channel_id, None)
+                return
+
+            if isinstance(diff, raw.types.updates.ChannelDifferenceEmpty):
+                self.pts[channel_id] = diff.pts
+                return
+
+            users = {i.id: i for i in diff.users}
+            chats = {i.id: i for i in diff.chats}
+
+            if isinstance(diff, raw.types.updates.ChannelDifferenceTooLong):
+                self.pts[channel_id] = diff.dialog.pts
+                messages = diff.messages
+                other_updates = []
+            else:
+                self.pts[channel_id] = diff.pts
+                messages = diff.new_messages
+                other_updates = diff.other_updates
+
+            for message in messages:
+                self.dispatch(
+                    (
+                        raw.types.UpdateNewChannelMessage(
+                            message=message,
+                            pts=self.pts[channel_id],
+                            pts_count=-1,
+                        ),
+                        users,
+                        chats,
+                    ),
+                )
+
+            for update in other_updates:
+                self.dispatch((update, users, chats))
+
+            if diff.final:
+                return
+
+    def channel_too_long(self, channel_id: int, pts: int | None = None) -> None:
+        if self.pts.get(channel_id) is None:
+            if pts is None:
+                return
+
+            self.pts[channel_id] = pts
+
+        self.fetch_difference(channel_id)
@@ -2,5 +2,6 @@ from __future__ import annotations
 
 from .auth import Auth
 from .session import Session
+from .session_pool import SessionPool
 
-__all__ = ["Auth", "Session"]
+__all__ = ["Auth", "Session", "SessionPool"]
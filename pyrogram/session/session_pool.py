@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import time
+from typing import TYPE_CHECKING
+
+from pyrogram import raw
+from pyrogram.errors import AuthBytesInvalid
+
+from .auth import Auth
+from .session import Session
+
+if TYPE_CHECKING:
+    import pyrogram
+
+log = logging.getLogger(__name__)
+
+
+class SessionPool:
+    """Long-lived media sessions to a data center, shared by all the uploads, or all the opened media, of a client.
+
+    Users get the least busy sessions of the pool, new sessions are only started while all the existing ones are
+    in use and the pool is not full. Sessions left unused for :attr:`IDLE_TIMEOUT` seconds are stopped, sessions that
+    failed to reconnect by themselves are replaced.
+    """
+
+    IDLE_TIMEOUT = 60
+
+    def __init__(self, client: pyrogram.Client, dc_id: int, max_size: int) -> None:
+        self.client = client
+        self.dc_id = dc_id
+        self.max_size = max_size
+
+        # Number of uploads using each session and when it was last released
+        self.sessions: dict[Session, int] = {}
+        self.last_used: dict[Session, float] = {}
+        self.lock = asyncio.Lock()
+        self.reaper_task = None
+
+        self.created = 0
+        self.reaped = 0
+
+    async def create(self) -> Session:
+        test_mode = await self.client.storage.test_mode()
+        is_home = self.dc_id == await self.client.storage.dc_id()
+
+        session = Session(
+            self.client,
+            self.dc_id,
+            await self.client.storage.auth_key()
+            if is_home
+            else await Auth(self.client, self.dc_id, test_mode).create(),
+            test_mode,
+            is_media=True,
+        )
+
+        await session.start()
+
+        if not is_home:
+            for _ in range(3):
+                exported_auth = await self.client.invoke(
+                    raw.functions.auth.ExportAuthorization(dc_id=self.dc_id),
+                )
+
+                try:
+                    await session.invoke(
+                        raw.functions.auth.ImportAuthorization(
+                            id=exported_auth.id,
+                            bytes=exported_auth.bytes,
+                        ),
+                    )
+                except AuthBytesInvalid:
+                    continue
+                else:
+                    break
+            else:
+                await session.stop()
+                raise AuthBytesInvalid
+
+        self.created += 1
+
+        return session
+
+    def is_alive(self, session: Session) -> bool:
+        return session.is_started.is_set() or session.currently_restarting
+
+    async def acquire(self, size: int = 1) -> list[Session]:
+        """Get *size* sessions for an upload, they must be given back with :meth:`release`."""
+        async with self.lock:
+            for session in [s for s in self.sessions if not self.is_alive(s)]:
+                log.info("Replacing upload session to DC%s", self.dc_id)
+                await self.remove(session)
+
+            idle = sum(1 for users in self.sessions.values() if not users)
+            missing = min(size - idle, self.max_size - len(self.sessions))
+
+            if missing > 0:
+                for session in await asyncio.gather(
+                    *(self.create() for _ in range(missing)),
+                ):
+                    self.sessions[session] = 0
+
+            # Idle sessions come first, busy ones are shared once the pool is full
+            sessions = sorted(self.sessions, key=self.sessions.get)[:size]
+
+            for session in sessions:
+                self.sessions[session] += 1
+
+            if self.reaper_task is None:
+                self.reaper_task = self.client.loop.create_task(self.reaper())
+
+            return sessions
+
+    def release(self, sessions: list[Session]) -> None:
+        now = time.monotonic()
+
+        for session in sessions:
+            if session in self.sessions:
+                self.sessions[session] -= 1
+                self.last_used[session] = now
+
+    async def remove(self, session: Session) -> None:
+        self.sessions.pop(session, None)
+        self.last_used.pop(session, None)
+
+        with contextlib.suppress(Exception):
+            await session.stop()
+
+    async def reaper(self) -> None:
+        while self.sessions:
+            await asyncio.sleep(self.IDLE_TIMEOUT / 2)
+
+            async with self.lock:
+                deadline = time.monotonic() - self.IDLE_TIMEOUT
+
+                for session, users in list(self.sessions.items()):
+                    if not users and self.last_used.get(session, 0) < deadline:
+                        await self.remove(session)
+                        self.reaped += 1
+
+        self.reaper_task = None
+
+    async def stop(self) -> None:
+        if self.reaper_task is not None:
+            self.reaper_task.cancel()
+            self.reaper_task = None
+
+        for session in list(self.sessions):
+            await self.remove(session)
+
+    def get_stats(self) -> dict:
+        return {
+            "sessions": len(self.sessions),
+            "busy": sum(1 for users in self.sessions.values() if users),
+            "created": self.created,
+            "reaped": self.reaped,
+        }
@@ -1,7 +1,17 @@
 from __future__ import annotations
 
+from .chunk_cache import ChunkCache
 from .file_storage import FileStorage
 from .memory_storage import MemoryStorage
 from .storage import Storage
+from .upload_cache import MemoryUploadCache, SQLiteUploadCache, UploadCache
 
-__all__ = ["FileStorage", "MemoryStorage", "Storage"]
+__all__ = [
+    "ChunkCache",
+    "FileStorage",
+    "MemoryStorage",
+    "MemoryUploadCache",
+    "SQLiteUploadCache",
+    "Storage",
+    "UploadCache",
+]
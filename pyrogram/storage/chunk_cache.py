@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
+
+
+class ChunkCache:
+    """Keeps the chunks of downloaded media in a directory, so that downloading the same media again is done locally.
+
+    Chunks are stored in a file each, named after the unique id of the media and the chunk index. The directory is
+    kept under *max_size* bytes by deleting the least recently used chunks, as found by their modification time when
+    the cache is created. The same cache can be shared by several clients of a process, each one doing the disk I/O
+    in the executor it passes, its file executor.
+    """
+
+    TEMP_SUFFIX = ".temp"
+
+    def __init__(
+        self,
+        directory: str | Path,
+        max_size: int = 1024 * 1024 * 1024,
+    ) -> None:
+        self.directory = Path(directory)
+        self.max_size = max_size
+        self.lock = threading.Lock()
+
+        # Size of each chunk file by name, least recently used first
+        self.files: OrderedDict[str, int] = OrderedDict()
+        self.size = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.hit_bytes = 0
+        self.evictions = 0
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        entries = []
+
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(self.TEMP_SUFFIX):
+                # Left by a write that didn't finish
+                with contextlib.suppress(OSError):
+                    Path(entry.path).unlink()
+            elif entry.is_file():
+                stat = entry.stat()
+                entries.append((stat.st_mtime, entry.name, stat.st_size))
+
+        for _, name, size in sorted(entries):
+            self.files[name] = size
+            self.size += size
+
+    def get_name(self, key: str, index: int) -> str:
+        return f"{key}.{index}"
+
+    def read(self, path: Path) -> bytes:
+        data = path.read_bytes()
+        # The modification time orders chunks from one run to the next
+        os.utime(path)
+
+        return data
+
+    def write(self, path: Path, chunk: bytes) -> None:
+        fd, temp_path = tempfile.mkstemp(suffix=self.TEMP_SUFFIX, dir=self.directory)
+
+        try:
+            with os.fdopen(fd, "wb") as file:
+                file.write(chunk)
+
+            Path(temp_path).replace(path)
+        except BaseException:
+            with contextlib.suppress(OSError):
+                Path(temp_path).unlink()
+
+            raise
+
+    def remove(self, names: list[str]) -> None:
+        for name in names:
+            with contextlib.suppress(OSError):
+                (self.directory / name).unlink()
+
+    async def get(
+        self,
+        key: str,
+        index: int,
+        executor: Executor | None = None,
+    ) -> bytes | None:
+        name = self.get_name(key, index)
+
+        with self.lock:
+            is_cached = name in self.files
+
+            if is_cached:
+                self.files.move_to_end(name)
+
+        if is_cached:
+            try:
+                data = await asyncio.get_running_loop().run_in_executor(
+                    executor,
+                    self.read,
+                    self.directory / name,
+                )
+            except FileNotFoundError:
+                # Evicted in the meantime, or deleted from outside
+                with self.lock:
+                    self.size -= self.files.pop(name, 0)
+            else:
+                with self.lock:
+                    self.hits += 1
+                    self.hit_bytes += len(data)
+
+                return data
+
+        with self.lock:
+            self.misses += 1
+
+        return None
+
+    async def set(
+        self,
+        key: str,
+        index: int,
+        chunk: bytes,
+        executor: Executor | None = None,
+    ) -> None:
+        name = self.get_name(key, index)
+        loop = asyncio.get_running_loop()
+
+        await loop.run_in_executor(
+            executor,
+            self.write,
+            self.directory / name,
+            chunk,
+        )
+
+        evicted = []
+
+        with self.lock:
+            self.size += len(chunk) - self.files.pop(name, 0)
+            self.files[name] = len(chunk)
+
+            while self.size > self.max_size and len(self.files) > 1:
+                evicted_name, size = self.files.popitem(last=False)
+                self.size -= size
+                evicted.append(evicted_name)
+
+            self.evictions += len(evicted)
+
+        if evicted:
+            await loop.run_in_executor(executor, self.remove, evicted)
+
+    def get_stats(self) -> dict:
+        with self.lock:
+            lookups = self.hits + self.misses
+
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "hit_bytes": self.hit_bytes,
+                "evictions": self.evictions,
+                "chunks": len(self.files),
+                "size": self.size,
+            }
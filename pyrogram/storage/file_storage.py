@@ -20,6 +20,17 @@ CREATE TABLE update_state
 );
 """
 
+UPLOADS_SCHEMA = """
+CREATE TABLE uploads
+(
+    key       TEXT PRIMARY KEY,
+    file_id   INTEGER NOT NULL,
+    part_size INTEGER NOT NULL,
+    parts     BLOB    NOT NULL,
+    date      INTEGER NOT NULL
+);
+"""
+
 
 class FileStorage(SQLiteStorage):
     FILE_EXTENSION = ".session"
@@ -50,6 +61,12 @@ class FileStorage(SQLiteStorage):
 
             version += 1
 
+        if version == 4:
+            await self.conn.execute(UPLOADS_SCHEMA)
+            await self.conn.commit()
+
+            version += 1
+
         await self.version(version)
 
     async def open(self) -> None:
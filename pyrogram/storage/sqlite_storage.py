@@ -49,6 +49,15 @@ CREATE TABLE version
     number INTEGER PRIMARY KEY
 );
 
+CREATE TABLE uploads
+(
+    key       TEXT PRIMARY KEY,
+    file_id   INTEGER NOT NULL,
+    part_size INTEGER NOT NULL,
+    parts     BLOB    NOT NULL,
+    date      INTEGER NOT NULL
+);
+
 CREATE INDEX idx_peers_id ON peers (id);
 CREATE INDEX idx_peers_username ON peers (username);
 CREATE INDEX idx_peers_phone_number ON peers (phone_number);
@@ -100,8 +109,9 @@ def get_input_peer(peer_id: int, access_hash: int, peer_type: str):
 
 
 class SQLiteStorage(Storage):
-    VERSION = 4
+    VERSION = 5
     USERNAME_TTL = 8 * 60 * 60
+    UPLOAD_STATE_TTL = 24 * 60 * 60
 
     def __init__(self, name: str) -> None:
         super().__init__(name)
@@ -175,6 +185,35 @@ class SQLiteStorage(Storage):
         await self.conn.commit()
         return None
 
+    async def upload_state(
+        self,
+        key: str,
+        value: tuple[int, int, bytes] | None = object,
+    ):
+        now = int(time.time())
+
+        if value is object:
+            q = await self.conn.execute(
+                "SELECT file_id, part_size, parts FROM uploads "
+                "WHERE key = ? AND date >= ?",
+                (key, now - self.UPLOAD_STATE_TTL),
+            )
+            return await q.fetchone()
+        if value is None:
+            await self.conn.execute("DELETE FROM uploads WHERE key = ?", (key,))
+        else:
+            await self.conn.execute(
+                "REPLACE INTO uploads (key, file_id, part_size, parts, date)"
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, *value, now),
+            )
+            await self.conn.execute(
+                "DELETE FROM uploads WHERE date < ?",
+                (now - self.UPLOAD_STATE_TTL,),
+            )
+        await self.conn.commit()
+        return None
+
     async def get_peer_by_id(self, peer_id: int):
         q = await self.conn.execute(
             "SELECT id, access_hash, type FROM peers WHERE id = ?",
@@ -51,6 +51,18 @@ class Storage(ABC):
     ) -> NoReturn:
         raise NotImplementedError
 
+    async def upload_state(
+        self,
+        key: str,  # noqa: ARG002
+        value: tuple[int, int, bytes] | None = object,  # noqa: ARG002
+    ) -> tuple[int, int, bytes] | None:
+        """Gets, sets or deletes (with None) the state of a resumable upload.
+
+        The state is a ``(file_id, part_size, parts)`` tuple, *parts* being the bitmap of the parts already uploaded.
+        Storages without support for it always start uploads over.
+        """
+        return None
+
     @abstractmethod
     async def get_peer_by_id(self, peer_id: int) -> NoReturn:
         raise NotImplementedError
@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import TYPE_CHECKING
+
+import aiosqlite
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+# language=SQLite
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS uploads
+(
+    key        TEXT PRIMARY KEY,
+    media      BLOB    NOT NULL,
+    chat_id    INTEGER NOT NULL,
+    message_id INTEGER NOT NULL,
+    expires    REAL,
+    last_used  REAL    NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_uploads_last_used ON uploads (last_used);
+"""
+
+
+class UploadCache(ABC):
+    """Remembers the media uploaded for a given file content, so identical files are sent without uploading them again.
+
+    Entries are ``(media, chat_id, message_id)`` tuples: the serialized ``InputPhoto`` or ``InputDocument`` and the
+    message it was sent with, used to refresh its file reference once expired. At most *capacity* entries are kept,
+    the least recently used ones are evicted first, and entries older than *ttl* seconds are ignored.
+    """
+
+    def __init__(self, capacity: int = 1000, ttl: float | None = None) -> None:
+        self.capacity = capacity
+        self.ttl = ttl
+
+        self.hits = 0
+        self.misses = 0
+
+    async def open(self) -> None:
+        """Opens the cache backend, backends may also open themselves when first used."""
+        return
+
+    async def close(self) -> None:
+        """Closes the cache backend."""
+        return
+
+    @abstractmethod
+    async def get(self, key: str) -> tuple[bytes, int, int] | None:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def set(self, key: str, value: tuple[bytes, int, int]) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def delete(self, key: str) -> None:
+        raise NotImplementedError
+
+    def get_expires(self) -> float | None:
+        return time.time() + self.ttl if self.ttl is not None else None
+
+    def get_stats(self) -> dict:
+        lookups = self.hits + self.misses
+
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
+
+
+class MemoryUploadCache(UploadCache):
+    def __init__(self, capacity: int = 1000, ttl: float | None = None) -> None:
+        super().__init__(capacity, ttl)
+
+        self.store = OrderedDict()
+
+    async def get(self, key: str) -> tuple[bytes, int, int] | None:
+        value, expires = self.store.get(key, (None, None))
+
+        if value is not None and expires is not None and expires < time.time():
+            del self.store[key]
+            value = None
+
+        if value is None:
+            self.misses += 1
+            return None
+
+        self.store.move_to_end(key)
+        self.hits += 1
+
+        return value
+
+    async def set(self, key: str, value: tuple[bytes, int, int]) -> None:
+        self.store[key] = (value, self.get_expires())
+        self.store.move_to_end(key)
+
+        while len(self.store) > self.capacity:
+            self.store.popitem(last=False)
+
+    async def delete(self, key: str) -> None:
+        self.store.pop(key, None)
+
+
+class SQLiteUploadCache(UploadCache):
+    """An :class:`UploadCache` kept in a SQLite database, usually next to the session file, to survive restarts."""
+
+    def __init__(
+        self,
+        database: str | Path,
+        capacity: int = 1000,
+        ttl: float | None = None,
+    ) -> None:
+        super().__init__(capacity, ttl)
+
+        self.database = database
+        self.conn: aiosqlite.Connection = None
+
+    async def open(self) -> None:
+        if self.conn is None:
+            self.conn = await aiosqlite.connect(str(self.database), timeout=1)
+            await self.conn.executescript(SCHEMA)
+            await self.conn.commit()
+
+    async def close(self) -> None:
+        if self.conn is not None:
+            await self.conn.close()
+            self.conn = None
+
+    async def get(self, key: str) -> tuple[bytes, int, int] | None:
+        await self.open()
+
+        now = time.time()
+        q = await self.conn.execute(
+            "SELECT media, chat_id, message_id FROM uploads "
+            "WHERE key = ? AND (expires IS NULL OR expires >= ?)",
+            (key, now),
+        )
+        r = await q.fetchone()
+
+        if r is None:
+            self.misses += 1
+            return None
+
+        await self.conn.execute(
+            "UPDATE uploads SET last_used = ? WHERE key = ?",
+            (now, key),
+        )
+        await self.conn.commit()
+        self.hits += 1
+
+        return r[0], r[1], r[2]
+
+    async def set(self, key: str, value: tuple[bytes, int, int]) -> None:
+        await self.open()
+
+        now = time.time()
+        await self.conn.execute(
+            "REPLACE INTO uploads (key, media, chat_id, message_id, expires, last_used) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (key, *value, self.get_expires(), now),
+        )
+        await self.conn.execute(
+            "DELETE FROM uploads WHERE expires < ? OR key IN "
+            "(SELECT key FROM uploads ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+            (now, self.capacity),
+        )
+        await self.conn.commit()
+
+    async def delete(self, key: str) -> None:
+        await self.open()
+
+        await self.conn.execute("DELETE FROM uploads WHERE key = ?", (key,))
+        await self.conn.commit()
@@ -440,6 +440,122 @@ class Message(Object, Update):
 
     # TODO: Add game missing field, Also connected_website
 
+    __slots__ = (  # noqa: RUF023 - declaration order is the repr order
+        "id",
+        "message_thread_id",
+        "business_connection_id",
+        "from_user",
+        "sender_chat",
+        "sender_business_bot",
+        "date",
+        "chat",
+        "topic",
+        "forward_from",
+        "forward_sender_name",
+        "forward_from_chat",
+        "forward_from_message_id",
+        "forward_signature",
+        "forward_date",
+        "is_topic_message",
+        "reply_to_chat_id",
+        "reply_to_message_id",
+        "reply_to_story_id",
+        "reply_to_story_user_id",
+        "reply_to_story_chat_id",
+        "reply_to_top_message_id",
+        "reply_to_message",
+        "reply_to_story",
+        "mentioned",
+        "empty",
+        "service",
+        "scheduled",
+        "from_scheduled",
+        "media",
+        "edit_date",
+        "edit_hide",
+        "media_group_id",
+        "author_signature",
+        "has_protected_content",
+        "has_media_spoiler",
+        "text",
+        "entities",
+        "caption_entities",
+        "quote_text",
+        "quote_entities",
+        "effect_id",
+        "invert_media",
+        "audio",
+        "document",
+        "photo",
+        "paid_media",
+        "sticker",
+        "animation",
+        "game",
+        "gifted_premium",
+        "giveaway",
+        "giveaway_result",
+        "boosts_applied",
+        "chat_theme_updated",
+        "chat_wallpaper_updated",
+        "contact_registered",
+        "gift_code",
+        "user_gift",
+        "star_gift",
+        "screenshot_taken",
+        "invoice",
+        "story",
+        "video",
+        "alternative_videos",
+        "voice",
+        "video_note",
+        "web_page_preview",
+        "caption",
+        "contact",
+        "location",
+        "venue",
+        "poll",
+        "dice",
+        "new_chat_members",
+        "chat_joined_by_request",
+        "left_chat_member",
+        "new_chat_title",
+        "new_chat_photo",
+        "delete_chat_photo",
+        "group_chat_created",
+        "supergroup_chat_created",
+        "channel_chat_created",
+        "migrate_to_chat_id",
+        "migrate_from_chat_id",
+        "pinned_message",
+        "game_high_score",
+        "views",
+        "forwards",
+        "via_bot",
+        "outgoing",
+        "matches",
+        "command",
+        "reply_markup",
+        "bot_allowed",
+        "chats_shared",
+        "forum_topic_created",
+        "forum_topic_closed",
+        "forum_topic_reopened",
+        "forum_topic_edited",
+        "general_topic_hidden",
+        "general_topic_unhidden",
+        "giveaway_launched",
+        "video_chat_scheduled",
+        "video_chat_started",
+        "video_chat_ended",
+        "video_chat_members_invited",
+        "web_app_data",
+        "successful_payment",
+        "payment_refunded",
+        "reactions",
+        "chat_join_type",
+        "raw",
+    )
+
     def __init__(
         self,
         *,
@@ -798,7 +914,7 @@ class Message(Object, Update):
 
             service_type = enums.MessageServiceType.UNKNOWN
 
-            from_user = types.User._parse(client, users.get(user_id))
+            from_user = client.identity_map.get_user(users.get(user_id))
             sender_chat = (
                 types.Chat._parse(client, message, users, chats, is_chat=False)
                 if not from_user
@@ -1022,7 +1138,12 @@ class Message(Object, Update):
 
             if isinstance(action, raw.types.MessageActionPinMessage):
                 try:
-                    parsed_message.pinned_message = await client.get_messages(
+                    parsed_message.pinned_message = client.message_cache[
+                        (
+                            parsed_message.chat.id,
+                            getattr(message.reply_to, "reply_to_msg_id", None),
+                        )
+                    ] or await client.get_messages(
                         parsed_message.chat.id,
                         reply_to_message_ids=message.id,
                         replies=0,
@@ -1104,10 +1225,11 @@ class Message(Object, Update):
                     peer_id = utils.get_peer_id(forward_header.from_id)
 
                     if peer_id > 0:
-                        forward_from = types.User._parse(client, users[raw_peer_id])
+                        forward_from = client.identity_map.get_user(
+                            users[raw_peer_id],
+                        )
                     else:
-                        forward_from_chat = types.Chat._parse_channel_chat(
-                            client,
+                        forward_from_chat = client.identity_map.get_chat(
                             chats[raw_peer_id],
                         )
                         forward_from_message_id = forward_header.channel_post
@@ -1325,7 +1447,7 @@ class Message(Object, Update):
                 else:
                     reply_markup = None
 
-            from_user = types.User._parse(client, users.get(user_id))
+            from_user = client.identity_map.get_user(users.get(user_id))
             sender_chat = (
                 types.Chat._parse(client, message, users, chats, is_chat=False)
                 if not from_user
@@ -1416,8 +1538,7 @@ class Message(Object, Update):
                 dice=dice,
                 views=message.views,
                 forwards=message.forwards,
-                via_bot=types.User._parse(
-                    client,
+                via_bot=client.identity_map.get_user(
                     users.get(message.via_bot_id, None),
                 ),
                 outgoing=message.out,
@@ -1451,10 +1572,11 @@ class Message(Object, Update):
                             thread_id = message.reply_to.reply_to_msg_id
                         parsed_message.message_thread_id = thread_id
                         parsed_message.is_topic_message = True
-                        if topic:
-                            parsed_message.topic = types.ForumTopic._parse(
-                                topic[thread_id],
-                            )
+                        if topic is not None:
+                            if thread_id in topic:
+                                parsed_message.topic = types.ForumTopic._parse(
+                                    topic[thread_id],
+                                )
                         else:
                             try:
                                 msg = await client.get_messages(
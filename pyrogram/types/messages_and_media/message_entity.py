@@ -37,6 +37,17 @@ class MessageEntity(Object):
             For :obj:`~pyrogram.enums.MessageEntityType.BLOCKQUOTE` only, whether the blockquote expandable.
     """
 
+    __slots__ = (  # noqa: RUF023 - declaration order is the repr order
+        "type",
+        "offset",
+        "length",
+        "url",
+        "user",
+        "language",
+        "custom_emoji_id",
+        "collapsed",
+    )
+
     def __init__(
         self,
         *,
@@ -81,7 +92,7 @@ class MessageEntity(Object):
             offset=entity.offset,
             length=entity.length,
             url=getattr(entity, "url", None),
-            user=types.User._parse(client, users.get(user_id)),
+            user=client.identity_map.get_user(users.get(user_id)),
             language=getattr(entity, "language", None),
             custom_emoji_id=getattr(entity, "document_id", None),
             collapsed=getattr(entity, "collapsed", None),
@@ -89,7 +100,7 @@ class MessageEntity(Object):
         )
 
     async def write(self):
-        args = self.__dict__.copy()
+        args = self._attributes()
 
         for arg in ("_client", "type", "user"):
             args.pop(arg)
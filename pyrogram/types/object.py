@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import functools
 import typing
 from datetime import datetime
 from enum import Enum
@@ -9,10 +10,40 @@ if typing.TYPE_CHECKING:
     import pyrogram
 
 
+@functools.cache
+def get_slots(cls: type) -> tuple[str, ...]:
+    return tuple(
+        name
+        for c in reversed(cls.__mro__)
+        for name in getattr(c, "__slots__", ())
+        if name not in {"__dict__", "__weakref__"}
+    )
+
+
 class Object:
+    # High-volume types (Message, User, Chat, ...) declare their attributes in __slots__ to save the memory of a per
+    # instance dict, which is still available for attributes set outside of __init__
+    __slots__ = ("__dict__", "__weakref__", "_client")
+
     def __init__(self, client: pyrogram.Client = None) -> None:
         self._client = client
 
+    def _attributes(self) -> dict:
+        attributes = {
+            name: getattr(self, name)
+            for name in get_slots(type(self))
+            if hasattr(self, name)
+        }
+        extra = self.__dict__
+
+        if extra:
+            attributes.update(extra)
+        else:
+            # Reading __dict__ created it, it's dropped again to keep the memory saved by the slots
+            del self.__dict__
+
+        return attributes
+
     def bind(self, client: pyrogram.Client) -> None:
         """Bind a Client instance to this and to all nested Pyrogram objects.
 
@@ -23,9 +54,7 @@ class Object:
         """
         self._client = client
 
-        for i in self.__dict__:
-            o = getattr(self, i)
-
+        for o in self._attributes().values():
             if isinstance(o, Object):
                 o.bind(client)
 
@@ -46,12 +75,13 @@ class Object:
         attributes_to_hide = ["raw"]
 
         filtered_attributes = {
-            attr: ("*" * 9 if attr == "phone_number" else getattr(obj, attr))
-            for attr in filter(
-                lambda x: not x.startswith("_") and x not in attributes_to_hide,
-                obj.__dict__,
-            )
-            if getattr(obj, attr) is not None
+            attr: ("*" * 9 if attr == "phone_number" else value)
+            for attr, value in (
+                obj._attributes() if isinstance(obj, Object) else obj.__dict__
+            ).items()
+            if not attr.startswith("_")
+            and attr not in attributes_to_hide
+            and value is not None
         }
 
         return {"_": obj.__class__.__name__, **filtered_attributes}
@@ -63,19 +93,19 @@ class Object:
         return "pyrogram.types.{}({})".format(
             self.__class__.__name__,
             ", ".join(
-                f"{attr}={getattr(self, attr)!r}"
-                for attr in filter(lambda x: not x.startswith("_"), self.__dict__)
-                if getattr(self, attr) is not None
+                f"{attr}={value!r}"
+                for attr, value in self._attributes().items()
+                if not attr.startswith("_") and value is not None
             ),
         )
 
     def __eq__(self, other: Object) -> bool:
-        for attr in self.__dict__:
+        for attr, value in self._attributes().items():
             try:
                 if attr.startswith("_"):
                     continue
 
-                if getattr(self, attr) != getattr(other, attr):
+                if value != getattr(other, attr):
                     return False
             except AttributeError:
                 return False
@@ -88,12 +118,12 @@ class Object:
 
             # Maybe a better alternative would be https://docs.python.org/3/library/inspect.html#inspect.signature
             if isinstance(obj, tuple) and len(obj) == 2 and obj[0] == "dt":
-                state[attr] = datetime.fromtimestamp(obj[1])
+                obj = datetime.fromtimestamp(obj[1])
 
-        self.__dict__ = state
+            setattr(self, attr, obj)
 
     def __getstate__(self):
-        state = self.__dict__.copy()
+        state = self._attributes()
         state.pop("_client", None)
 
         for attr in state:
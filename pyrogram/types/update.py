@@ -6,6 +6,8 @@ import pyrogram
 
 
 class Update:
+    __slots__ = ()
+
     @staticmethod
     def stop_propagation() -> NoReturn:
         raise pyrogram.StopPropagationError
@@ -14,6 +14,11 @@ if TYPE_CHECKING:
 class Chat(Object):
     """A chat.
 
+    .. note::
+
+        The same object is shared by all the messages and updates parsed from the same chat data, until the
+        chat changes. Modifying it in place affects all of them, make a copy first if needed.
+
     Parameters:
         id (``int``):
             Unique identifier for this chat.
@@ -193,6 +198,58 @@ class Chat(Object):
             The maximum number of reactions that can be set on a message in the chat
     """
 
+    __slots__ = (  # noqa: RUF023 - declaration order is the repr order
+        "id",
+        "type",
+        "is_verified",
+        "is_restricted",
+        "is_creator",
+        "is_scam",
+        "is_fake",
+        "is_support",
+        "is_forum",
+        "is_participants_hidden",
+        "is_join_request",
+        "is_join_to_send",
+        "is_antispam",
+        "is_slowmode_enabled",
+        "title",
+        "is_paid_reactions_available",
+        "username",
+        "first_name",
+        "last_name",
+        "photo",
+        "stories",
+        "wallpaper",
+        "bio",
+        "description",
+        "dc_id",
+        "folder_id",
+        "has_protected_content",
+        "invite_link",
+        "pinned_message",
+        "sticker_set_name",
+        "can_set_sticker_set",
+        "members_count",
+        "join_requests_count",
+        "slow_mode_delay",
+        "restrictions",
+        "permissions",
+        "distance",
+        "linked_chat",
+        "send_as_chat",
+        "available_reactions",
+        "usernames",
+        "reply_color",
+        "profile_color",
+        "business_info",
+        "birthday",
+        "personal_chat",
+        "subscription_until_date",
+        "can_enable_paid_reaction",
+        "max_reaction_count",
+    )
+
     def __init__(
         self,
         *,
@@ -443,12 +500,9 @@ class Chat(Object):
         chat_id = (peer_id or from_id) if is_chat else (from_id or peer_id)
 
         if isinstance(message.peer_id, raw.types.PeerUser):
-            return Chat._parse_user_chat(client, users[chat_id])
-
-        if isinstance(message.peer_id, raw.types.PeerChat):
-            return Chat._parse_chat_chat(client, chats[chat_id])
+            return client.identity_map.get_chat(users[chat_id])
 
-        return Chat._parse_channel_chat(client, chats[chat_id])
+        return client.identity_map.get_chat(chats[chat_id])
 
     @staticmethod
     def _parse_dialog(client, peer, users: dict, chats: dict):
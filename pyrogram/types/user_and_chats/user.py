@@ -42,6 +42,11 @@ class Link(str):
 class User(Object, Update):
     """A Telegram user or bot.
 
+    .. note::
+
+        The same object is shared by all the messages and updates parsed from the same user data, until the
+        user changes. Modifying it in place affects all of them, make a copy first if needed.
+
     Parameters:
         id (``int``):
             Unique identifier for this user or bot.
@@ -149,6 +154,39 @@ class User(Object, Update):
             Bot's active users count.
     """
 
+    __slots__ = (  # noqa: RUF023 - declaration order is the repr order
+        "id",
+        "is_self",
+        "is_contact",
+        "is_mutual_contact",
+        "is_deleted",
+        "is_bot",
+        "is_verified",
+        "is_restricted",
+        "is_scam",
+        "is_fake",
+        "is_support",
+        "is_premium",
+        "is_contacts_only",
+        "is_bot_business",
+        "first_name",
+        "last_name",
+        "status",
+        "last_online_date",
+        "next_offline_date",
+        "username",
+        "usernames",
+        "language_code",
+        "emoji_status",
+        "dc_id",
+        "phone_number",
+        "photo",
+        "restrictions",
+        "reply_color",
+        "profile_color",
+        "active_users",
+    )
+
     def __init__(
         self,
         *,
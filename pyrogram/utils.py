@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import asyncio
 import base64
+import contextlib
 import functools
 import hashlib
 import os
@@ -9,7 +10,9 @@ import struct
 from concurrent.futures.thread import ThreadPoolExecutor
 from datetime import datetime, timezone
 from getpass import getpass
-from typing import TYPE_CHECKING, Any, TypeVar
+from io import BytesIO
+from pathlib import Path, PurePath
+from typing import TYPE_CHECKING, Any, BinaryIO, NamedTuple, TypeVar
 
 import pyrogram
 from pyrogram import enums, raw, types
@@ -18,10 +21,11 @@ from pyrogram.file_id import (
     PHOTO_TYPES,
     FileId,
     FileType,
+    ThumbnailSource,
 )
 
 if TYPE_CHECKING:
-    from collections.abc import Callable
+    from collections.abc import AsyncGenerator, Awaitable, Callable
 
 
 async def ainput(prompt: str = "", *, hide: bool = False):
@@ -83,6 +87,8 @@ async def parse_messages(
     is_scheduled: bool = False,
     business_connection_id: str = "",
     r: raw.base.Updates = None,
+    replies: int = 1,
+    wait: Callable[[], Awaitable] | None = None,
 ) -> list[types.Message]:
     parsed_messages = []
 
@@ -136,6 +142,12 @@ async def parse_messages(
     if not messages.messages:
         return types.List()
 
+    topics = (
+        await resolve_message_references(client, messages.messages, wait)
+        if replies and not is_scheduled
+        else {}
+    )
+
     parsed_messages.extend(
         [
             await types.Message._parse(
@@ -143,8 +155,11 @@ async def parse_messages(
                 message,
                 users,
                 chats,
+                topic=topics.get(get_peer_id(message.peer_id))
+                if getattr(message, "peer_id", None)
+                else None,
                 is_scheduled=is_scheduled,
-                replies=1,
+                replies=replies,
             )
             for message in messages.messages
         ],
@@ -153,6 +168,198 @@ async def parse_messages(
     return types.List(parsed_messages)
 
 
+async def resolve_message_references(
+    client,
+    messages: list[raw.base.Message],
+    wait: Callable[[], Awaitable] | None = None,
+) -> dict[int, dict]:
+    """Fetch what a list of messages refers to with one request per chat.
+
+    Replied-to and pinned messages are loaded into the message cache, where :meth:`~pyrogram.types.Message._parse`
+    looks for them before asking the server. Forum topics are returned as ``{chat_id: {topic_id: topic}}``, chats
+    whose topics couldn't be fetched are left out. *wait* is awaited before each request, if given.
+    """
+    message_ids = {}
+    topic_ids = {}
+
+    for message in messages:
+        reply_to = getattr(message, "reply_to", None)
+
+        if not isinstance(reply_to, raw.types.MessageReplyHeader):
+            continue
+
+        chat_id = get_peer_id(message.peer_id)
+
+        if reply_to.forum_topic:
+            topic_ids.setdefault(chat_id, set()).add(
+                reply_to.reply_to_top_id or reply_to.reply_to_msg_id,
+            )
+
+            # Messages sent to a topic without replying just point to the topic
+            if not reply_to.reply_to_top_id:
+                continue
+
+        if not reply_to.reply_to_msg_id:
+            continue
+
+        key = (
+            get_peer_id(reply_to.reply_to_peer_id)
+            if reply_to.reply_to_peer_id
+            else chat_id,
+            reply_to.reply_to_msg_id,
+        )
+
+        if client.message_cache[key] is None:
+            message_ids.setdefault(key[0], set()).add(key[1])
+
+    async def get_messages(chat_id: int, ids: list[int]) -> None:
+        for i in range(0, len(ids), 200):
+            if wait is not None:
+                await wait()
+
+            try:
+                await client.get_messages(
+                    chat_id=chat_id,
+                    message_ids=ids[i : i + 200],
+                    replies=0,
+                )
+            except (pyrogram.errors.RPCError, KeyError, ValueError):
+                return
+
+    async def get_topics(chat_id: int, ids: list[int]) -> tuple[int, dict] | None:
+        if wait is not None:
+            await wait()
+
+        try:
+            r = await client.invoke(
+                raw.functions.channels.GetForumTopicsByID(
+                    channel=await client.resolve_peer(chat_id),
+                    topics=ids,
+                ),
+            )
+        except (pyrogram.errors.RPCError, KeyError, ValueError):
+            # Left out, so that the topic of each message is looked up by Message._parse instead
+            return None
+
+        return chat_id, {
+            t.id: t for t in r.topics if isinstance(t, raw.types.ForumTopic)
+        }
+
+    results = await asyncio.gather(
+        *(get_messages(k, sorted(v)) for k, v in message_ids.items()),
+        *(
+            get_topics(k, sorted(v))
+            for k, v in topic_ids.items()
+            if get_peer_type(k) == "channel"
+        ),
+    )
+
+    return dict(i for i in results if i is not None)
+
+
+class RawMessage(NamedTuple):
+    """A message as returned by Telegram, with just the fields most bulk readers need pulled out.
+
+    ``text`` holds the caption for media messages, ``users`` and ``chats`` are the raw peers that came with the
+    message, keyed by their raw ids and shared by all the messages of the same response.
+    """
+
+    id: int
+    date: datetime | None
+    text: str | None
+    chat_id: int | None
+    sender_id: int | None
+    message: raw.base.Message
+    users: dict[int, raw.base.User]
+    chats: dict[int, raw.base.Chat]
+
+
+def parse_raw_messages(
+    client,
+    messages: raw.base.messages.Messages,
+) -> list[RawMessage]:
+    """Like :func:`parse_messages`, without building any object nor sending any request."""
+    users = {i.id: i for i in messages.users}
+    chats = {i.id: i for i in messages.chats}
+    parsed_messages = []
+
+    for message in messages.messages:
+        peer_id = getattr(message, "peer_id", None)
+        from_id = getattr(message, "from_id", None)
+        chat_id = get_peer_id(peer_id) if peer_id else None
+
+        if from_id:
+            sender_id = get_peer_id(from_id)
+        elif getattr(message, "out", False):
+            sender_id = client.me.id if client.me else None
+        else:
+            # Private chats and channel posts without an explicit sender
+            sender_id = chat_id
+
+        parsed_messages.append(
+            RawMessage(
+                id=message.id,
+                date=timestamp_to_datetime(getattr(message, "date", None)),
+                text=getattr(message, "message", None) or None,
+                chat_id=chat_id,
+                sender_id=sender_id,
+                message=message,
+                users=users,
+                chats=chats,
+            ),
+        )
+
+    return parsed_messages
+
+
+async def prefetch_pages(
+    pages: AsyncGenerator[list, None],
+    prefetch: int = 0,
+) -> AsyncGenerator[list, None]:
+    """Iterate over the pages of a paginated request, fetching the next *prefetch* pages in the background.
+
+    The pages are requested by a separate task while the consumer works on the current one, the task stops once
+    *prefetch* pages are waiting to be consumed.
+    """
+    if prefetch <= 0:
+        async for page in pages:
+            yield page
+
+        return
+
+    queue = asyncio.Queue(prefetch)
+
+    async def fetch() -> None:
+        try:
+            async for page in pages:
+                await queue.put((page, None))
+        except Exception as e:
+            await queue.put((None, e))
+        else:
+            await queue.put((None, None))
+        finally:
+            await pages.aclose()
+
+    task = asyncio.get_event_loop().create_task(fetch())
+
+    try:
+        while True:
+            page, error = await queue.get()
+
+            if error is not None:
+                raise error
+
+            if page is None:
+                return
+
+            yield page
+    finally:
+        task.cancel()
+
+        with contextlib.suppress(asyncio.CancelledError):
+            await task
+
+
 def parse_deleted_messages(
     client,
     update,
@@ -226,6 +433,219 @@ def unpack_inline_message_id(
     )
 
 
+def get_input_file_location(file_id: FileId) -> raw.base.InputFileLocation:
+    if file_id.file_type == FileType.CHAT_PHOTO:
+        if file_id.chat_id > 0:
+            peer = raw.types.InputPeerUser(
+                user_id=file_id.chat_id,
+                access_hash=file_id.chat_access_hash,
+            )
+        elif file_id.chat_access_hash == 0:
+            peer = raw.types.InputPeerChat(chat_id=-file_id.chat_id)
+        else:
+            peer = raw.types.InputPeerChannel(
+                channel_id=get_channel_id(file_id.chat_id),
+                access_hash=file_id.chat_access_hash,
+            )
+
+        return raw.types.InputPeerPhotoFileLocation(
+            peer=peer,
+            photo_id=file_id.media_id,
+            big=file_id.thumbnail_source == ThumbnailSource.CHAT_PHOTO_BIG,
+        )
+
+    if file_id.file_type == FileType.PHOTO:
+        return raw.types.InputPhotoFileLocation(
+            id=file_id.media_id,
+            access_hash=file_id.access_hash,
+            file_reference=file_id.file_reference,
+            thumb_size=file_id.thumbnail_size,
+        )
+
+    return raw.types.InputDocumentFileLocation(
+        id=file_id.media_id,
+        access_hash=file_id.access_hash,
+        file_reference=file_id.file_reference,
+        thumb_size=file_id.thumbnail_size,
+    )
+
+
+def get_chunk_cache_key(file_id: FileId) -> str | None:
+    """Key of a media in the chunk cache, None if it can't be cached.
+
+    The file unique id of a media only depends on its id, the size of the thumbnail or chat photo is added to it.
+    """
+    if file_id.media_id is None:
+        return None
+
+    if file_id.file_type == FileType.CHAT_PHOTO:
+        variant = file_id.thumbnail_source.name.lower()
+    else:
+        variant = file_id.thumbnail_size
+
+    return f"{file_id.media_id}_{variant}" if variant else str(file_id.media_id)
+
+
+def hash_file(file: str | BinaryIO) -> tuple[str, int] | None:
+    """Get the sha256 and size of a file, None if it can't be read again for the upload."""
+    if isinstance(file, str | PurePath):
+        if not Path(file).is_file():
+            return None
+
+        with Path(file).open("rb") as fp:
+            return hash_file(fp)
+
+    if not getattr(file, "seekable", lambda: False)():
+        return None
+
+    sha = hashlib.sha256()
+    size = 0
+    position = file.tell()
+    file.seek(0)
+
+    while chunk := file.read(1024 * 1024):
+        sha.update(chunk)
+        size += len(chunk)
+
+    file.seek(position)
+
+    return sha.hexdigest(), size
+
+
+async def get_upload_cache_key(client, file, *extra, thumb=None) -> str | None:
+    """Key of a file in the upload cache: its content hash and size, followed by anything else the media depends on.
+
+    The content of the *thumb* uploaded with the file is hashed as well. None is returned if the upload cache is
+    disabled or the file or its thumbnail is not a local one.
+    """
+    if client.upload_cache is None or file is None:
+        return None
+
+    digest = await client.loop.run_in_executor(client.file_executor, hash_file, file)
+
+    if digest is None:
+        return None
+
+    if thumb is not None:
+        thumb_digest = await client.loop.run_in_executor(
+            client.file_executor,
+            hash_file,
+            thumb,
+        )
+
+        if thumb_digest is None:
+            return None
+
+        extra = (*extra, "thumb", *thumb_digest)
+
+    return ":".join(str(i) for i in (*digest, *extra))
+
+
+def get_input_media_from_message(
+    message: raw.base.Message,
+) -> raw.types.InputPhoto | raw.types.InputDocument | None:
+    media = getattr(message, "media", None)
+
+    if isinstance(media, raw.types.MessageMediaPhoto) and isinstance(
+        media.photo,
+        raw.types.Photo,
+    ):
+        return raw.types.InputPhoto(
+            id=media.photo.id,
+            access_hash=media.photo.access_hash,
+            file_reference=media.photo.file_reference,
+        )
+
+    if isinstance(media, raw.types.MessageMediaDocument) and isinstance(
+        media.document,
+        raw.types.Document,
+    ):
+        return raw.types.InputDocument(
+            id=media.document.id,
+            access_hash=media.document.access_hash,
+            file_reference=media.document.file_reference,
+        )
+
+    return None
+
+
+async def get_cached_media(
+    client,
+    key: str | None,
+) -> raw.types.InputPhoto | raw.types.InputDocument | None:
+    if key is None:
+        return None
+
+    value = await client.upload_cache.get(key)
+
+    return raw.core.TLObject.read(BytesIO(value[0])) if value else None
+
+
+async def cache_sent_media(client, key: str | None, r: raw.base.Updates) -> None:
+    """Remember the media sent with a message, along with the message to refresh its file reference later."""
+    if key is None:
+        return
+
+    for update in getattr(r, "updates", []):
+        message = getattr(update, "message", None)
+        media = get_input_media_from_message(message)
+
+        if media is not None:
+            await client.upload_cache.set(
+                key,
+                (media.write(), get_peer_id(message.peer_id), message.id),
+            )
+            return
+
+
+async def refresh_cached_media(
+    client,
+    key: str | None,
+) -> raw.types.InputPhoto | raw.types.InputDocument | None:
+    """Get a fresh file reference for a cached media from the message it was sent with.
+
+    The entry is dropped, and None returned, if that message can't be fetched anymore.
+    """
+    value = await client.upload_cache.get(key) if key else None
+
+    if value is None:
+        return None
+
+    _, chat_id, message_id = value
+    ids = [raw.types.InputMessageID(id=message_id)]
+
+    try:
+        if get_peer_type(chat_id) == "channel":
+            r = await client.invoke(
+                raw.functions.channels.GetMessages(
+                    channel=await client.resolve_peer(chat_id),
+                    id=ids,
+                ),
+            )
+        else:
+            r = await client.invoke(raw.functions.messages.GetMessages(id=ids))
+    except (pyrogram.errors.RPCError, KeyError, ValueError):
+        media = None
+    else:
+        media = get_input_media_from_message(r.messages[0]) if r.messages else None
+
+    if media is None:
+        await client.upload_cache.delete(key)
+        return None
+
+    await client.upload_cache.set(key, (media.write(), chat_id, message_id))
+
+    return media
+
+
+async def finish_resumable_upload(client, file: raw.base.InputFile | None) -> None:
+    """Forget the state of a resumable upload once the file has been sent."""
+    key = client.resumable_uploads.pop(getattr(file, "id", None), None)
+
+    if key is not None:
+        await client.storage.upload_state(key, None)
+
+
 MIN_CHANNEL_ID = -1007852516352
 MAX_CHANNEL_ID = -1000000000000
 MIN_CHAT_ID = -999999999999
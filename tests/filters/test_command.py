@@ -130,3 +130,75 @@ async def test_no_text() -> None:
 
     m = Message()
     assert not await f(c, m)
+
+
+@pytest.mark.asyncio
+async def test_username_change() -> None:
+    f = filters.command("start")
+    client = Client()
+
+    m = Message("/start@username")
+    assert await f(client, m)
+
+    client.me.username = "renamed"
+
+    m = Message("/start@username")
+    assert not await f(client, m)
+
+    m = Message("/start@renamed a")
+    assert await f(client, m)
+    assert m.command == ["start", "a"]
+
+
+@pytest.mark.asyncio
+async def test_commands_changed() -> None:
+    f = filters.command(["start", "help"])
+
+    m = Message("/help")
+    assert await f(c, m)
+
+    # Same number of commands, different contents
+    f.commands.remove("help")
+    f.commands.add("settings")
+
+    m = Message("/help")
+    assert not await f(c, m)
+
+    m = Message("/settings")
+    assert await f(c, m)
+
+    # The index is only rebuilt after a change
+    index = f.index
+    assert await f(c, Message("/start"))
+    assert f.index is index
+
+    f.commands |= {"about"}
+    assert await f(c, Message("/about"))
+    assert f.index is not index
+
+
+@pytest.mark.asyncio
+async def test_commands_reassigned() -> None:
+    f = filters.command("start")
+    assert await f(c, Message("/start"))
+
+    f.commands = {"help"}
+    f.prefixes = {"!"}
+    assert not await f(c, Message("/start"))
+    assert await f(c, Message("!help"))
+
+    # Sets assigned to the filter are still followed when changed in place
+    f.commands.add("about")
+    assert await f(c, Message("!about"))
+
+
+@pytest.mark.asyncio
+async def test_regex_command() -> None:
+    f = filters.command("st(art|op)")
+
+    m = Message("/stop now")
+    assert await f(c, m)
+    assert m.command == ["st(art|op)", "now"]
+
+    m = Message("/stay")
+    assert not await f(c, m)
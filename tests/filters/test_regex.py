@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import pytest
+
+from pyrogram import filters, types
+from pyrogram.filters import RegexPrefilter
+
+
+@pytest.mark.asyncio
+async def test_match() -> None:
+    f = filters.regex(r"hello (\w+)")
+
+    m = types.Message(id=1, text="say hello world")
+    assert await f(None, m)
+    assert m.matches[0].group(1) == "world"
+
+    m = types.Message(id=1, text="say goodbye world")
+    assert not await f(None, m)
+    assert m.matches is None
+
+
+@pytest.mark.asyncio
+async def test_ignore_case() -> None:
+    f = filters.regex(r"(?i)hello")
+
+    m = types.Message(id=1, text="HELLO")
+    assert await f(None, m)
+
+    # Matched character by character, not as the whole text once case-folded
+    f = filters.regex(r"(?i)in")
+
+    m = types.Message(id=1, text="\u0130n")
+    assert await f(None, m)
+
+
+@pytest.mark.asyncio
+async def test_shared_matches() -> None:
+    f = filters.regex(r"\d+")
+    g = filters.regex(r"\d+")
+
+    m = types.Message(id=1, text="1 2 3")
+    token = RegexPrefilter.dispatch_cache.set({})
+
+    try:
+        assert await f(None, m)
+        matches = m.matches
+
+        assert await g(None, m)
+        assert m.matches is matches
+    finally:
+        RegexPrefilter.dispatch_cache.reset(token)
+
+    # Results are only shared while the update is dispatched
+    assert await g(None, m)
+    assert m.matches is not matches
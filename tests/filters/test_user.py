@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import array
+
+import pytest
+
+from pyrogram import filters, types
+
+
+def message(user_id: int, username: str | None = None) -> types.Message:
+    return types.Message(id=1, from_user=types.User(id=user_id, username=username))
+
+
+@pytest.mark.asyncio
+async def test_ids_and_usernames() -> None:
+    f = filters.user([1, "@UserName"])
+
+    assert await f(None, message(1))
+    assert await f(None, message(2, "username"))
+    assert not await f(None, message(3, "another"))
+
+
+@pytest.mark.asyncio
+async def test_mutations() -> None:
+    f = filters.user()
+
+    f.add("@UserName")
+    assert await f(None, message(2, "USERNAME"))
+
+    f.replace([3])
+    assert not await f(None, message(2, "username"))
+    assert await f(None, message(3))
+
+    f.discard(3)
+    assert not await f(None, message(3))
+
+
+@pytest.mark.asyncio
+async def test_set_operators() -> None:
+    f = filters.user()
+
+    f |= {"@First", 1}
+    assert "@FIRST" in f
+    assert await f(None, message(2, "first"))
+
+    f ^= {"first", "@Second"}
+    assert "first" not in f
+    assert await f(None, message(2, "second"))
+
+    f &= {"@SECOND"}
+    assert set(f) == {"second"}
+
+    f.symmetric_difference_update(["@Third"])
+    f.intersection_update(["@THIRD", 1])
+    assert set(f) == {"third"}
+
+    f -= {"@third"}
+    assert not f
+    assert isinstance(f, filters.user)
+
+
+@pytest.mark.asyncio
+async def test_load(tmp_path) -> None:
+    path = tmp_path / "ids"
+    path.write_bytes(array.array("q", [1, 5, 9]).tobytes())
+
+    f = filters.user()
+    f.load(path)
+
+    assert await f(None, message(5))
+    assert not await f(None, message(6))
+
+    f.load(None)
+    assert not await f(None, message(5))
@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from pyrogram import Client
+from pyrogram.executor import ThreadPoolExecutor
+from pyrogram.file_id import FileId, FileType
+from pyrogram.storage import ChunkCache
+
+CHUNK_SIZE = 1000
+
+
+@pytest.mark.asyncio
+async def test_lru_eviction(tmp_path) -> None:
+    cache = ChunkCache(tmp_path, max_size=3 * CHUNK_SIZE)
+
+    for i in range(3):
+        await cache.set("media", i, bytes([i]) * CHUNK_SIZE)
+
+    await cache.get("media", 0)
+    await cache.set("media", 3, b"3" * CHUNK_SIZE)
+
+    # Chunk 1 was the least recently used one
+    assert await cache.get("media", 1) is None
+    assert await cache.get("media", 0) == bytes([0]) * CHUNK_SIZE
+    assert sorted(p.name for p in tmp_path.iterdir()) == [
+        "media.0",
+        "media.2",
+        "media.3",
+    ]
+
+    stats = cache.get_stats()
+
+    assert (stats["hits"], stats["misses"], stats["evictions"]) == (2, 1, 1)
+    assert stats["size"] == 3 * CHUNK_SIZE
+
+
+@pytest.mark.asyncio
+async def test_cache_survives_restarts(tmp_path) -> None:
+    cache = ChunkCache(tmp_path)
+    await cache.set("media", 0, b"data")
+    (tmp_path / "left.temp").write_bytes(b"")
+
+    cache = ChunkCache(tmp_path)
+
+    assert await cache.get("media", 0) == b"data"
+    assert cache.size == 4
+    assert not (tmp_path / "left.temp").exists()
+
+
+@pytest.mark.asyncio
+async def test_get_file_from_cache(tmp_path) -> None:
+    cache = ChunkCache(tmp_path)
+    file_id = FileId(file_type=FileType.DOCUMENT, dc_id=2, media_id=1, access_hash=1)
+    data = os.urandom(2 * CHUNK_SIZE + 10)
+
+    for i in range(3):
+        await cache.set("1", i, data[i * CHUNK_SIZE : (i + 1) * CHUNK_SIZE])
+
+    # The client has no storage, the whole media must come from the cache
+    client = SimpleNamespace(
+        get_file_semaphore=asyncio.Semaphore(1),
+        chunk_cache=cache,
+        file_executor=ThreadPoolExecutor(1, thread_name_prefix="File"),
+        DOWNLOAD_CHUNK_SIZE=CHUNK_SIZE,
+    )
+
+    chunks = [chunk async for chunk in Client.get_file(client, file_id, len(data))]
+
+    assert b"".join(chunks) == data
+    assert cache.get_stats()["hit_bytes"] == len(data)
+    # The chunks are read in the file executor of the client
+    assert client.file_executor.stats.to_dict()["submitted"] == 3
+
+
+def test_shared_between_loops(tmp_path) -> None:
+    cache = ChunkCache(tmp_path)
+    asyncio.run(cache.set("media", 0, b"data"))
+
+    async def lookups() -> None:
+        for _ in range(200):
+            await cache.get("media", 0)
+            await cache.get("media", 1)
+
+    # Clients running in their own thread and event loop share the same cache
+    threads = [
+        threading.Thread(target=asyncio.run, args=(lookups(),)) for _ in range(4)
+    ]
+
+    for thread in threads:
+        thread.start()
+
+    for thread in threads:
+        thread.join()
+
+    stats = cache.get_stats()
+
+    assert (stats["hits"], stats["misses"]) == (800, 800)
+    assert stats["hit_bytes"] == 800 * 4
@@ -0,0 +1,271 @@
+from __future__ import annotations
+
+import asyncio
+import functools
+from types import SimpleNamespace
+
+import pytest
+
+from pyrogram import enums, raw, types
+from pyrogram.dispatcher import Dispatcher
+from pyrogram.handlers import MessageHandler
+from pyrogram.handlers.conversation_handler import (
+    ConversationHandler,
+    Listener,
+    TimerWheel,
+)
+from pyrogram.methods.utilities.ask import Ask
+from pyrogram.methods.utilities.listen import Listen
+from pyrogram.methods.utilities.stop_listening import StopListening
+from pyrogram.methods.utilities.wait_for_message import WaitForMessage
+
+
+def make_client() -> SimpleNamespace:
+    handler = ConversationHandler()
+    handler.timers = TimerWheel(handler.expire, resolution=0.01)
+
+    client = SimpleNamespace(
+        loop=asyncio.get_running_loop(),
+        dispatcher=SimpleNamespace(conversation_handler=handler),
+        listeners=handler.listeners,
+        sent=[],
+    )
+
+    async def send_message(chat_id, text, **_):
+        client.sent.append((chat_id, text))
+        return text
+
+    for method in (
+        Listen.listen,
+        Listen._create_listener,
+        Listen._get_listener_peer_id,
+        StopListening.stop_listening,
+        WaitForMessage.wait_for_message,
+        Ask.ask,
+    ):
+        setattr(client, method.__name__, functools.partial(method, client))
+
+    client.send_message = send_message
+
+    return client
+
+
+def make_message(
+    chat_id: int = 1,
+    user_id: int = 10,
+    thread_id: int | None = None,
+) -> types.Message:
+    return types.Message(
+        id=1,
+        chat=types.Chat(id=chat_id, type=enums.ChatType.PRIVATE),
+        from_user=types.User(id=user_id),
+        message_thread_id=thread_id,
+        text="answer",
+    )
+
+
+async def dispatch(client: SimpleNamespace, update: types.Message) -> bool:
+    return await client.dispatcher.conversation_handler.check(client, update)
+
+
+def start(coro) -> asyncio.Task:
+    return asyncio.get_running_loop().create_task(coro)
+
+
+@pytest.mark.asyncio
+async def test_listener_matching() -> None:
+    client = make_client()
+    in_chat = start(client.wait_for_message(1))
+    from_user = start(client.listen(chat_id=2, user_id=20))
+    in_thread = start(client.listen(chat_id=3, message_thread_id=30))
+    await asyncio.sleep(0)
+
+    assert len(client.listeners[enums.ListenerTypes.MESSAGE]) == 3
+
+    # Updates of other chats, users or threads are left to the handlers
+    assert not await dispatch(client, make_message(chat_id=4))
+    assert not await dispatch(client, make_message(chat_id=2, user_id=21))
+    assert not await dispatch(client, make_message(chat_id=3, thread_id=31))
+
+    message = make_message(chat_id=2, user_id=20)
+    assert await dispatch(client, message)
+    assert await from_user is message
+
+    message = make_message(chat_id=3, thread_id=30)
+    assert await dispatch(client, message)
+    assert await in_thread is message
+
+    message = make_message(chat_id=1)
+    assert await dispatch(client, message)
+    assert await in_chat is message
+
+    # Consumed updates aren't offered twice
+    assert not await dispatch(client, message)
+    assert not client.listeners[enums.ListenerTypes.MESSAGE]
+
+
+@pytest.mark.asyncio
+async def test_click_matching() -> None:
+    client = make_client()
+    click = start(
+        client.listen(
+            listener_type=enums.ListenerTypes.CALLBACK_QUERY,
+            chat_id=1,
+            message_id=5,
+        ),
+    )
+    await asyncio.sleep(0)
+
+    def make_query(message_id: int) -> types.CallbackQuery:
+        message = make_message()
+        message.id = message_id
+
+        return types.CallbackQuery(
+            id="1",
+            from_user=message.from_user,
+            chat_instance="1",
+            message=message,
+        )
+
+    assert not await dispatch(client, make_query(6))
+
+    query = make_query(5)
+    assert await dispatch(client, query)
+    assert await click is query
+
+
+@pytest.mark.asyncio
+async def test_listener_timeout() -> None:
+    client = make_client()
+    handler = client.dispatcher.conversation_handler
+    waiting = start(client.listen(chat_id=1, timeout=0.02))
+    kept = start(client.listen(chat_id=2, timeout=60))
+
+    with pytest.raises(asyncio.TimeoutError):
+        await waiting
+
+    assert handler.count() == 1
+    assert handler.timers.count == 1
+
+    kept.cancel()
+    await asyncio.sleep(0)
+
+    # The wheel stops once it has no listener left
+    assert handler.count() == 0
+    assert handler.timers.handle is None
+
+
+@pytest.mark.asyncio
+async def test_timeout_precision() -> None:
+    client = make_client()
+    handler = client.dispatcher.conversation_handler
+    handler.timers = TimerWheel(handler.expire)
+    start_time = client.loop.time()
+
+    with pytest.raises(asyncio.TimeoutError):
+        await client.listen(chat_id=1, timeout=0.15)
+
+    # Ticks are aligned to the resolution, so the deadline is missed by less than a tick
+    elapsed = client.loop.time() - start_time
+    assert 0.15 <= elapsed < 0.15 + handler.timers.resolution + 0.05
+
+
+@pytest.mark.asyncio
+async def test_stop_listening() -> None:
+    client = make_client()
+    first = start(client.listen(chat_id=1))
+    second = start(client.listen(chat_id=1, user_id=10))
+    other = start(client.listen(chat_id=2))
+    await asyncio.sleep(0)
+
+    assert await client.stop_listening(chat_id=1, user_id=10) == 1
+    assert await client.stop_listening(chat_id=1) == 1
+
+    for task in (first, second):
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    assert [i.chat_id for i in client.listeners[enums.ListenerTypes.MESSAGE]] == [2]
+
+    other.cancel()
+
+    with pytest.raises(asyncio.CancelledError):
+        await other
+
+
+@pytest.mark.asyncio
+async def test_ask() -> None:
+    client = make_client()
+    answer = start(client.ask(1, "Question?"))
+    await asyncio.sleep(0)
+
+    message = make_message()
+    assert await dispatch(client, message)
+
+    assert await answer is message
+    assert message.request == "Question?"
+    assert client.sent == [(1, "Question?")]
+
+
+@pytest.mark.asyncio
+async def test_listener_list() -> None:
+    client = make_client()
+    listeners = client.listeners[enums.ListenerTypes.MESSAGE]
+    listener = Listener(
+        listener_type=enums.ListenerTypes.MESSAGE,
+        future=client.loop.create_future(),
+        filters=None,
+        chat_id=1,
+        user_ids=None,
+        message_id=None,
+        message_thread_id=None,
+        unallowed_click_alert=True,
+        deadline=None,
+    )
+
+    # Listeners appended to the list are offered updates like the others
+    listeners.append(listener)
+    assert list(listeners) == [listener]
+    assert await dispatch(client, make_message())
+    assert listener.future.done()
+
+    await asyncio.sleep(0)
+    assert listener not in listeners
+
+    with pytest.raises(ValueError, match="not pending"):
+        listeners.remove(listener)
+
+
+@pytest.mark.asyncio
+async def test_later_groups_dispatched() -> None:
+    client = make_client()
+    dispatcher = Dispatcher(client)
+    dispatcher.conversation_handler = client.dispatcher.conversation_handler
+    message = make_message()
+    called = []
+
+    async def parser(*_):
+        return message, MessageHandler
+
+    async def callback(_, update, group=0):
+        called.append((group, update))
+
+    dispatcher.update_parsers[raw.types.UpdateNewMessage] = parser
+    dispatcher.groups[0] = [MessageHandler(callback)]
+    dispatcher.groups[1] = [MessageHandler(functools.partial(callback, group=1))]
+
+    answer = start(client.listen(chat_id=1))
+    await asyncio.sleep(0)
+
+    update = raw.types.UpdateNewMessage(
+        message=raw.types.MessageEmpty(id=1),
+        pts=1,
+        pts_count=1,
+    )
+    dispatcher.updates_queue.put_nowait((update, {}, {}))
+    dispatcher.updates_queue.put_nowait(None)
+    await dispatcher.handler_worker(asyncio.Lock())
+
+    # Group 0 is skipped like when the listeners were part of it, the later groups still get the update
+    assert await answer is message
+    assert called == [(1, message)]
@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from pyrogram import enums, filters, raw, types
+from pyrogram.dispatcher import Dispatcher
+from pyrogram.executor import ProcessPoolExecutor, ThreadPoolExecutor, cpu_bound
+from pyrogram.handlers import MessageHandler
+
+
+@cpu_bound
+def crunch(client, message) -> None:
+    # Runs in another process, the result is reported through the file named by the message
+    Path(message.text).write_text(f"{client} {type(message).__name__} {message.id}")
+
+
+def make_client(
+    process_executor: ProcessPoolExecutor | None = None,
+) -> SimpleNamespace:
+    return SimpleNamespace(
+        loop=asyncio.get_running_loop(),
+        executor=ThreadPoolExecutor(1, thread_name_prefix="Handler"),
+        filter_executor=ThreadPoolExecutor(1, thread_name_prefix="Filter"),
+        progress_executor=ThreadPoolExecutor(1, thread_name_prefix="Progress"),
+        file_executor=ThreadPoolExecutor(1, thread_name_prefix="File"),
+        process_executor=process_executor,
+    )
+
+
+def make_message(text: str = "") -> types.Message:
+    return types.Message(
+        id=1,
+        chat=types.Chat(id=1, type=enums.ChatType.PRIVATE),
+        text=text,
+    )
+
+
+@pytest.mark.asyncio
+async def test_sync_filters_executor() -> None:
+    client = make_client()
+    threads = []
+
+    def check(_, __, ___) -> bool:
+        threads.append(threading.current_thread().name)
+        return True
+
+    sync_filter = filters.create(check)
+    handler = MessageHandler(lambda *_: None, sync_filter)
+
+    assert await handler.check(client, make_message())
+    assert not await (~sync_filter)(client, make_message())
+    assert await (sync_filter & sync_filter)(client, make_message())
+
+    assert threads
+    assert all(name.startswith("Filter") for name in threads)
+    assert client.executor.stats.to_dict()["submitted"] == 0
+    assert client.filter_executor.stats.to_dict()["submitted"] == len(threads)
+
+
+@pytest.mark.asyncio
+async def test_executor_stats() -> None:
+    executor = ThreadPoolExecutor(1)
+    running = threading.Event()
+    release = threading.Event()
+
+    def block() -> None:
+        running.set()
+        release.wait()
+
+    first = executor.submit(block)
+    second = executor.submit(lambda: None)
+
+    await asyncio.to_thread(running.wait)
+
+    # The second task waits for the only worker, busy with the first one
+    stats = executor.stats.to_dict()
+    assert (stats["submitted"], stats["queued"]) == (2, 1)
+
+    await asyncio.sleep(0.05)
+    release.set()
+    await asyncio.wrap_future(first)
+    await asyncio.wrap_future(second)
+
+    stats = executor.stats.to_dict()
+    assert stats["queued"] == 0
+    assert stats["max_wait_time"] >= 0.05
+    assert 0 < stats["average_wait_time"] <= stats["max_wait_time"]
+
+    executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_cpu_bound_handler(tmp_path) -> None:
+    client = make_client(process_executor=ProcessPoolExecutor(1))
+    dispatcher = Dispatcher(client)
+    output = tmp_path / "output"
+    message = make_message(str(output))
+
+    async def parser(*_):
+        return message, MessageHandler
+
+    dispatcher.update_parsers[raw.types.UpdateNewMessage] = parser
+    dispatcher.groups[0] = [MessageHandler(crunch)]
+
+    update = raw.types.UpdateNewMessage(
+        message=raw.types.MessageEmpty(id=1),
+        pts=1,
+        pts_count=1,
+    )
+    dispatcher.updates_queue.put_nowait((update, {}, {}))
+    dispatcher.updates_queue.put_nowait(None)
+    await dispatcher.handler_worker(asyncio.Lock())
+
+    # The callback got no client and a copy of the update, in a process of the pool
+    assert output.read_text() == "None Message 1"
+
+    stats = client.process_executor.stats.to_dict()
+    assert (stats["submitted"], stats["in_flight"]) == (1, 0)
+    assert client.executor.stats.to_dict()["submitted"] == 0
+
+    client.process_executor.shutdown()
@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from pyrogram import errors, types
+from pyrogram.methods.messages import export_chat_history
+from pyrogram.methods.messages.export_chat_history import ExportChatHistory
+
+LATEST_ID = 250
+
+
+@pytest.fixture(autouse=True)
+def history(monkeypatch) -> None:
+    async def get_chunk(*, limit, from_message_id=0, min_id=0, wait=None, **_):
+        # Pages are parsed within the rate limit of the export
+        if limit > 1:
+            assert wait is not None
+
+        offset_id = from_message_id or LATEST_ID + 1
+
+        return [
+            types.Message(id=i)
+            for i in range(offset_id - 1, max(offset_id - 1 - limit, min_id), -1)
+        ]
+
+    monkeypatch.setattr(export_chat_history, "get_chunk", get_chunk)
+
+
+async def export(**kwargs) -> list[int]:
+    return [
+        message.id
+        async for message in ExportChatHistory.export_chat_history(
+            None,
+            "chat",
+            rate_limit=0,
+            **kwargs,
+        )
+    ]
+
+
+@pytest.mark.asyncio
+async def test_export_ordered() -> None:
+    assert await export(partitions=3) == list(range(LATEST_ID, 0, -1))
+
+
+@pytest.mark.asyncio
+async def test_export_unordered() -> None:
+    ids = await export(partitions=3, ordered=False, min_id=10, max_id=200)
+
+    assert sorted(ids) == list(range(10, 201))
+
+
+@pytest.mark.asyncio
+async def test_export_flood_wait(monkeypatch) -> None:
+    get_chunk = export_chat_history.get_chunk
+    raised = []
+
+    async def flooded_get_chunk(**kwargs):
+        if kwargs["limit"] > 1 and not raised:
+            raised.append(True)
+            raise errors.FloodWait(value=0)
+
+        return await get_chunk(**kwargs)
+
+    monkeypatch.setattr(export_chat_history, "get_chunk", flooded_get_chunk)
+
+    assert await export(partitions=2) == list(range(LATEST_ID, 0, -1))
+
+
+@pytest.mark.asyncio
+async def test_export_checkpoint(tmp_path) -> None:
+    checkpoint = tmp_path / "export.json"
+    ids = []
+
+    async for message in ExportChatHistory.export_chat_history(
+        None,
+        "chat",
+        partitions=2,
+        rate_limit=0,
+        checkpoint=checkpoint,
+    ):
+        ids.append(message.id)
+
+        if len(ids) == 150:
+            break
+
+    saved = json.loads(checkpoint.read_text())
+    assert saved["options"]["chat_id"] == "chat"
+
+    # The export resumes after the last page that was fully consumed
+    resumed = await export(partitions=2, checkpoint=checkpoint)
+
+    assert resumed[0] == 125
+    assert sorted(set(ids + resumed)) == list(range(1, LATEST_ID + 1))
+    assert not checkpoint.exists()
+
+
+@pytest.mark.asyncio
+async def test_export_checkpoint_options(tmp_path) -> None:
+    checkpoint = tmp_path / "export.json"
+
+    async for message in ExportChatHistory.export_chat_history(
+        None,
+        "chat",
+        partitions=2,
+        rate_limit=0,
+        checkpoint=checkpoint,
+    ):
+        if message.id == 200:
+            break
+
+    # The ranges of another export are ignored, it starts from scratch
+    assert await export(partitions=3, checkpoint=checkpoint) == list(
+        range(LATEST_ID, 0, -1),
+    )
+    assert not checkpoint.exists()
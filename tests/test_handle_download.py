@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import asyncio
+import os
+from types import SimpleNamespace
+
+import pytest
+
+from pyrogram import Client
+from pyrogram.client import DownloadSink, FileSink
+from pyrogram.file_id import FileId, FileType
+
+CHUNK_SIZE = 1024
+DATA = os.urandom(10 * CHUNK_SIZE + 100)
+
+
+def make_client(failures: list[int]) -> SimpleNamespace:
+    """Fake client whose downloads fail once after each number of chunks in *failures*."""
+    offsets = []
+
+    async def get_file(_file_id, _file_size, _limit, offset, *_):
+        offsets.append(offset)
+        fail_after = failures.pop(0) if failures else None
+
+        for i, start in enumerate(range(offset * CHUNK_SIZE, len(DATA), CHUNK_SIZE)):
+            if i == fail_after:
+                raise OSError("Connection lost")
+
+            yield DATA[start : start + CHUNK_SIZE]
+
+    return SimpleNamespace(
+        get_file=get_file,
+        offsets=offsets,
+        loop=asyncio.get_running_loop(),
+        file_executor=None,
+        DOWNLOAD_CHUNK_SIZE=CHUNK_SIZE,
+        DOWNLOAD_RETRIES=2,
+    )
+
+
+def make_packet(
+    directory,
+    verify_size: bool = False,
+    in_memory: bool = False,
+    media_id: int = 1,
+) -> tuple:
+    file_id = FileId(
+        file_type=FileType.DOCUMENT,
+        dc_id=2,
+        media_id=media_id,
+        access_hash=1,
+    )
+
+    return file_id, directory, "file", in_memory, len(DATA), None, (), verify_size
+
+
+@pytest.fixture(autouse=True)
+def no_sleep(monkeypatch) -> None:
+    async def sleep(_) -> None:
+        return
+
+    monkeypatch.setattr("pyrogram.client.asyncio.sleep", sleep)
+
+
+@pytest.mark.asyncio
+async def test_download_continues_after_errors(tmp_path) -> None:
+    client = make_client([4, 0, 3])
+
+    await Client.handle_download(client, make_packet(tmp_path))
+
+    assert client.offsets == [0, 4, 4, 7]
+    assert (tmp_path / "file").read_bytes() == DATA
+
+
+@pytest.mark.asyncio
+async def test_download_resumes_temp_file(tmp_path) -> None:
+    client = make_client([5, 0, 0])
+
+    assert await Client.handle_download(client, make_packet(tmp_path)) is None
+    assert not (tmp_path / "file").exists()
+    assert (tmp_path / "file.temp").stat().st_size == 5 * CHUNK_SIZE
+
+    # As left preallocated by a process killed before the file was truncated
+    with (tmp_path / "file.temp").open("ab") as file:
+        file.write(os.urandom(len(DATA) - 5 * CHUNK_SIZE))
+
+    client = make_client([])
+
+    path = await Client.handle_download(client, make_packet(tmp_path, True))
+
+    assert client.offsets == [5]
+    assert (tmp_path / "file").read_bytes() == DATA
+    assert path == (tmp_path / "file").resolve().as_posix()
+    assert not (tmp_path / "file.temp.state").exists()
+
+
+@pytest.mark.asyncio
+async def test_download_discards_other_media(tmp_path) -> None:
+    client = make_client([5, 0, 0])
+
+    assert await Client.handle_download(client, make_packet(tmp_path)) is None
+
+    # The temp file left by a media with the same name isn't continued
+    client = make_client([])
+    await Client.handle_download(client, make_packet(tmp_path, media_id=2))
+
+    assert client.offsets == [0]
+    assert (tmp_path / "file").read_bytes() == DATA
+
+
+@pytest.mark.asyncio
+async def test_download_in_memory(tmp_path) -> None:
+    client = make_client([3])
+
+    file = await Client.handle_download(
+        client,
+        make_packet(tmp_path, True, in_memory=True),
+    )
+
+    assert client.offsets == [0, 3]
+    assert file.name == "file"
+    assert bytes(file.getbuffer()) == DATA
+
+
+@pytest.mark.asyncio
+async def test_file_sink_out_of_order(tmp_path) -> None:
+    path = tmp_path / "file"
+    sink = FileSink(str(path), len(DATA), identity="media")
+    await sink.truncate(0)
+
+    await sink.write(2 * CHUNK_SIZE, DATA[2 * CHUNK_SIZE : 3 * CHUNK_SIZE])
+    await sink.write(0, DATA[:CHUNK_SIZE])
+    await sink.flush()
+
+    # The file is preallocated, but only the part without gaps counts as written
+    assert sink.written == CHUNK_SIZE
+    assert path.stat().st_size == len(DATA)
+
+    # A download continued after the process was killed starts from there as well
+    resumed = FileSink(str(path), len(DATA), identity="media")
+    assert resumed.written == CHUNK_SIZE
+    os.close(resumed.fd)
+
+    await sink.write(CHUNK_SIZE, DATA[CHUNK_SIZE : 2 * CHUNK_SIZE])
+    await sink.close()
+
+    assert path.read_bytes() == DATA[: 3 * CHUNK_SIZE]
+
+
+def test_sink_requires_write() -> None:
+    class NoWriteSink(DownloadSink):
+        pass
+
+    # Sinks missing write fail when built instead of during the download
+    with pytest.raises(TypeError, match="write"):
+        NoWriteSink()
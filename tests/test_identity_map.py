@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+from pyrogram import raw
+from pyrogram.client import IdentityMap
+
+
+def make_user(user_id: int = 1, first_name: str = "Alice") -> raw.types.User:
+    return raw.types.User(
+        id=user_id,
+        first_name=first_name,
+        access_hash=0,
+        usernames=[],
+        restriction_reason=[],
+    )
+
+
+def test_shared_objects() -> None:
+    identity_map = IdentityMap(SimpleNamespace(), 10)
+    user = identity_map.get_user(make_user())
+
+    # Equal raw peers of later responses give back the same object
+    assert identity_map.get_user(make_user()) is user
+    assert identity_map.get_chat(make_user()) is identity_map.get_chat(make_user())
+    assert identity_map.get_stats()["hits"] == 2
+
+    # Newer data is parsed again
+    renamed = identity_map.get_user(make_user(first_name="Bob"))
+
+    assert renamed is not user
+    assert renamed.first_name == "Bob"
+    assert identity_map.get_user(make_user(first_name="Bob")) is renamed
+
+
+def test_invalidate() -> None:
+    identity_map = IdentityMap(SimpleNamespace(), 10)
+    user = identity_map.get_user(make_user())
+
+    identity_map.invalidate(
+        raw.types.UpdateUserName(
+            user_id=1,
+            first_name="Alice",
+            last_name="",
+            usernames=[],
+        ),
+    )
+
+    assert identity_map.get_user(make_user()) is not user
+
+
+def test_capacity() -> None:
+    identity_map = IdentityMap(SimpleNamespace(), 2)
+    first = identity_map.get_user(make_user(1))
+
+    identity_map.get_user(make_user(2))
+    identity_map.get_user(make_user(3))
+
+    # The least recently used object was dropped
+    assert identity_map.get_stats()["objects"] == 2
+    assert identity_map.get_user(make_user(1)) is not first
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import time
+
+from pyrogram import types
+from pyrogram.client import MessageCache
+
+CHANNEL_ID = -1001234567890
+
+
+def test_lru_eviction() -> None:
+    cache = MessageCache(2, 1 << 20, None)
+
+    cache[(CHANNEL_ID, 1)] = types.Message(id=1)
+    cache[(CHANNEL_ID, 2)] = types.Message(id=2)
+    assert cache[(CHANNEL_ID, 1)].id == 1
+
+    cache[(CHANNEL_ID, 3)] = types.Message(id=3)
+
+    assert cache[(CHANNEL_ID, 2)] is None
+    assert cache[(CHANNEL_ID, 1)].id == 1
+    assert cache.evictions == 1
+
+
+def test_memory_limit() -> None:
+    message = types.Message(id=1, text="x" * 1000)
+    size = MessageCache.get_size(message)
+    cache = MessageCache(100, size * 2, None)
+
+    for i in range(3):
+        cache[(CHANNEL_ID, i)] = types.Message(id=i, text="x" * 1000)
+
+    assert len(cache) == 2
+    assert cache.size <= size * 2
+
+
+def test_ttl() -> None:
+    cache = MessageCache(10, 1 << 20, 0.01)
+
+    cache[(CHANNEL_ID, 1)] = types.Message(id=1)
+    time.sleep(0.02)
+
+    assert cache[(CHANNEL_ID, 1)] is None
+    assert cache.expirations == 1
+    assert len(cache) == 0
+
+
+def test_invalidate() -> None:
+    cache = MessageCache(10, 1 << 20, None)
+
+    cache[(CHANNEL_ID, 1)] = types.Message(id=1)
+    cache[(-100, 1)] = types.Message(id=1)
+    cache[(100, 2)] = types.Message(id=2)
+
+    cache.invalidate(None, [1, 2])
+
+    assert cache[(CHANNEL_ID, 1)] is not None
+    assert cache[(-100, 1)] is None
+    assert cache[(100, 2)] is None
+
+    cache.invalidate(CHANNEL_ID, [1])
+
+    assert len(cache) == 0
+    assert cache.chats == {}
+    assert cache.get_stats()["invalidations"] == 3
@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+import pytest
+
+from pyrogram import errors, raw, utils
+from pyrogram.client import MessageCache
+
+CHANNEL_ID = 1234567890
+CHAT_ID = utils.MAX_CHANNEL_ID - CHANNEL_ID
+
+
+def make_client(topics_error: Exception | None = None) -> SimpleNamespace:
+    client = SimpleNamespace(
+        message_cache=MessageCache(100, 1024 * 1024, None),
+        requested=[],
+    )
+
+    async def get_messages(chat_id, message_ids, **_):
+        client.requested.append((chat_id, message_ids))
+
+    async def invoke(query):
+        if topics_error is not None:
+            raise topics_error
+
+        return SimpleNamespace(
+            topics=[
+                raw.types.ForumTopic(
+                    id=i,
+                    date=0,
+                    title=str(i),
+                    icon_color=0,
+                    top_message=i,
+                    read_inbox_max_id=0,
+                    read_outbox_max_id=0,
+                    unread_count=0,
+                    unread_mentions_count=0,
+                    unread_reactions_count=0,
+                    from_id=raw.types.PeerUser(user_id=1),
+                    notify_settings=raw.types.PeerNotifySettings(),
+                )
+                for i in query.topics
+            ],
+        )
+
+    async def resolve_peer(_):
+        return raw.types.InputChannel(channel_id=CHANNEL_ID, access_hash=0)
+
+    client.get_messages = get_messages
+    client.invoke = invoke
+    client.resolve_peer = resolve_peer
+
+    return client
+
+
+def make_messages() -> list[raw.types.Message]:
+    peer_id = raw.types.PeerChannel(channel_id=CHANNEL_ID)
+
+    return [
+        raw.types.Message(
+            id=5,
+            peer_id=peer_id,
+            date=0,
+            message="In a topic",
+            reply_to=raw.types.MessageReplyHeader(
+                forum_topic=True,
+                reply_to_msg_id=4,
+                reply_to_top_id=2,
+            ),
+        ),
+        raw.types.Message(
+            id=6,
+            peer_id=peer_id,
+            date=0,
+            message="Topic started",
+            reply_to=raw.types.MessageReplyHeader(
+                forum_topic=True,
+                reply_to_msg_id=3,
+            ),
+        ),
+        raw.types.Message(
+            id=7,
+            peer_id=peer_id,
+            date=0,
+            message="Reply",
+            reply_to=raw.types.MessageReplyHeader(reply_to_msg_id=4),
+        ),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_references_batched() -> None:
+    client = make_client()
+
+    topics = await utils.resolve_message_references(client, make_messages())
+
+    # Both messages replied to the same one, which is fetched once
+    assert client.requested == [(CHAT_ID, [4])]
+    assert sorted(topics[CHAT_ID]) == [2, 3]
+
+
+@pytest.mark.asyncio
+async def test_topics_error() -> None:
+    client = make_client(errors.ChannelPrivate())
+
+    topics = await utils.resolve_message_references(client, make_messages())
+
+    # Missing rather than empty, so that the topics are looked up message by message
+    assert topics == {}
+    assert client.requested == [(CHAT_ID, [4])]
+
+
+@pytest.mark.asyncio
+async def test_references_wait() -> None:
+    client = make_client()
+    waited = []
+
+    async def wait() -> None:
+        waited.append(len(client.requested))
+
+    await utils.resolve_message_references(client, make_messages(), wait)
+
+    # Awaited before the messages and the topics requests
+    assert len(waited) == 2
@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import asyncio
+import os
+from types import SimpleNamespace
+
+import pytest
+
+from pyrogram import raw
+from pyrogram.executor import ThreadPoolExecutor
+from pyrogram.file_id import FileId, FileType
+from pyrogram.methods.messages.open_media import MediaFile
+from pyrogram.session import SessionPool
+from pyrogram.storage import ChunkCache
+
+CHUNK_SIZE = 1000
+DATA = os.urandom(5 * CHUNK_SIZE + 123)
+
+
+class FakeSession:
+    def __init__(self) -> None:
+        self.is_started = asyncio.Event()
+        self.is_started.set()
+        self.currently_restarting = False
+        self.offsets = []
+        self.errors = 0
+
+    async def invoke(self, query, **_) -> raw.types.upload.File:
+        if self.errors:
+            self.errors -= 1
+            raise OSError("Connection lost")
+
+        self.offsets.append(query.offset)
+
+        return raw.types.upload.File(
+            type=raw.types.storage.FilePartial(),
+            mtime=0,
+            bytes=DATA[query.offset : query.offset + query.limit],
+        )
+
+    async def stop(self) -> None:
+        return
+
+
+@pytest.fixture(autouse=True)
+def fake_sessions(monkeypatch) -> None:
+    async def create(_):
+        return FakeSession()
+
+    monkeypatch.setattr(SessionPool, "create", create)
+    monkeypatch.setattr(MediaFile, "CHUNK_SIZE", CHUNK_SIZE)
+
+
+async def open_file(size: int = 0, chunk_cache=None, **kwargs) -> MediaFile:
+    client = SimpleNamespace(
+        loop=asyncio.get_running_loop(),
+        download_pools={},
+        chunk_cache=chunk_cache,
+        file_executor=ThreadPoolExecutor(1, thread_name_prefix="File"),
+        MAX_DOWNLOAD_SESSIONS=1,
+    )
+    file_id = FileId(
+        file_type=FileType.DOCUMENT,
+        dc_id=2,
+        media_id=1,
+        access_hash=1,
+    )
+
+    return await MediaFile(client, file_id, size, "file", **kwargs).open()
+
+
+@pytest.mark.asyncio
+async def test_random_access() -> None:
+    async with await open_file(len(DATA)) as file:
+        file.seek(1500)
+        assert await file.read(1000) == DATA[1500:2500]
+        assert file.tell() == 2500
+
+        file.seek(-100, os.SEEK_END)
+        assert await file.read() == DATA[-100:]
+        assert await file.read(10) == b""
+
+        file.seek(10)
+        assert await file.read(-1) == DATA[10:]
+
+    assert file.pool.get_stats()["busy"] == 0
+    await file.pool.stop()
+
+
+@pytest.mark.asyncio
+async def test_read_ahead_and_cache() -> None:
+    async with await open_file(read_ahead=2, cache_size=3) as file:
+        assert await file.read(10) == DATA[:10]
+        await asyncio.sleep(0)
+
+        # The next chunks were fetched while the first one was being read
+        assert sorted(file.session.offsets) == [0, 1000, 2000]
+        assert await file.read(1990) == DATA[10:2000]
+        assert (file.hits, file.misses) == (2, 1)
+
+        # The end of the media is found without knowing its size
+        file.seek(5000)
+        assert await file.read(1000) == DATA[5000:]
+        assert file.size == len(DATA)
+
+        file.seek(0)
+        await file.read(1)
+
+        # The first chunk was evicted from the cache, so it was fetched again
+        assert file.session.offsets.count(0) == 2
+
+    await file.pool.stop()
+
+
+@pytest.mark.asyncio
+async def test_session_replaced() -> None:
+    async with await open_file(len(DATA), read_ahead=0) as file:
+        assert await file.read(10) == DATA[:10]
+
+        # Stopped by the pool after it died, while the file was still open
+        dead = file.session
+        dead.is_started.clear()
+
+        file.seek(CHUNK_SIZE)
+        assert await file.read(10) == DATA[CHUNK_SIZE : CHUNK_SIZE + 10]
+        assert file.session is not dead
+        assert dead.offsets == [0]
+
+        # Chunks that failed because of the connection are fetched again
+        file.session.errors = 2
+        file.seek(2 * CHUNK_SIZE)
+        assert await file.read(10) == DATA[2 * CHUNK_SIZE : 2 * CHUNK_SIZE + 10]
+
+    # The dead session was removed from the pool, the new one was given back
+    assert list(file.pool.sessions.values()) == [0]
+    assert dead not in file.pool.sessions
+    await file.pool.stop()
+
+
+@pytest.mark.asyncio
+async def test_chunk_cache(tmp_path) -> None:
+    cache = ChunkCache(tmp_path)
+
+    async with await open_file(len(DATA), cache, read_ahead=0) as file:
+        assert await file.read() == DATA
+
+    async with await open_file(len(DATA), cache, read_ahead=0) as file:
+        assert await file.read() == DATA
+        assert file.session.offsets == []
+
+    assert cache.get_stats()["hits"] == 6
+    # Read in the file executor of the client
+    assert file.client.file_executor.stats.to_dict()["submitted"] == 6
+    await file.pool.stop()
@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+from pyrogram import raw, utils
+
+CHANNEL_ID = 1234567890
+
+
+def test_parse_raw_messages() -> None:
+    r = raw.types.messages.Messages(
+        messages=[
+            raw.types.Message(
+                id=2,
+                peer_id=raw.types.PeerChannel(channel_id=CHANNEL_ID),
+                from_id=raw.types.PeerUser(user_id=100),
+                date=1700000000,
+                message="Hello",
+            ),
+            raw.types.Message(
+                id=1,
+                peer_id=raw.types.PeerChannel(channel_id=CHANNEL_ID),
+                date=1700000000,
+                message="",
+                post=True,
+            ),
+            raw.types.Message(
+                id=3,
+                peer_id=raw.types.PeerUser(user_id=200),
+                date=1700000000,
+                message="Hi",
+                out=True,
+            ),
+        ],
+        chats=[],
+        users=[],
+    )
+    first, post, outgoing = utils.parse_raw_messages(
+        SimpleNamespace(me=SimpleNamespace(id=300)),
+        r,
+    )
+
+    assert first.chat_id == utils.MAX_CHANNEL_ID - CHANNEL_ID
+    assert first.sender_id == 100
+    assert first.text == "Hello"
+    assert first.message is r.messages[0]
+
+    # Channel posts are sent by the channel itself
+    assert post.sender_id == post.chat_id
+    assert post.text is None
+
+    assert outgoing.sender_id == 300
@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+import hashlib
+import io
+import os
+
+import pytest
+
+from pyrogram.methods.advanced.save_file import PartReader
+
+DATA = os.urandom(10 * 1000 + 123)
+
+
+async def read_all(fp, offset: int = 0) -> tuple[list[bytes], str]:
+    reader = PartReader(fp, 1000, offset, md5_sum=hashlib.md5())
+    parts = []
+
+    try:
+        while chunk := await reader.read():
+            parts.append(chunk)
+
+        return parts, await reader.hexdigest()
+    finally:
+        await reader.close()
+
+
+@pytest.mark.asyncio
+async def test_part_reader_file(tmp_path) -> None:
+    path = tmp_path / "file"
+    path.write_bytes(DATA)
+
+    with path.open("rb") as fp:
+        parts, digest = await read_all(fp)
+
+    assert len(parts) == 11
+    assert b"".join(parts) == DATA
+    assert digest == hashlib.md5(DATA).hexdigest()
+
+
+@pytest.mark.asyncio
+async def test_part_reader_file_object() -> None:
+    parts, digest = await read_all(io.BytesIO(DATA), 3000)
+
+    assert b"".join(parts) == DATA[3000:]
+    assert digest == hashlib.md5(DATA[3000:]).hexdigest()
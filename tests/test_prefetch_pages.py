@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+
+import pytest
+
+from pyrogram import utils
+
+
+@pytest.mark.asyncio
+async def test_prefetch_pages() -> None:
+    fetched = []
+
+    async def pages():
+        for i in range(5):
+            fetched.append(i)
+            yield [i]
+
+    async with contextlib.aclosing(utils.prefetch_pages(pages(), 2)) as chunks:
+        async for page in chunks:
+            await asyncio.sleep(0)
+
+            if page == [0]:
+                # The following pages are fetched while the first one is consumed, but no more than asked
+                await asyncio.sleep(0.01)
+                assert fetched == [0, 1, 2, 3]
+
+    assert fetched == [0, 1, 2, 3, 4]
+
+
+@pytest.mark.asyncio
+async def test_prefetch_pages_error() -> None:
+    async def pages():
+        yield [1]
+        raise ValueError
+
+    with pytest.raises(ValueError):
+        async for _ in utils.prefetch_pages(pages(), 1):
+            pass
+
+
+@pytest.mark.asyncio
+async def test_prefetch_pages_early_exit() -> None:
+    closed = asyncio.Event()
+
+    async def pages():
+        try:
+            while True:
+                yield [1]
+        finally:
+            closed.set()
+
+    async with contextlib.aclosing(utils.prefetch_pages(pages(), 1)) as chunks:
+        async for _ in chunks:
+            break
+
+    assert closed.is_set()
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+import pytest
+
+from pyrogram import raw
+from pyrogram.dispatcher import Dispatcher
+from pyrogram.storage import MemoryStorage
+
+STATE = (0, 100, None, 1000, 5)
+
+
+async def make_dispatcher(live_state: tuple | None = None) -> SimpleNamespace:
+    """Fake dispatcher whose difference saves *live_state* like an update received during recovery would."""
+    storage = MemoryStorage("test")
+    await storage.open()
+    await storage.update_state(STATE)
+
+    async def invoke(query, **_):
+        assert query.pts == STATE[1]
+
+        if live_state is not None:
+            await storage.update_state(live_state)
+
+        return raw.types.updates.Difference(
+            new_messages=[],
+            new_encrypted_messages=[],
+            other_updates=[],
+            chats=[],
+            users=[],
+            state=raw.types.updates.State(
+                pts=110,
+                qts=0,
+                date=1100,
+                seq=6,
+                unread_count=0,
+            ),
+        )
+
+    async def put_recovered_update(packet):
+        dispatcher.packets.append(packet)
+
+    dispatcher = SimpleNamespace(
+        client=SimpleNamespace(storage=storage, invoke=invoke),
+        recovery_stats={"messages": 0, "updates": 0},
+        packets=[],
+        put_recovered_update=put_recovered_update,
+    )
+
+    return dispatcher
+
+
+@pytest.mark.asyncio
+async def test_recovered_state_removed() -> None:
+    dispatcher = await make_dispatcher()
+
+    await Dispatcher.recover_state(dispatcher, STATE)
+
+    assert await dispatcher.client.storage.update_state() == []
+
+
+@pytest.mark.asyncio
+async def test_live_state_kept() -> None:
+    live_state = (0, 120, None, 1200, 7)
+    dispatcher = await make_dispatcher(live_state)
+
+    await Dispatcher.recover_state(dispatcher, STATE)
+
+    assert [tuple(s) for s in await dispatcher.client.storage.update_state()] == [
+        live_state,
+    ]
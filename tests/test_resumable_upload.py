@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+import asyncio
+import itertools
+import os
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+import pytest
+
+from pyrogram import StopTransmissionError, raw, utils
+from pyrogram.client import Cache
+from pyrogram.methods.advanced.save_file import SaveFile
+from pyrogram.session import SessionPool
+from pyrogram.storage import MemoryStorage
+
+PART_SIZE = 512 * 1024
+FILE_SIZE = 24 * PART_SIZE + 100
+
+
+class FakeSession:
+    def __init__(self, parts: list[int]) -> None:
+        self.is_started = asyncio.Event()
+        self.is_started.set()
+        self.currently_restarting = False
+        self.parts = parts
+
+    async def invoke(self, query) -> bool:
+        self.parts.append(query.file_part)
+        return True
+
+    async def stop(self) -> None:
+        return
+
+
+@pytest.fixture
+def file(tmp_path):
+    path = tmp_path / "file"
+    path.write_bytes(os.urandom(FILE_SIZE))
+    return str(path)
+
+
+async def make_client(parts: list[int], monkeypatch) -> SimpleNamespace:
+    async def create(_):
+        return FakeSession(parts)
+
+    monkeypatch.setattr(SessionPool, "create", create)
+
+    storage = MemoryStorage("test")
+    await storage.open()
+
+    return SimpleNamespace(
+        me=SimpleNamespace(is_premium=False),
+        storage=storage,
+        loop=asyncio.get_running_loop(),
+        rnd_id=itertools.count(1).__next__,
+        file_executor=ThreadPoolExecutor(1),
+        progress_executor=ThreadPoolExecutor(1, thread_name_prefix="Progress"),
+        upload_pools={},
+        upload_stats=deque(),
+        resumable_uploads={},
+        max_upload_sessions=1,
+        max_upload_parts=1,
+    )
+
+
+@pytest.mark.asyncio
+async def test_upload_resumes_missing_parts(file, monkeypatch) -> None:
+    parts = []
+    client = await make_client(parts, monkeypatch)
+
+    async def progress(current, _) -> None:
+        if current >= 10 * PART_SIZE:
+            raise StopTransmissionError
+
+    with pytest.raises(StopTransmissionError):
+        await SaveFile.save_file(client, file, progress=progress, resume=True)
+
+    assert parts == list(range(10))
+    first_id = next(iter(client.resumable_uploads))
+
+    parts.clear()
+    r = await SaveFile.save_file(client, file, resume=True)
+
+    assert isinstance(r, raw.types.InputFileBig)
+    assert r.id == first_id
+    assert r.parts == 25
+    assert parts == list(range(10, 25))
+
+    # Once sent, the file is uploaded again from the start
+    await utils.finish_resumable_upload(client, r)
+    parts.clear()
+    r = await SaveFile.save_file(client, file, resume=True)
+
+    assert r.id != first_id
+    assert parts == list(range(25))
+
+    await client.storage.close()
+
+
+@pytest.mark.asyncio
+async def test_upload_state_expires(monkeypatch) -> None:
+    storage = MemoryStorage("test")
+    await storage.open()
+
+    await storage.upload_state("key", (1, PART_SIZE, b"\x01"))
+    assert await storage.upload_state("key") == (1, PART_SIZE, b"\x01")
+
+    monkeypatch.setattr(MemoryStorage, "UPLOAD_STATE_TTL", -1)
+    assert await storage.upload_state("key") is None
+
+    await storage.close()
+
+
+@pytest.mark.asyncio
+async def test_upload_session_error(file, monkeypatch) -> None:
+    client = await make_client([], monkeypatch)
+
+    async def create(_):
+        raise ConnectionError
+
+    monkeypatch.setattr(SessionPool, "create", create)
+
+    # The error is logged and no file is returned, as when sending a part fails
+    assert await SaveFile.save_file(client, file) is None
+    assert client.upload_stats
+
+    await client.storage.close()
+
+
+@pytest.mark.asyncio
+async def test_sync_progress_executor(file, monkeypatch) -> None:
+    client = await make_client([], monkeypatch)
+    threads = []
+
+    def progress(current, total) -> None:
+        threads.append((threading.current_thread().name, current == total))
+
+    await SaveFile.save_file(client, file, progress=progress)
+
+    # Sync progress callbacks don't take threads from the sync handlers
+    assert len(threads) == 25
+    assert all(name.startswith("Progress") for name, _ in threads)
+    assert threads[-1][1]
+
+    await client.storage.close()
+
+
+@pytest.mark.asyncio
+async def test_resumable_uploads_bounded(file, tmp_path, monkeypatch) -> None:
+    client = await make_client([], monkeypatch)
+    client.resumable_uploads = Cache(1)
+    other = tmp_path / "other"
+    other.write_bytes(os.urandom(FILE_SIZE))
+
+    first = await SaveFile.save_file(client, file, resume=True)
+    second = await SaveFile.save_file(client, str(other), resume=True)
+
+    # Files uploaded and never sent don't pile up, the oldest one is forgotten
+    assert client.resumable_uploads[first.id] is None
+    assert client.resumable_uploads[second.id] is not None
+
+    await utils.finish_resumable_upload(client, second)
+    assert client.resumable_uploads[second.id] is None
+
+    await client.storage.close()
@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import asyncio
+import itertools
+from types import SimpleNamespace
+
+import pytest
+
+from pyrogram import raw, types
+from pyrogram.methods.messages.send_media_group import SendMediaGroup
+
+
+def make_client(delays: dict[str, float]) -> SimpleNamespace:
+    """Fake client whose uploads of each file take the time given in *delays*."""
+    client = SimpleNamespace(
+        save_file_semaphore=asyncio.Semaphore(2),
+        rnd_id=itertools.count(1).__next__,
+        uploading=0,
+        max_uploading=0,
+        rpc=None,
+    )
+
+    async def save_file(path):
+        if path is None:
+            return None
+
+        client.uploading += 1
+        client.max_uploading = max(client.max_uploading, client.uploading)
+
+        await asyncio.sleep(delays[path])
+
+        client.uploading -= 1
+
+        return raw.types.InputFile(id=0, parts=1, name=path, md5_checksum="")
+
+    async def invoke(query, **_):
+        if isinstance(query, raw.functions.messages.UploadMedia):
+            return SimpleNamespace(
+                document=SimpleNamespace(
+                    id=len(query.media.file.name),
+                    access_hash=0,
+                    file_reference=b"",
+                ),
+            )
+
+        client.rpc = query
+
+        return SimpleNamespace(updates=[], users=[], chats=[])
+
+    async def resolve_peer(_):
+        return raw.types.InputPeerSelf()
+
+    async def parse(text, _):
+        return {"message": text or "", "entities": None}
+
+    client.save_file = save_file
+    client.invoke = invoke
+    client.resolve_peer = resolve_peer
+    client.guess_mime_type = lambda _: None
+    client.parser = SimpleNamespace(parse=parse)
+
+    return client
+
+
+@pytest.mark.asyncio
+async def test_album_order(tmp_path) -> None:
+    paths = []
+
+    for i in range(4):
+        path = tmp_path / ("f" * (i + 1))
+        path.write_bytes(b"data")
+        paths.append(str(path))
+
+    # The first files take the longest to upload
+    client = make_client(dict(zip(paths, [0.04, 0.03, 0.02, 0.01], strict=True)))
+
+    await SendMediaGroup.send_media_group(
+        client,
+        "me",
+        [
+            types.InputMediaDocument(path, caption=str(i))
+            for i, path in enumerate(paths)
+        ],
+    )
+
+    assert client.max_uploading == 2
+    assert [m.media.id.id for m in client.rpc.multi_media] == [
+        len(path) for path in paths
+    ]
+    assert [m.message for m in client.rpc.multi_media] == ["0", "1", "2", "3"]
@@ -0,0 +1,358 @@
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from pyrogram import raw
+from pyrogram.client import Cache, Client
+from pyrogram.sequencer import COMMON_BOX, UpdatesSequencer
+
+CHANNEL_ID = 5
+ME_ID = 1
+USER_ID = 2
+CHAT_ID = 30
+
+
+@pytest.fixture(autouse=True)
+def short_gap_timeout(monkeypatch) -> None:
+    monkeypatch.setattr(UpdatesSequencer, "GAP_TIMEOUT", 0.01)
+
+
+def make_sequencer(differences: list | None = None) -> UpdatesSequencer:
+    """Sequencer at pts 10 whose client answers the difference requests with *differences*, in order."""
+    client = SimpleNamespace(
+        loop=asyncio.get_running_loop(),
+        me=None,
+        peer_cache=Cache(100),
+        skip_updates=True,
+        dispatcher=SimpleNamespace(updates_queue=asyncio.Queue()),
+        queries=[],
+        invoked=asyncio.Event(),
+        invoking=0,
+        max_invoking=0,
+    )
+
+    async def invoke(query, **_):
+        client.queries.append(query)
+        client.invoked.set()
+        client.invoking += 1
+        client.max_invoking = max(client.max_invoking, client.invoking)
+
+        await asyncio.sleep(0.01)
+
+        client.invoking -= 1
+
+        return differences.pop(0)
+
+    client.invoke = invoke
+
+    sequencer = client.sequencer = UpdatesSequencer(client)
+    sequencer.set_state(
+        raw.types.updates.State(pts=10, qts=0, date=0, seq=0, unread_count=0),
+    )
+
+    return sequencer
+
+
+def make_update(pts: int, pts_count: int = 1) -> raw.types.UpdateDeleteMessages:
+    return raw.types.UpdateDeleteMessages(
+        messages=[pts],
+        pts=pts,
+        pts_count=pts_count,
+    )
+
+
+def make_channel_update(pts: int) -> raw.types.UpdateDeleteChannelMessages:
+    return raw.types.UpdateDeleteChannelMessages(
+        channel_id=CHANNEL_ID,
+        messages=[pts],
+        pts=pts,
+        pts_count=1,
+    )
+
+
+def make_difference(pts: int, other_updates: list) -> raw.types.updates.Difference:
+    return raw.types.updates.Difference(
+        new_messages=[],
+        new_encrypted_messages=[],
+        other_updates=other_updates,
+        chats=[],
+        users=[],
+        state=raw.types.updates.State(
+            pts=pts,
+            qts=0,
+            date=0,
+            seq=0,
+            unread_count=0,
+        ),
+    )
+
+
+def dispatched(sequencer: UpdatesSequencer) -> list[tuple[int, int]]:
+    queue = sequencer.client.dispatcher.updates_queue
+    updates = []
+
+    while not queue.empty():
+        update, _, _ = queue.get_nowait()
+        updates.append((sequencer.get_box(update), update.pts))
+
+    return updates
+
+
+async def settle(sequencer: UpdatesSequencer) -> None:
+    while sequencer.gap_tasks:
+        await asyncio.gather(*sequencer.gap_tasks.values())
+
+
+@pytest.mark.asyncio
+async def test_duplicates_dropped() -> None:
+    sequencer = make_sequencer()
+
+    for pts in (11, 11, 12, 10):
+        sequencer.put(make_update(pts), {}, {})
+
+    assert dispatched(sequencer) == [(COMMON_BOX, 11), (COMMON_BOX, 12)]
+    assert sequencer.get_stats()["duplicates"] == 2
+    assert not sequencer.gap_tasks
+
+
+@pytest.mark.asyncio
+async def test_gap_buffered() -> None:
+    sequencer = make_sequencer()
+
+    sequencer.put(make_update(14), {}, {})
+    sequencer.put(make_update(12), {}, {})
+    sequencer.put(make_update(13), {}, {})
+
+    # Nothing is dispatched until the first missing update arrives
+    assert dispatched(sequencer) == []
+    assert sequencer.get_stats()["gaps"] == 1
+    assert COMMON_BOX in sequencer.gap_tasks
+
+    sequencer.put(make_update(11), {}, {})
+
+    assert dispatched(sequencer) == [(COMMON_BOX, pts) for pts in (11, 12, 13, 14)]
+
+    # The gap was closed before timing out, so no difference was needed
+    await settle(sequencer)
+    assert sequencer.client.queries == []
+
+
+@pytest.mark.asyncio
+async def test_gap_filled() -> None:
+    sequencer = make_sequencer(
+        [make_difference(12, [make_update(11), make_update(12)])],
+    )
+
+    sequencer.put(make_update(13), {}, {})
+    sequencer.put(make_update(12), {}, {})
+    await settle(sequencer)
+
+    # Updates of the difference go first, those buffered after them are only dispatched if not duplicated
+    assert dispatched(sequencer) == [(COMMON_BOX, pts) for pts in (11, 12, 13)]
+    assert sequencer.pts[COMMON_BOX] == 13
+
+
+@pytest.mark.asyncio
+async def test_difference_channel_updates() -> None:
+    sequencer = make_sequencer(
+        [make_difference(11, [make_update(11), make_channel_update(21)])],
+    )
+    sequencer.pts[CHANNEL_ID] = 20
+
+    sequencer.updates_too_long()
+    await settle(sequencer)
+
+    assert dispatched(sequencer) == [(COMMON_BOX, 11), (CHANNEL_ID, 21)]
+    assert sequencer.pts[CHANNEL_ID] == 21
+
+    # The channel update was applied to its channel, so it isn't dispatched again
+    sequencer.put(make_channel_update(21), {}, {})
+    sequencer.put(make_channel_update(22), {}, {})
+
+    assert dispatched(sequencer) == [(CHANNEL_ID, 22)]
+
+
+@pytest.mark.asyncio
+async def test_updates_too_long_during_gap() -> None:
+    sequencer = make_sequencer(
+        [
+            make_difference(11, [make_update(11)]),
+            make_difference(13, [make_update(13)]),
+        ],
+    )
+
+    sequencer.put(make_update(12), {}, {})
+    gap_task = sequencer.gap_tasks[COMMON_BOX]
+
+    await sequencer.client.invoked.wait()
+
+    sequencer.updates_too_long()
+
+    # The difference is fetched again by the task filling the gap, once it is done with the current one
+    assert sequencer.gap_tasks[COMMON_BOX] is gap_task
+    await settle(sequencer)
+
+    assert sequencer.client.max_invoking == 1
+    assert [q.pts for q in sequencer.client.queries] == [10, 12]
+    assert dispatched(sequencer) == [(COMMON_BOX, pts) for pts in (11, 12, 13)]
+
+
+def cache_peers(sequencer: UpdatesSequencer, *peer_ids: int) -> None:
+    client = sequencer.client
+    client.me = SimpleNamespace(id=ME_ID)
+
+    for peer_id in peer_ids:
+        client.peer_cache[peer_id] = SimpleNamespace(id=abs(peer_id))
+
+
+def make_short_message(out: bool = False, **kwargs) -> raw.types.UpdateShortMessage:
+    return raw.types.UpdateShortMessage(
+        out=out,
+        id=7,
+        user_id=USER_ID,
+        message="hi",
+        pts=11,
+        pts_count=1,
+        date=0,
+        **kwargs,
+    )
+
+
+@pytest.mark.asyncio
+async def test_materialize_short_message() -> None:
+    sequencer = make_sequencer()
+    cache_peers(sequencer, ME_ID, USER_ID)
+
+    update, users, chats = sequencer.materialize(make_short_message())
+
+    assert isinstance(update, raw.types.UpdateNewMessage)
+    assert (update.pts, update.pts_count) == (11, 1)
+    assert update.message.id == 7
+    assert update.message.message == "hi"
+    assert not update.message.out
+    assert update.message.from_id == raw.types.PeerUser(user_id=USER_ID)
+    assert update.message.peer_id == raw.types.PeerUser(user_id=USER_ID)
+    assert list(users) == [USER_ID]
+    assert chats == {}
+
+    # Outgoing messages are sent by the current user, to the user of the update
+    update, users, _ = sequencer.materialize(make_short_message(out=True))
+
+    assert update.message.out
+    assert update.message.from_id == raw.types.PeerUser(user_id=ME_ID)
+    assert update.message.peer_id == raw.types.PeerUser(user_id=USER_ID)
+    assert sorted(users) == [ME_ID, USER_ID]
+
+
+@pytest.mark.asyncio
+async def test_materialize_short_chat_message() -> None:
+    sequencer = make_sequencer()
+    cache_peers(sequencer, USER_ID, -CHAT_ID)
+
+    update, users, chats = sequencer.materialize(
+        raw.types.UpdateShortChatMessage(
+            id=7,
+            from_id=USER_ID,
+            chat_id=CHAT_ID,
+            message="hi",
+            pts=11,
+            pts_count=1,
+            date=0,
+        ),
+    )
+
+    assert update.message.from_id == raw.types.PeerUser(user_id=USER_ID)
+    assert update.message.peer_id == raw.types.PeerChat(chat_id=CHAT_ID)
+    assert list(users) == [USER_ID]
+    assert list(chats) == [CHAT_ID]
+
+
+@pytest.mark.parametrize(
+    ("missing_id", "kwargs"),
+    [
+        (USER_ID, {}),
+        (
+            3,
+            {
+                "fwd_from": raw.types.MessageFwdHeader(
+                    date=0,
+                    from_id=raw.types.PeerUser(user_id=3),
+                ),
+            },
+        ),
+        (4, {"via_bot_id": 4}),
+        (
+            5,
+            {
+                "entities": [
+                    raw.types.MessageEntityMentionName(
+                        offset=0,
+                        length=2,
+                        user_id=5,
+                    ),
+                ],
+            },
+        ),
+    ],
+)
+@pytest.mark.asyncio
+async def test_materialize_uncached_peer(missing_id: int, kwargs: dict) -> None:
+    sequencer = make_sequencer()
+    cache_peers(sequencer, ME_ID, USER_ID, 3, 4, 5)
+    sequencer.client.peer_cache.store.pop(missing_id)
+
+    assert sequencer.materialize(make_short_message(**kwargs)) is None
+
+    sequencer.client.peer_cache[missing_id] = SimpleNamespace(id=missing_id)
+
+    assert sequencer.materialize(make_short_message(**kwargs)) is not None
+    assert sequencer.get_stats()["fallback_messages"] == 1
+    assert sequencer.get_stats()["local_messages"] == 1
+
+
+@pytest.mark.asyncio
+async def test_materialize_stats() -> None:
+    sequencer = make_sequencer()
+
+    assert sequencer.get_stats()["local_ratio"] == 0.0
+
+    # The current user isn't known yet, so outgoing messages can't be built
+    assert sequencer.materialize(make_short_message(out=True)) is None
+
+    cache_peers(sequencer, ME_ID, USER_ID)
+
+    for _ in range(3):
+        assert sequencer.materialize(make_short_message()) is not None
+
+    stats = sequencer.get_stats()
+
+    assert (stats["local_messages"], stats["fallback_messages"]) == (3, 1)
+    assert stats["local_ratio"] == 0.75
+
+
+@pytest.mark.asyncio
+async def test_short_message_fallback() -> None:
+    message = raw.types.Message(
+        id=7,
+        peer_id=raw.types.PeerUser(user_id=USER_ID),
+        date=0,
+        message="hi",
+    )
+    difference = make_difference(11, [])
+    difference.new_messages = [message]
+    sequencer = make_sequencer([difference])
+
+    # The sender isn't cached, so the message is fetched with getDifference
+    await Client.handle_updates(sequencer.client, make_short_message())
+
+    [query] = sequencer.client.queries
+    assert isinstance(query, raw.functions.updates.GetDifference)
+    assert query.pts == 10
+
+    update, _, _ = sequencer.client.dispatcher.updates_queue.get_nowait()
+    assert update.message is message
+    assert sequencer.pts[COMMON_BOX] == 11
+    assert sequencer.get_stats()["fallback_messages"] == 1
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from pyrogram.session import SessionPool
+
+
+class FakeSession:
+    def __init__(self) -> None:
+        self.is_started = asyncio.Event()
+        self.is_started.set()
+        self.currently_restarting = False
+        self.stopped = False
+
+    async def stop(self) -> None:
+        self.stopped = True
+
+
+@pytest.fixture(autouse=True)
+def fake_sessions(monkeypatch) -> None:
+    async def create(self):
+        self.created += 1
+        return FakeSession()
+
+    monkeypatch.setattr(SessionPool, "create", create)
+
+
+def make_pool() -> SessionPool:
+    return SessionPool(
+        SimpleNamespace(loop=asyncio.get_running_loop()),
+        dc_id=2,
+        max_size=3,
+    )
+
+
+@pytest.mark.asyncio
+async def test_reuse_and_growth() -> None:
+    pool = make_pool()
+    first = await pool.acquire(2)
+    pool.release(first)
+
+    # Idle sessions are reused before new ones are started
+    assert await pool.acquire(2) == first
+    assert pool.created == 2
+
+    # The pool grows while everything is busy, then busy sessions are shared
+    third = await pool.acquire(2)
+
+    assert pool.created == 3
+    assert third[0] not in first
+    assert third[1] in first
+
+    await pool.stop()
+
+
+@pytest.mark.asyncio
+async def test_dead_sessions_are_replaced() -> None:
+    pool = make_pool()
+    [session] = await pool.acquire()
+    pool.release([session])
+    session.is_started.clear()
+
+    [replacement] = await pool.acquire()
+
+    assert replacement is not session
+    assert session.stopped
+
+    await pool.stop()
+
+
+@pytest.mark.asyncio
+async def test_idle_sessions_are_reaped(monkeypatch) -> None:
+    pool = make_pool()
+    monkeypatch.setattr(SessionPool, "IDLE_TIMEOUT", 0.02)
+
+    [session] = await pool.acquire()
+    pool.release([session])
+    await asyncio.sleep(0.1)
+
+    assert session.stopped
+    assert pool.get_stats()["sessions"] == 0
+    assert pool.reaper_task is None
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import gc
+import pickle
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+
+import pyrogram
+from pyrogram import enums, types
+
+
+def make_user() -> types.User:
+    return types.User(id=1, first_name="Name", username="name", is_bot=False)
+
+
+def make_chat() -> types.Chat:
+    return types.Chat(id=-100, type=enums.ChatType.SUPERGROUP, title="Group")
+
+
+def make_entity() -> types.MessageEntity:
+    return types.MessageEntity(type=enums.MessageEntityType.BOLD, offset=0, length=4)
+
+
+def make_message() -> types.Message:
+    return types.Message(
+        id=1,
+        from_user=make_user(),
+        chat=make_chat(),
+        text="text",
+        entities=types.List([make_entity()]),
+    )
+
+
+@pytest.mark.parametrize(
+    "make",
+    [make_message, make_user, make_chat, make_entity],
+)
+def test_round_trips(make) -> None:
+    obj = make()
+
+    assert obj == make()
+    assert obj != types.User(id=2)
+
+    assert eval(repr(obj), {"pyrogram": pyrogram}) == obj
+
+    loaded = pickle.loads(pickle.dumps(obj))
+    assert loaded == obj
+    assert type(loaded) is type(obj)
+
+
+def test_extra_attributes() -> None:
+    message = make_message()
+    message.custom = "value"
+    message.date = datetime(2024, 1, 1)
+
+    assert "custom='value'" in repr(message)
+
+    loaded = pickle.loads(pickle.dumps(message))
+    assert loaded.custom == "value"
+    assert loaded.date == message.date
+
+
+def test_bind() -> None:
+    message = make_message()
+    client = SimpleNamespace()
+
+    message.bind(client)
+
+    assert message._client is client
+    assert message.from_user._client is client
+    assert message.chat._client is client
+
+
+def test_no_instance_dict() -> None:
+    message = make_message()
+
+    repr(message)
+    str(message)
+    pickle.dumps(message)
+    assert message == make_message()
+    message.bind(SimpleNamespace())
+
+    # Inspecting the attributes doesn't leave a per instance dict behind
+    assert not any(isinstance(i, dict) for i in gc.get_referents(message))
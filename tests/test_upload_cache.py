@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+from io import BytesIO
+from types import SimpleNamespace
+
+import pytest
+
+from pyrogram.storage import MemoryUploadCache, SQLiteUploadCache
+from pyrogram.utils import get_upload_cache_key, hash_file
+
+
+@pytest.mark.asyncio
+async def test_memory_cache_lru() -> None:
+    cache = MemoryUploadCache(capacity=2)
+
+    await cache.set("a", (b"a", 1, 1))
+    await cache.set("b", (b"b", 1, 2))
+    await cache.get("a")
+    await cache.set("c", (b"c", 1, 3))
+
+    # "b" was the least recently used entry
+    assert await cache.get("b") is None
+    assert await cache.get("a") == (b"a", 1, 1)
+    assert await cache.get("c") == (b"c", 1, 3)
+    assert cache.get_stats()["hits"] == 3
+    assert cache.get_stats()["misses"] == 1
+
+
+@pytest.mark.asyncio
+async def test_memory_cache_ttl() -> None:
+    cache = MemoryUploadCache(ttl=-1)
+
+    await cache.set("a", (b"a", 1, 1))
+
+    assert await cache.get("a") is None
+    assert not cache.store
+
+
+@pytest.mark.asyncio
+async def test_sqlite_cache(tmp_path) -> None:
+    database = tmp_path / "session.uploads"
+    cache = SQLiteUploadCache(database, capacity=2)
+
+    await cache.set("a", (b"a", -1001, 1))
+    await cache.set("b", (b"b", -1001, 2))
+    await cache.get("a")
+    await cache.set("c", (b"c", -1001, 3))
+    await cache.close()
+
+    # Entries survive a restart
+    cache = SQLiteUploadCache(database, capacity=2)
+
+    assert await cache.get("b") is None
+    assert await cache.get("a") == (b"a", -1001, 1)
+
+    await cache.delete("a")
+
+    assert await cache.get("a") is None
+    assert await cache.get("c") == (b"c", -1001, 3)
+
+    await cache.close()
+
+
+def test_hash_file(tmp_path) -> None:
+    data = b"data" * 1000
+    path = tmp_path / "file"
+    path.write_bytes(data)
+    expected = (hashlib.sha256(data).hexdigest(), len(data))
+
+    stream = BytesIO(data)
+    stream.seek(10)
+
+    assert hash_file(str(path)) == expected
+    assert hash_file(stream) == expected
+    assert stream.tell() == 10
+    assert hash_file(str(tmp_path / "missing")) is None
+
+
+@pytest.mark.asyncio
+async def test_cache_key_thumb(tmp_path) -> None:
+    client = SimpleNamespace(
+        upload_cache=MemoryUploadCache(),
+        loop=asyncio.get_running_loop(),
+        file_executor=None,
+    )
+    paths = []
+
+    for name in ("video", "thumb", "other_thumb"):
+        path = tmp_path / name
+        path.write_bytes(name.encode())
+        paths.append(str(path))
+
+    video, thumb, other_thumb = paths
+    key = await get_upload_cache_key(client, video, "video")
+
+    # The same file with another thumbnail is another media
+    with_thumb = await get_upload_cache_key(client, video, "video", thumb=thumb)
+    assert with_thumb not in {None, key}
+    assert with_thumb != await get_upload_cache_key(
+        client,
+        video,
+        "video",
+        thumb=other_thumb,
+    )
+    assert with_thumb == await get_upload_cache_key(
+        client,
+        video,
+        "video",
+        thumb=BytesIO(b"thumb"),
+    )
+
+    # Thumbnails that can't be hashed skip the cache
+    assert (
+        await get_upload_cache_key(client, video, "video", thumb=str(tmp_path / "x"))
+        is None
+    )
@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from pyrogram.methods.advanced.save_file import (
+    MAX_PART_SIZE,
+    MIN_PART_SIZE,
+    UploadScheduler,
+    get_part_size,
+)
+
+
+def complete_window(scheduler: UploadScheduler, rtt: float) -> None:
+    for _ in range(scheduler.window):
+        scheduler.in_flight += 1
+        scheduler.release(MAX_PART_SIZE, rtt)
+
+
+def test_window_grows_and_shrinks(monkeypatch) -> None:
+    now = 0.0
+    monkeypatch.setattr("time.monotonic", lambda: now)
+    scheduler = UploadScheduler(max_parts=8)
+
+    # Every window finishes in the same time, so more parts in flight means more throughput
+    for _ in range(10):
+        now += 1
+        complete_window(scheduler, 0.1)
+
+    assert scheduler.window == 8
+
+    # Parts start to queue up: same throughput, round trip times rising
+    now += 1
+    complete_window(scheduler, 1.0)
+
+    assert scheduler.window < 8
+    assert scheduler.get_stats()["max_window"] == 8
+
+
+@pytest.mark.asyncio
+async def test_window_limits_parts_in_flight() -> None:
+    scheduler = UploadScheduler(max_parts=2)
+
+    await scheduler.acquire()
+    await scheduler.acquire()
+
+    blocked = asyncio.ensure_future(scheduler.acquire())
+    await asyncio.sleep(0)
+    assert not blocked.done()
+
+    scheduler.release()
+    await asyncio.wait_for(blocked, 1)
+
+
+def test_part_size() -> None:
+    assert get_part_size(100 * 1024 * 1024, is_big=True) == MAX_PART_SIZE
+    assert get_part_size(5 * 1024 * 1024, is_big=False) == MAX_PART_SIZE
+    assert get_part_size(1024 * 1024, is_big=False) == 256 * 1024
+    assert get_part_size(1024, is_big=False) == MIN_PART_SIZE